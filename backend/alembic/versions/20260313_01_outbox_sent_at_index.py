@@ -0,0 +1,31 @@
+"""index notification_outbox by status and sent_at
+
+Revision ID: 20260313_01
+Revises: 20260312_01
+Create Date: 2026-03-13 00:00:00
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20260313_01"
+down_revision = "20260312_01"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_notification_outbox_status_sent_at",
+        "notification_outbox",
+        ["status", "sent_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_notification_outbox_status_sent_at", table_name="notification_outbox"
+    )
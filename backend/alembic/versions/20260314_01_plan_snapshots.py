@@ -0,0 +1,146 @@
+"""move planner_plan out of plans.snapshot into plan_snapshots
+
+Revision ID: 20260314_01
+Revises: 20260313_01
+Create Date: 2026-03-14 00:00:00
+"""
+
+from __future__ import annotations
+
+import uuid
+from datetime import UTC, datetime
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20260314_01"
+down_revision = "20260313_01"
+branch_labels = None
+depends_on = None
+
+JSON_TYPE = sa.JSON().with_variant(postgresql.JSONB(), "postgresql")
+BATCH_SIZE = 500
+
+plans = sa.table(
+    "plans",
+    sa.column("id", sa.Uuid()),
+    sa.column("snapshot", JSON_TYPE),
+    sa.column("updated_at", sa.DateTime(timezone=True)),
+)
+plan_snapshots = sa.table(
+    "plan_snapshots",
+    sa.column("id", sa.Uuid()),
+    sa.column("plan_id", sa.Uuid()),
+    sa.column("reason", sa.String(32)),
+    sa.column("facts_hash", sa.String(64)),
+    sa.column("planner_plan", JSON_TYPE),
+    sa.column("recompute_delta", JSON_TYPE),
+    sa.column("created_at", sa.DateTime(timezone=True)),
+)
+
+
+def _read_created_at(snapshot: dict, fallback: datetime | None) -> datetime:
+    raw = snapshot.get("generated_at")
+    if isinstance(raw, str):
+        try:
+            return datetime.fromisoformat(raw)
+        except ValueError:
+            pass
+    return fallback or datetime.now(UTC)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "plan_snapshots",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("plan_id", sa.Uuid(), nullable=False),
+        sa.Column("reason", sa.String(length=32), nullable=True),
+        sa.Column("facts_hash", sa.String(length=64), nullable=True),
+        sa.Column("planner_plan", JSON_TYPE, nullable=False),
+        sa.Column("recompute_delta", JSON_TYPE, nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["plan_id"], ["plans.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_plan_snapshots_plan_id_created_at",
+        "plan_snapshots",
+        ["plan_id", "created_at"],
+        unique=False,
+    )
+
+    conn = op.get_bind()
+    last_id = None
+    while True:
+        query = (
+            sa.select(plans.c.id, plans.c.snapshot, plans.c.updated_at)
+            .order_by(plans.c.id)
+            .limit(BATCH_SIZE)
+        )
+        if last_id is not None:
+            query = query.where(plans.c.id > last_id)
+        rows = conn.execute(query).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+
+        inserts = []
+        for row in rows:
+            snapshot = dict(row.snapshot) if isinstance(row.snapshot, dict) else {}
+            if "planner_plan" not in snapshot:
+                continue
+            snapshot_id = uuid.uuid4()
+            recompute = snapshot.get("recompute")
+            inserts.append(
+                {
+                    "id": snapshot_id,
+                    "plan_id": row.id,
+                    "reason": (
+                        recompute.get("reason") if isinstance(recompute, dict) else None
+                    ),
+                    "facts_hash": snapshot.get("facts_hash"),
+                    "planner_plan": snapshot.pop("planner_plan"),
+                    "recompute_delta": snapshot.pop("recompute_delta", None),
+                    "created_at": _read_created_at(snapshot, row.updated_at),
+                }
+            )
+            snapshot["snapshot_id"] = str(snapshot_id)
+            conn.execute(
+                plans.update().where(plans.c.id == row.id).values(snapshot=snapshot)
+            )
+        if inserts:
+            conn.execute(plan_snapshots.insert(), inserts)
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    rows = conn.execute(sa.select(plans.c.id, plans.c.snapshot)).all()
+    for row in rows:
+        snapshot = dict(row.snapshot) if isinstance(row.snapshot, dict) else {}
+        snapshot_id = snapshot.pop("snapshot_id", None)
+        if not isinstance(snapshot_id, str):
+            continue
+        stored = conn.execute(
+            sa.select(
+                plan_snapshots.c.planner_plan, plan_snapshots.c.recompute_delta
+            ).where(plan_snapshots.c.id == uuid.UUID(snapshot_id))
+        ).first()
+        snapshot["planner_plan"] = (
+            stored.planner_plan if stored is not None else {"tasks": []}
+        )
+        if stored is not None and stored.recompute_delta is not None:
+            snapshot["recompute_delta"] = stored.recompute_delta
+        conn.execute(
+            plans.update().where(plans.c.id == row.id).values(snapshot=snapshot)
+        )
+
+    op.drop_index("ix_plan_snapshots_plan_id_created_at", table_name="plan_snapshots")
+    op.drop_table("plan_snapshots")
@@ -0,0 +1,203 @@
+"""content-addressed, compressed plan bodies for plan_snapshots
+
+Revision ID: 20260315_01
+Revises: 20260314_01
+Create Date: 2026-03-15 00:00:00
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import zlib
+from datetime import date, timedelta
+from typing import Any
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20260315_01"
+down_revision = "20260314_01"
+branch_labels = None
+depends_on = None
+
+JSON_TYPE = sa.JSON().with_variant(postgresql.JSONB(), "postgresql")
+BATCH_SIZE = 500
+
+plan_snapshots = sa.table(
+    "plan_snapshots",
+    sa.column("id", sa.Uuid()),
+    sa.column("planner_plan", JSON_TYPE),
+    sa.column("body_hash", sa.String(64)),
+    sa.column("event_date", sa.Date()),
+)
+plan_bodies = sa.table(
+    "plan_bodies",
+    sa.column("body_hash", sa.String(64)),
+    sa.column("encoding", sa.String(16)),
+    sa.column("payload", sa.LargeBinary()),
+)
+
+# Frozen copy of the plan body format in app.services.snapshot_store as of
+# this revision; later changes to the app code must not alter the migration.
+PLAN_BODY_ENCODING = "zlib+json"
+COMPRESSION_LEVEL = 6
+
+
+def _split_plan_body(
+    planner_plan: dict[str, Any],
+) -> tuple[dict[str, Any], date] | None:
+    try:
+        event_date = date.fromisoformat(planner_plan["event_date"])
+        tasks = []
+        for item in planner_plan["tasks"]:
+            offset = (date.fromisoformat(item["deadline"]) - event_date).days
+            tasks.append(
+                {
+                    ("deadline_offset_days" if key == "deadline" else key): (
+                        offset if key == "deadline" else value
+                    )
+                    for key, value in item.items()
+                }
+            )
+    except (KeyError, TypeError, ValueError, AttributeError):
+        return None
+    return {**planner_plan, "event_date": None, "tasks": tasks}, event_date
+
+
+def _join_plan_body(body: dict[str, Any], event_date: date) -> dict[str, Any]:
+    tasks = [
+        {
+            ("deadline" if key == "deadline_offset_days" else key): (
+                (event_date + timedelta(days=value)).isoformat()
+                if key == "deadline_offset_days"
+                else value
+            )
+            for key, value in item.items()
+        }
+        for item in body["tasks"]
+    ]
+    return {**body, "event_date": event_date.isoformat(), "tasks": tasks}
+
+
+def _encode_plan_body(body: dict[str, Any]) -> tuple[str, bytes]:
+    serialized = json.dumps(
+        body, sort_keys=True, separators=(",", ":"), ensure_ascii=True
+    ).encode("utf-8")
+    return (
+        hashlib.sha256(serialized).hexdigest(),
+        zlib.compress(serialized, COMPRESSION_LEVEL),
+    )
+
+
+def _decode_plan_body(payload: bytes) -> dict[str, Any]:
+    return json.loads(zlib.decompress(bytes(payload)).decode("utf-8"))
+
+
+def upgrade() -> None:
+    op.create_table(
+        "plan_bodies",
+        sa.Column("body_hash", sa.String(length=64), nullable=False),
+        sa.Column("encoding", sa.String(length=16), nullable=False),
+        sa.Column("payload", sa.LargeBinary(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("body_hash"),
+    )
+    op.add_column(
+        "plan_snapshots", sa.Column("body_hash", sa.String(length=64), nullable=True)
+    )
+    op.add_column("plan_snapshots", sa.Column("event_date", sa.Date(), nullable=True))
+    op.create_index(
+        "ix_plan_snapshots_body_hash", "plan_snapshots", ["body_hash"], unique=False
+    )
+    op.create_foreign_key(
+        "fk_plan_snapshots_body_hash",
+        "plan_snapshots",
+        "plan_bodies",
+        ["body_hash"],
+        ["body_hash"],
+    )
+    op.alter_column("plan_snapshots", "planner_plan", nullable=True)
+
+    conn = op.get_bind()
+    known_hashes: set[str] = set()
+    last_id = None
+    while True:
+        query = (
+            sa.select(plan_snapshots.c.id, plan_snapshots.c.planner_plan)
+            .where(plan_snapshots.c.body_hash.is_(None))
+            .order_by(plan_snapshots.c.id)
+            .limit(BATCH_SIZE)
+        )
+        if last_id is not None:
+            query = query.where(plan_snapshots.c.id > last_id)
+        rows = conn.execute(query).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+
+        for row in rows:
+            if not isinstance(row.planner_plan, dict):
+                continue
+            split = _split_plan_body(row.planner_plan)
+            if split is None:
+                continue
+            body, event_date = split
+            body_hash, payload = _encode_plan_body(body)
+            if body_hash not in known_hashes:
+                conn.execute(
+                    plan_bodies.insert().values(
+                        body_hash=body_hash,
+                        encoding=PLAN_BODY_ENCODING,
+                        payload=payload,
+                    )
+                )
+                known_hashes.add(body_hash)
+            conn.execute(
+                plan_snapshots.update()
+                .where(plan_snapshots.c.id == row.id)
+                .values(
+                    planner_plan=sa.null(),
+                    body_hash=body_hash,
+                    event_date=event_date,
+                )
+            )
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    rows = conn.execute(
+        sa.select(
+            plan_snapshots.c.id,
+            plan_snapshots.c.body_hash,
+            plan_snapshots.c.event_date,
+            plan_bodies.c.payload,
+        ).join(plan_bodies, plan_bodies.c.body_hash == plan_snapshots.c.body_hash)
+    ).all()
+    for row in rows:
+        conn.execute(
+            plan_snapshots.update()
+            .where(plan_snapshots.c.id == row.id)
+            .values(
+                planner_plan=_join_plan_body(
+                    _decode_plan_body(row.payload), row.event_date
+                )
+            )
+        )
+
+    op.alter_column("plan_snapshots", "planner_plan", nullable=False)
+    op.drop_constraint(
+        "fk_plan_snapshots_body_hash", "plan_snapshots", type_="foreignkey"
+    )
+    op.drop_index("ix_plan_snapshots_body_hash", table_name="plan_snapshots")
+    op.drop_column("plan_snapshots", "event_date")
+    op.drop_column("plan_snapshots", "body_hash")
+    op.drop_table("plan_bodies")
@@ -0,0 +1,38 @@
+"""shared revision counter for the in-process template catalog cache
+
+Revision ID: 20260316_01
+Revises: 20260315_01
+Create Date: 2026-03-16 00:00:00
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20260316_01"
+down_revision = "20260315_01"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    table = op.create_table(
+        "template_catalog_revision",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("revision", sa.Integer(), nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.bulk_insert(table, [{"id": 1, "revision": 0}])
+
+
+def downgrade() -> None:
+    op.drop_table("template_catalog_revision")
@@ -0,0 +1,115 @@
+"""stored task_kind and keyset/due-date indexes for task listing
+
+Revision ID: 20260317_01
+Revises: 20260316_01
+Create Date: 2026-03-17 00:00:00
+"""
+
+from __future__ import annotations
+
+import json
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20260317_01"
+down_revision = "20260316_01"
+branch_labels = None
+depends_on = None
+
+JSON_TYPE = sa.JSON().with_variant(postgresql.JSONB(), "postgresql")
+BATCH_SIZE = 500
+TASK_KIND_NORMAL = "normal"
+TASK_KIND_DECISION = "decision"
+
+tasks = sa.table(
+    "tasks",
+    sa.column("id", sa.Uuid()),
+    sa.column("metadata", JSON_TYPE),
+    sa.column("task_kind", sa.String(16)),
+)
+
+
+def _derive_task_kind(metadata: object) -> str:
+    # Frozen copy of app.services.task_service.derive_task_kind as of this
+    # revision; later changes to the app code must not alter the backfill.
+    if not isinstance(metadata, dict):
+        return TASK_KIND_NORMAL
+    tags = metadata.get("tags", [])
+    has_decision_tag = isinstance(tags, list) and any(
+        isinstance(tag, str) and tag == "decision" for tag in tags
+    )
+    ui_actions = metadata.get("ui_actions", [])
+    has_ui_actions = isinstance(ui_actions, list) and len(ui_actions) > 0
+    if has_decision_tag or has_ui_actions:
+        return TASK_KIND_DECISION
+    return TASK_KIND_NORMAL
+
+
+def _read_metadata(metadata: object) -> object:
+    if isinstance(metadata, str):
+        try:
+            return json.loads(metadata)
+        except (json.JSONDecodeError, TypeError):
+            return {}
+    return metadata
+
+
+def upgrade() -> None:
+    op.add_column(
+        "tasks",
+        sa.Column(
+            "task_kind", sa.String(length=16), nullable=False, server_default="normal"
+        ),
+    )
+    op.alter_column("tasks", "task_kind", server_default=None)
+
+    conn = op.get_bind()
+    last_id = None
+    while True:
+        query = (
+            sa.select(tasks.c.id, tasks.c.metadata)
+            .order_by(tasks.c.id)
+            .limit(BATCH_SIZE)
+        )
+        if last_id is not None:
+            query = query.where(tasks.c.id > last_id)
+        rows = conn.execute(query).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+
+        decision_ids = [
+            row.id
+            for row in rows
+            if _derive_task_kind(_read_metadata(row.metadata)) == TASK_KIND_DECISION
+        ]
+        if decision_ids:
+            conn.execute(
+                tasks.update()
+                .where(tasks.c.id.in_(decision_ids))
+                .values(task_kind=TASK_KIND_DECISION)
+            )
+
+    op.drop_index("ix_tasks_plan_id_sort_key", table_name="tasks")
+    op.create_index(
+        "ix_tasks_plan_id_sort_key_id",
+        "tasks",
+        ["plan_id", "sort_key", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_tasks_plan_id_due_date", "tasks", ["plan_id", "due_date"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tasks_plan_id_due_date", table_name="tasks")
+    op.drop_index("ix_tasks_plan_id_sort_key_id", table_name="tasks")
+    op.create_index(
+        "ix_tasks_plan_id_sort_key", "tasks", ["plan_id", "sort_key"], unique=False
+    )
+    op.drop_column("tasks", "task_kind")
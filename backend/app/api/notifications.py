@@ -3,14 +3,14 @@ from __future__ import annotations
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.schemas import (
     NotificationProfileResponse,
     NotificationProfileUpsertRequest,
     NotificationUnsubscribeResponse,
 )
-from app.db.session import get_db_session
+from app.db.session import get_async_db_session
 from app.services.notification_profile_service import NotificationProfileService
 from app.services.plan_service import PlanService
 
@@ -21,16 +21,16 @@ router = APIRouter(tags=["notifications"])
     "/plans/{plan_id}/notification-profile",
     response_model=NotificationProfileResponse,
 )
-def upsert_notification_profile(
+async def upsert_notification_profile(
     plan_id: UUID,
     payload: NotificationProfileUpsertRequest,
-    session: Session = Depends(get_db_session),
+    session: AsyncSession = Depends(get_async_db_session),
 ) -> NotificationProfileResponse:
-    PlanService().get_plan(session, plan_id)
+    await session.run_sync(PlanService().get_plan, plan_id)
 
     service = NotificationProfileService()
-    profile = service.upsert_profile(
-        session,
+    profile = await session.run_sync(
+        service.upsert_profile,
         plan_id=plan_id,
         email=payload.email,
         email_consent=payload.email_consent,
@@ -59,9 +59,11 @@ def upsert_notification_profile(
     "/notifications/unsubscribe",
     response_model=NotificationUnsubscribeResponse,
 )
-def unsubscribe_from_notifications(
+async def unsubscribe_from_notifications(
     token: str = Query(..., min_length=10),
-    session: Session = Depends(get_db_session),
+    session: AsyncSession = Depends(get_async_db_session),
 ) -> NotificationUnsubscribeResponse:
-    NotificationProfileService().unsubscribe_by_token(session, token=token)
+    await session.run_sync(
+        NotificationProfileService().unsubscribe_by_token, token=token
+    )
     return NotificationUnsubscribeResponse(ok=True)
@@ -1,11 +1,19 @@
 from __future__ import annotations
 
+import base64
+import binascii
+import hashlib
 import json
+from datetime import date
 from typing import Any
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Header, Query, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
 
 from app.api.schemas import (
     PlanFactsPatchRequest,
@@ -19,21 +27,28 @@ from app.api.schemas import (
     TaskStatusPatchRequest,
 )
 from app.db.models import TaskStatus
-from app.db.session import get_db_session
-from app.services.plan_service import PlanService
-from app.services.task_service import TaskService
+from app.db.session import get_async_db_session
+from app.services.errors import ApiError
+from app.services.plan_service import PlanService, is_recompute_pending
+from app.services.task_service import TASK_FIELDS, TaskService
+from app.worker.tasks.recompute import (
+    recompute_debounce_seconds,
+    schedule_deferred_recompute,
+)
 
 router = APIRouter(tags=["plans"])
 
+MAX_TASK_PAGE_SIZE = 500
+
 
 @router.post("/plans", response_model=PlanCreateResponse, status_code=201)
-def create_plan(
+async def create_plan(
     payload: PlanCreateRequest,
-    session: Session = Depends(get_db_session),
+    session: AsyncSession = Depends(get_async_db_session),
 ) -> PlanCreateResponse:
     service = PlanService()
-    plan = service.create_plan(
-        session,
+    plan = await session.run_sync(
+        service.create_plan,
         template_id=payload.template_id,
         template_key=payload.template_key,
         facts=payload.facts,
@@ -55,58 +70,96 @@ def create_plan(
 
 
 @router.get("/plans/{plan_id}", response_model=PlanResponse)
-def get_plan(
+async def get_plan(
     plan_id: UUID,
+    response: Response,
     include_snapshot: bool = Query(False),
-    session: Session = Depends(get_db_session),
-) -> PlanResponse:
+    if_none_match: str | None = Header(None),
+    session: AsyncSession = Depends(get_async_db_session),
+) -> PlanResponse | Response:
     service = PlanService()
-    plan = service.get_plan(session, plan_id)
-
+    if if_none_match:
+        validator = await session.run_sync(service.get_plan_validator, plan_id)
+        etag = _weak_etag(
+            validator.updated_at,
+            validator.facts_hash,
+            await session.run_sync(
+                service.latest_published_version, template_id=validator.template_id
+            ),
+            include_snapshot,
+        )
+        if _etag_matches(if_none_match, etag):
+            return _not_modified(etag)
+
+    plan = await session.run_sync(service.get_plan_view, plan_id)
+    latest_published_version = await session.run_sync(
+        service.latest_published_version, template_id=plan.template_id
+    )
+    meta = plan.snapshot if isinstance(plan.snapshot, dict) else {}
+    response.headers["ETag"] = _weak_etag(
+        plan.updated_at,
+        meta.get("facts_hash"),
+        latest_published_version,
+        include_snapshot,
+    )
     return _serialize_plan(
         plan,
-        include_snapshot=include_snapshot,
-        latest_published_version=service.latest_published_version(
-            session, template_id=plan.template_id
+        snapshot=(
+            await session.run_sync(service.load_snapshot, plan)
+            if include_snapshot
+            else None
         ),
+        latest_published_version=latest_published_version,
     )
 
 
 @router.patch("/plans/{plan_id}/facts", response_model=PlanResponse)
-def patch_plan_facts(
+async def patch_plan_facts(
     plan_id: UUID,
     payload: PlanFactsPatchRequest,
-    session: Session = Depends(get_db_session),
+    session: AsyncSession = Depends(get_async_db_session),
 ) -> PlanResponse:
     service = PlanService()
-    plan = service.update_facts(
-        session,
-        plan_id=plan_id,
-        facts_patch=payload.facts,
-        recompute=payload.recompute,
-    )
+    if payload.recompute == "deferred":
+        plan, schedule = await session.run_sync(
+            service.defer_recompute,
+            plan_id=plan_id,
+            facts_patch=payload.facts,
+            debounce_seconds=recompute_debounce_seconds(),
+        )
+        if schedule:
+            await run_in_threadpool(schedule_deferred_recompute, plan.id)
+    else:
+        plan = await session.run_sync(
+            service.update_facts,
+            plan_id=plan_id,
+            facts_patch=payload.facts,
+            recompute=payload.recompute,
+        )
     return _serialize_plan(
         plan,
-        include_snapshot=False,
-        latest_published_version=service.latest_published_version(
-            session, template_id=plan.template_id
+        snapshot=None,
+        latest_published_version=await session.run_sync(
+            service.latest_published_version, template_id=plan.template_id
         ),
     )
 
 
 @router.post("/plans/{plan_id}/recompute", response_model=PlanResponse)
-def recompute_plan(
+async def recompute_plan(
     plan_id: UUID,
     reason: RecomputeReason = Query(RecomputeReason.MANUAL),
-    session: Session = Depends(get_db_session),
+    session: AsyncSession = Depends(get_async_db_session),
 ) -> PlanResponse:
     service = PlanService()
-    plan = service.recompute_plan(session, plan_id=plan_id, reason=reason.value)
+    plan = await session.run_sync(
+        service.recompute_plan, plan_id=plan_id, reason=reason.value
+    )
     return _serialize_plan(
         plan,
-        include_snapshot=False,
-        latest_published_version=service.latest_published_version(
-            session, template_id=plan.template_id
+        snapshot=None,
+        latest_published_version=await session.run_sync(
+            service.latest_published_version, template_id=plan.template_id
         ),
     )
 
@@ -114,11 +167,11 @@ def recompute_plan(
 @router.post(
     "/plans/{plan_id}/upgrade", response_model=PlanCreateResponse, status_code=201
 )
-def upgrade_plan(
+async def upgrade_plan(
     plan_id: UUID,
-    session: Session = Depends(get_db_session),
+    session: AsyncSession = Depends(get_async_db_session),
 ) -> PlanCreateResponse:
-    plan = PlanService().upgrade_plan(session, plan_id=plan_id)
+    plan = await session.run_sync(PlanService().upgrade_plan, plan_id=plan_id)
     return PlanCreateResponse(
         id=plan.id,
         template_id=plan.template_id,
@@ -135,27 +188,81 @@ def upgrade_plan(
 
 
 @router.get("/plans/{plan_id}/tasks", response_model=list[TaskResponse])
-def list_plan_tasks(
+async def list_plan_tasks(
     plan_id: UUID,
+    response: Response,
     status: TaskStatus | None = Query(None),
     include_metadata: bool = Query(False),
-    session: Session = Depends(get_db_session),
-) -> list[TaskResponse]:
-    PlanService().get_plan(session, plan_id)
-
-    tasks = TaskService().list_tasks(session, plan_id=plan_id, status=status)
-    return [_serialize_task(task, include_metadata=include_metadata) for task in tasks]
+    fields: str | None = Query(None),
+    due_before: date | None = Query(None),
+    due_after: date | None = Query(None),
+    limit: int | None = Query(None, ge=1, le=MAX_TASK_PAGE_SIZE),
+    cursor: str | None = Query(None),
+    if_none_match: str | None = Header(None),
+    session: AsyncSession = Depends(get_async_db_session),
+) -> list[TaskResponse] | Response:
+    selected = _read_task_fields(fields, include_metadata=include_metadata)
+    after = _decode_task_cursor(cursor) if cursor is not None else None
+    service = TaskService()
+    etag_parts = (
+        status.value if status is not None else None,
+        ",".join(selected),
+        due_before,
+        due_after,
+        limit,
+        cursor,
+    )
+    validator = None
+    if if_none_match:
+        validator = await session.run_sync(
+            service.get_tasks_validator, plan_id=plan_id, status=status
+        )
+        etag = _tasks_etag(validator, *etag_parts)
+        if _etag_matches(if_none_match, etag):
+            return _not_modified(etag)
+
+    rows, next_position = await session.run_sync(
+        service.list_task_page,
+        plan_id=plan_id,
+        fields=selected,
+        status=status,
+        due_before=due_before,
+        due_after=due_after,
+        after=after,
+        limit=limit,
+        with_validator=validator is None,
+    )
+    if validator is None:
+        # An empty page carries no validator columns (and may be a 404).
+        validator = (
+            rows[0]
+            if rows
+            else await session.run_sync(
+                service.get_tasks_validator, plan_id=plan_id, status=status
+            )
+        )
+        etag = _tasks_etag(validator, *etag_parts)
+    headers = {"ETag": etag}
+    if next_position is not None:
+        headers["X-Next-Cursor"] = _encode_task_cursor(next_position)
+
+    items = [_project_task_row(row, selected) for row in rows]
+    if fields is not None:
+        # Partial items do not satisfy TaskResponse, so they bypass the model.
+        return JSONResponse(content=jsonable_encoder(items), headers=headers)
+    response.headers.update(headers)
+    return [TaskResponse(**item) for item in items]
 
 
 @router.patch("/plans/{plan_id}/tasks/{task_id}", response_model=TaskResponse)
-def update_task_status(
+async def update_task_status(
     plan_id: UUID,
     task_id: UUID,
     payload: TaskStatusPatchRequest,
-    session: Session = Depends(get_db_session),
+    session: AsyncSession = Depends(get_async_db_session),
 ) -> TaskResponse:
-    task = TaskService().update_status(
-        session,
+    task = await session.run_sync(
+        TaskService().update_status,
         plan_id=plan_id,
         task_id=task_id,
         status=payload.status,
@@ -172,7 +279,7 @@ def _serialize_task(task: Any, *, include_metadata: bool) -> TaskResponse:
         task_key=task.task_key,
         title=task.title,
         description=task.description,
-        task_kind=_derive_task_kind(metadata),
+        task_kind=task.task_kind,
         status=TaskStatus(task.status),
         due_date=task.due_date,
         metadata=metadata if include_metadata else None,
@@ -186,19 +293,20 @@ def _serialize_task(task: Any, *, include_metadata: bool) -> TaskResponse:
 def _serialize_plan(
     plan: Any,
     *,
-    include_snapshot: bool,
+    snapshot: dict[str, Any] | None,
     latest_published_version: int | None,
 ) -> PlanResponse:
-    snapshot = plan.snapshot if isinstance(plan.snapshot, dict) else {}
+    meta = plan.snapshot if isinstance(plan.snapshot, dict) else {}
     snapshot_meta = SnapshotMeta(
-        generated_at=snapshot.get("generated_at"),
-        task_count=snapshot.get("task_count"),
-        engine_version=snapshot.get("engine_version"),
+        generated_at=meta.get("generated_at"),
+        task_count=meta.get("task_count"),
+        engine_version=meta.get("engine_version"),
         template_key=(
-            snapshot.get("template_meta", {}).get("template_key")
-            if isinstance(snapshot.get("template_meta"), dict)
+            meta.get("template_meta", {}).get("template_key")
+            if isinstance(meta.get("template_meta"), dict)
             else None
         ),
+        recompute_pending=is_recompute_pending(meta),
     )
 
     return PlanResponse(
@@ -216,21 +324,87 @@ def _serialize_plan(
             and latest_published_version > plan.template_version
         ),
         snapshot_meta=snapshot_meta,
-        snapshot=snapshot if include_snapshot else None,
+        snapshot=snapshot,
+    )
+
+
+def _weak_etag(*parts: Any) -> str:
+    digest = hashlib.sha256(
+        "|".join("" if part is None else str(part) for part in parts).encode("utf-8")
+    ).hexdigest()
+    return f'W/"{digest[:32]}"'
+
+
+def _tasks_etag(validator: Row[Any], *parts: Any) -> str:
+    return _weak_etag(
+        validator.plan_updated_at,
+        validator.task_count,
+        validator.tasks_updated_at,
+        *parts,
     )
 
 
-def _derive_task_kind(metadata: dict[str, Any]) -> str:
-    raw_tags = metadata.get("tags", [])
-    tags = raw_tags if isinstance(raw_tags, list) else []
-    has_decision_tag = any(isinstance(tag, str) and tag == "decision" for tag in tags)
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {candidate.strip() for candidate in if_none_match.split(",")}
+    if "*" in candidates:
+        return True
+    return etag.removeprefix("W/") in {
+        candidate.removeprefix("W/") for candidate in candidates
+    }
+
+
+def _not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag})
+
+
+def _read_task_fields(fields: str | None, *, include_metadata: bool) -> list[str]:
+    if fields is None:
+        return [name for name in TASK_FIELDS if include_metadata or name != "metadata"]
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - TASK_FIELDS.keys()
+    if not requested or unknown:
+        raise ApiError(
+            status_code=400,
+            code="INVALID_TASK_FIELDS",
+            message=(
+                f"Unknown task fields: {', '.join(sorted(unknown))}"
+                if unknown
+                else "fields must name at least one task field"
+            ),
+        )
+    return [name for name in TASK_FIELDS if name in requested]
+
+
+def _project_task_row(row: Row[Any], fields: list[str]) -> dict[str, Any]:
+    item = {name: row._mapping[name] for name in fields}
+    if "metadata" in item:
+        item["metadata"] = _read_metadata(item["metadata"])
+    return item
+
+
+def _encode_task_cursor(position: tuple[int, UUID]) -> str:
+    sort_key, task_id = position
+    return base64.urlsafe_b64encode(f"{sort_key}:{task_id}".encode("ascii")).decode(
+        "ascii"
+    )
 
-    raw_actions = metadata.get("ui_actions", [])
-    has_ui_actions = isinstance(raw_actions, list) and len(raw_actions) > 0
 
-    if has_decision_tag or has_ui_actions:
-        return "decision"
-    return "normal"
+def _decode_task_cursor(cursor: str) -> tuple[int, UUID]:
+    try:
+        raw_sort_key, raw_id = (
+            base64.urlsafe_b64decode(cursor.encode("ascii"))
+            .decode("ascii")
+            .split(":", 1)
+        )
+        return int(raw_sort_key), UUID(raw_id)
+    except (binascii.Error, UnicodeError, ValueError) as exc:
+        raise ApiError(
+            status_code=400,
+            code="INVALID_TASK_CURSOR",
+            message="cursor is not a valid task cursor",
+        ) from exc
 
 
 def _read_metadata(metadata: Any) -> dict[str, Any]:
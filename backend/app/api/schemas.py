@@ -19,7 +19,7 @@ class PlanCreateRequest(BaseModel):
 
 class PlanFactsPatchRequest(BaseModel):
     facts: dict[str, Any]
-    recompute: bool = True
+    recompute: bool | Literal["deferred"] = True
 
 
 class PlanCreateLinks(BaseModel):
@@ -43,6 +43,7 @@ class SnapshotMeta(BaseModel):
     task_count: int | None
     engine_version: str | None
     template_key: str | None
+    recompute_pending: bool = False
 
 
 class PlanResponse(BaseModel):
@@ -1,20 +1,20 @@
 from __future__ import annotations
 
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.schemas import TemplateSummaryResponse, TemplateVersionResponse
-from app.db.session import get_db_session
+from app.db.session import get_async_db_session
 from app.services.template_catalog_service import TemplateCatalogService
 
 router = APIRouter(tags=["templates"])
 
 
 @router.get("/templates", response_model=list[TemplateSummaryResponse])
-def list_templates(
-    session: Session = Depends(get_db_session),
+async def list_templates(
+    session: AsyncSession = Depends(get_async_db_session),
 ) -> list[TemplateSummaryResponse]:
-    rows = TemplateCatalogService().list_templates(session)
+    rows = await session.run_sync(TemplateCatalogService().list_templates)
     return [TemplateSummaryResponse(**row) for row in rows]
 
 
@@ -22,11 +22,11 @@ def list_templates(
     "/templates/{template_id}/versions",
     response_model=list[TemplateVersionResponse],
 )
-def list_template_versions(
+async def list_template_versions(
     template_id: str,
-    session: Session = Depends(get_db_session),
+    session: AsyncSession = Depends(get_async_db_session),
 ) -> list[TemplateVersionResponse]:
-    rows = TemplateCatalogService().list_versions(session, template_id)
+    rows = await session.run_sync(TemplateCatalogService().list_versions, template_id)
     return [TemplateVersionResponse(**row) for row in rows]
 
 
@@ -34,18 +34,19 @@ def list_template_versions(
     "/templates/{template_id}/versions/{version}/publish",
     response_model=TemplateVersionResponse,
 )
-def publish_template_version(
+async def publish_template_version(
     template_id: str,
     version: int,
-    session: Session = Depends(get_db_session),
+    session: AsyncSession = Depends(get_async_db_session),
 ) -> TemplateVersionResponse:
-    row = TemplateCatalogService().publish(
-        session,
+    service = TemplateCatalogService()
+    row = await session.run_sync(
+        service.publish,
         template_id=template_id,
         version=version,
     )
-    latest_published_version = TemplateCatalogService().get_latest_published_version(
-        session, template_id=template_id
+    latest_published_version = await session.run_sync(
+        service.get_latest_published_version, template_id=template_id
     )
     return TemplateVersionResponse(
         template_id=row.template_id,
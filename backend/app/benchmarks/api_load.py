@@ -0,0 +1,609 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Self
+
+import httpx
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.benchmarks.harness import (
+    DEFAULT_REGRESSION_THRESHOLD,
+    compare_results,
+    format_duration,
+    load_results,
+    percentile,
+    report_regressions,
+    results_document,
+    write_results,
+)
+from app.db.base import Base
+from app.db.session import (
+    configure_engine,
+    get_async_engine,
+    get_engine,
+    get_session_factory,
+)
+from app.services.template_catalog_service import TemplateCatalogService
+
+SUITE = "api_load"
+
+CREATE_PLAN = "create_plan"
+GET_PLAN = "get_plan"
+GET_TASKS = "get_tasks"
+PATCH_FACTS = "patch_facts"
+PATCH_TASK = "patch_task"
+REQUEST_TYPES = (CREATE_PLAN, GET_PLAN, GET_TASKS, PATCH_FACTS, PATCH_TASK)
+
+# Upper bound of SQL statements a single request may issue for a birth_de/v2
+# plan. Statement counts must not grow with the number of tasks; a budget
+# that only holds for small plans hides an N+1.
+DEFAULT_QUERY_BUDGETS = {
+    CREATE_PLAN: 10,
+    GET_PLAN: 2,
+    GET_TASKS: 3,
+    PATCH_FACTS: 20,
+    PATCH_TASK: 5,
+}
+
+# Relative frequency of follow-up requests; each virtual user creates one
+# plan first. Reads dominate like in the frontend, fact edits are rare.
+DEFAULT_MIX = {GET_PLAN: 4.0, GET_TASKS: 4.0, PATCH_TASK: 2.0, PATCH_FACTS: 1.0}
+
+DEFAULT_TEMPLATE_KEY = "birth_de/v2"
+BASE_FACTS = {
+    "birth_date": "2026-04-01",
+    "employment_type": "employed",
+    "public_insurance": True,
+    "private_insurance": False,
+}
+FACT_PATCHES = (
+    {"employment_type": "self_employed"},
+    {"employment_type": "mixed", "married": True},
+    {"public_insurance": False, "private_insurance": True},
+    {"employment_type": "employed", "married": False},
+    {"birth_date": "2026-05-15"},
+)
+# Statuses that are always allowed; "done" may be rejected for blocked or
+# decision tasks and would turn into noise in the error counts.
+TASK_STATUSES = ("in_progress", "todo", "skipped")
+
+
+@dataclass(frozen=True)
+class RequestSample:
+    kind: str
+    status_code: int
+    latency_s: float
+    statements: int | None = None
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status_code < 400
+
+
+@dataclass(frozen=True)
+class LoadResult:
+    name: str
+    size: int
+    requests: int
+    errors: int
+    throughput_rps: float
+    p50_s: float
+    p95_s: float
+    p99_s: float
+    mean_s: float
+    statements_max: int | None
+    statements_mean: float | None
+    budget: int | None
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}[{self.size}]"
+
+    @property
+    def over_budget(self) -> bool:
+        return (
+            self.budget is not None
+            and self.statements_max is not None
+            and self.statements_max > self.budget
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "size": self.size,
+            "requests": self.requests,
+            "errors": self.errors,
+            "throughput_rps": self.throughput_rps,
+            "p50_s": self.p50_s,
+            "p95_s": self.p95_s,
+            "p99_s": self.p99_s,
+            "mean_s": self.mean_s,
+            "statements_max": self.statements_max,
+            "statements_mean": self.statements_mean,
+            "budget": self.budget,
+        }
+
+
+@dataclass
+class LoadRun:
+    results: list[LoadResult]
+    wall_seconds: float
+    statements_total: int | None
+    meta: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def budget_violations(self) -> list[LoadResult]:
+        return [result for result in self.results if result.over_budget]
+
+    @property
+    def errors(self) -> int:
+        return sum(result.errors for result in self.results)
+
+
+class StatementCounter:
+    """Counts statements sent to the database through the given engines."""
+
+    def __init__(self, engines: list[Engine]) -> None:
+        self.engines = engines
+        self.count = 0
+
+    def _record(self, *_: Any) -> None:
+        self.count += 1
+
+    def __enter__(self) -> Self:
+        for engine in self.engines:
+            event.listen(engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        for engine in self.engines:
+            event.remove(engine, "before_cursor_execute", self._record)
+
+
+class _PlanUser:
+    """One simulated frontend session working on a single plan."""
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        *,
+        template_key: str,
+        rng: random.Random,
+        counter: StatementCounter | None = None,
+    ) -> None:
+        self.client = client
+        self.template_key = template_key
+        self.rng = rng
+        self.counter = counter
+        self.plan_id: str | None = None
+        self.task_ids: list[str] = []
+        self.samples: list[RequestSample] = []
+
+    async def run(self, kind: str) -> None:
+        if kind == PATCH_TASK and not self.task_ids:
+            kind = GET_TASKS
+        if kind == CREATE_PLAN:
+            response = await self._send(
+                kind,
+                "POST",
+                "/plans",
+                json={"template_key": self.template_key, "facts": BASE_FACTS},
+            )
+            if response.status_code == 201:
+                self.plan_id = response.json()["id"]
+        elif kind == GET_PLAN:
+            await self._send(kind, "GET", f"/plans/{self.plan_id}")
+        elif kind == GET_TASKS:
+            response = await self._send(kind, "GET", f"/plans/{self.plan_id}/tasks")
+            if response.status_code == 200:
+                self.task_ids = [task["id"] for task in response.json()]
+        elif kind == PATCH_FACTS:
+            await self._send(
+                kind,
+                "PATCH",
+                f"/plans/{self.plan_id}/facts",
+                json={"facts": self.rng.choice(FACT_PATCHES)},
+            )
+        elif kind == PATCH_TASK:
+            task_id = self.rng.choice(self.task_ids)
+            await self._send(
+                kind,
+                "PATCH",
+                f"/plans/{self.plan_id}/tasks/{task_id}",
+                json={"status": self.rng.choice(TASK_STATUSES)},
+            )
+        else:
+            raise ValueError(f"unknown request type '{kind}'")
+
+    async def _send(
+        self, kind: str, method: str, url: str, **kwargs: Any
+    ) -> httpx.Response:
+        before = self.counter.count if self.counter is not None else None
+        started = time.perf_counter()
+        response = await self.client.request(method, url, **kwargs)
+        latency = time.perf_counter() - started
+        statements = (
+            self.counter.count - before
+            if self.counter is not None and before is not None
+            else None
+        )
+        self.samples.append(
+            RequestSample(
+                kind=kind,
+                status_code=response.status_code,
+                latency_s=latency,
+                statements=statements,
+            )
+        )
+        return response
+
+
+def prepare_database(database_url: str, *, reset: bool) -> None:
+    configure_engine(database_url)
+    engine = get_engine()
+    if reset:
+        Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with get_session_factory()() as session:
+        TemplateCatalogService().bootstrap_defaults(session)
+
+
+async def profile_statements(
+    client: httpx.AsyncClient,
+    counter: StatementCounter,
+    *,
+    template_key: str,
+    rounds: int,
+    seed: int,
+) -> list[RequestSample]:
+    """Issue every request type sequentially so statements are attributable.
+
+    Under concurrency statements of overlapping requests interleave; one
+    request at a time makes the counter delta exact.
+    """
+    samples: list[RequestSample] = []
+    rng = random.Random(seed)
+    for _ in range(rounds):
+        user = _PlanUser(client, template_key=template_key, rng=rng, counter=counter)
+        for kind in (
+            CREATE_PLAN,
+            GET_PLAN,
+            GET_TASKS,
+            PATCH_TASK,
+            PATCH_FACTS,
+            GET_PLAN,
+            GET_TASKS,
+        ):
+            await user.run(kind)
+        samples.extend(user.samples)
+    return samples
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    *,
+    template_key: str,
+    users: int,
+    requests_per_user: int,
+    mix: dict[str, float],
+    seed: int,
+) -> tuple[list[RequestSample], float]:
+    """Run ``users`` concurrent sessions; returns samples and wall seconds."""
+    kinds = list(mix)
+    weights = [mix[kind] for kind in kinds]
+
+    async def session(index: int) -> list[RequestSample]:
+        rng = random.Random(seed * 100_003 + index)
+        user = _PlanUser(client, template_key=template_key, rng=rng)
+        await user.run(CREATE_PLAN)
+        if user.plan_id is None:
+            return user.samples
+        for kind in rng.choices(kinds, weights, k=requests_per_user - 1):
+            await user.run(kind)
+        return user.samples
+
+    started = time.perf_counter()
+    per_user = await asyncio.gather(*(session(index) for index in range(users)))
+    wall = time.perf_counter() - started
+    return [sample for samples in per_user for sample in samples], wall
+
+
+def summarize(
+    load_samples: list[RequestSample],
+    profile_samples: list[RequestSample],
+    *,
+    wall_seconds: float,
+    concurrency: int,
+    budgets: dict[str, int],
+) -> list[LoadResult]:
+    results: list[LoadResult] = []
+    for kind in REQUEST_TYPES:
+        timed = [sample for sample in load_samples if sample.kind == kind]
+        counted = [
+            sample.statements
+            for sample in profile_samples
+            if sample.kind == kind and sample.statements is not None
+        ]
+        if not timed and not counted:
+            continue
+        latencies = [sample.latency_s for sample in timed] or [0.0]
+        errors = [
+            sample
+            for sample in timed + profile_samples
+            if sample.kind == kind and not sample.ok
+        ]
+        results.append(
+            LoadResult(
+                name=kind,
+                size=concurrency,
+                requests=len(timed),
+                errors=len(errors),
+                throughput_rps=len(timed) / wall_seconds if wall_seconds else 0.0,
+                p50_s=percentile(latencies, 50),
+                p95_s=percentile(latencies, 95),
+                p99_s=percentile(latencies, 99),
+                mean_s=statistics.fmean(latencies),
+                statements_max=max(counted) if counted else None,
+                statements_mean=statistics.fmean(counted) if counted else None,
+                budget=budgets.get(kind),
+            )
+        )
+    return results
+
+
+async def run_api_load(
+    *,
+    users: int = 20,
+    requests_per_user: int = 25,
+    mix: dict[str, float] | None = None,
+    budgets: dict[str, int] | None = None,
+    template_key: str = DEFAULT_TEMPLATE_KEY,
+    profile_rounds: int = 3,
+    seed: int = 0,
+    base_url: str | None = None,
+) -> LoadRun:
+    """Drive the API with a request mix and check statement budgets.
+
+    Without ``base_url`` the app from ``create_app()`` is served in-process
+    through ``httpx.ASGITransport`` against the database configured with
+    ``configure_engine``, and statements are counted on its engines. With
+    ``base_url`` a running server is used and statements are not counted.
+    """
+    budgets = {**DEFAULT_QUERY_BUDGETS, **(budgets or {})}
+    mix = mix or DEFAULT_MIX
+
+    if base_url is None:
+        from app.main import create_app
+
+        transport = httpx.ASGITransport(app=create_app())
+        client = httpx.AsyncClient(transport=transport, base_url="http://bench")
+        counter: StatementCounter | None = StatementCounter(
+            [get_async_engine().sync_engine, get_engine()]
+        )
+    else:
+        client = httpx.AsyncClient(base_url=base_url, timeout=30.0)
+        counter = None
+
+    async with client:
+        profile_samples: list[RequestSample] = []
+        statements_total = None
+        if counter is not None:
+            with counter:
+                profile_samples = await profile_statements(
+                    client,
+                    counter,
+                    template_key=template_key,
+                    rounds=profile_rounds,
+                    seed=seed,
+                )
+                counted_before_load = counter.count
+                load_samples, wall = await run_load(
+                    client,
+                    template_key=template_key,
+                    users=users,
+                    requests_per_user=requests_per_user,
+                    mix=mix,
+                    seed=seed,
+                )
+                statements_total = counter.count - counted_before_load
+        else:
+            load_samples, wall = await run_load(
+                client,
+                template_key=template_key,
+                users=users,
+                requests_per_user=requests_per_user,
+                mix=mix,
+                seed=seed,
+            )
+
+    results = summarize(
+        load_samples,
+        profile_samples,
+        wall_seconds=wall,
+        concurrency=users,
+        budgets=budgets,
+    )
+    return LoadRun(
+        results=results,
+        wall_seconds=wall,
+        statements_total=statements_total,
+        meta={
+            "users": users,
+            "requests_per_user": requests_per_user,
+            "mix": mix,
+            "template_key": template_key,
+            "requests": len(load_samples),
+        },
+    )
+
+
+def print_load_run(run: LoadRun) -> None:
+    print(
+        f"{'request':<12} {'count':>6} {'err':>4} {'req/s':>8} "
+        f"{'p50':>10} {'p95':>10} {'p99':>10} {'sql':>5} {'budget':>6}"
+    )
+    for result in run.results:
+        sql = "-" if result.statements_max is None else str(result.statements_max)
+        budget = "-" if result.budget is None else str(result.budget)
+        flag = "  OVER BUDGET" if result.over_budget else ""
+        print(
+            f"{result.name:<12} {result.requests:>6} {result.errors:>4} "
+            f"{result.throughput_rps:>8.1f} "
+            f"{format_duration(result.p50_s):>10} "
+            f"{format_duration(result.p95_s):>10} "
+            f"{format_duration(result.p99_s):>10} "
+            f"{sql:>5} {budget:>6}{flag}"
+        )
+    requests = run.meta["requests"]
+    print(
+        f"{requests} requests in {run.wall_seconds:.2f}s "
+        f"({requests / run.wall_seconds if run.wall_seconds else 0.0:.1f} req/s)"
+    )
+    if run.statements_total is not None and requests:
+        print(f"{run.statements_total / requests:.1f} SQL statements per request")
+
+
+def _parse_weights(raw: str) -> dict[str, float]:
+    return {name: float(value) for name, value in _parse_request_values(raw)}
+
+
+def _parse_budgets(raw: str) -> dict[str, int]:
+    return {name: int(value) for name, value in _parse_request_values(raw)}
+
+
+def _parse_request_values(raw: str) -> list[tuple[str, str]]:
+    values: list[tuple[str, str]] = []
+    for part in raw.split(","):
+        name, sep, value = part.strip().partition("=")
+        if not sep or name not in REQUEST_TYPES:
+            raise ValueError(f"invalid entry {part!r}, expected <request type>=N")
+        values.append((name, value))
+    return values
+
+
+def main() -> int:
+    import argparse
+
+    os.environ.setdefault("DB_POOL_ROLE", "api")
+    parser = argparse.ArgumentParser(
+        description="Load-test the plans API in-process and enforce per-request "
+        "SQL statement budgets."
+    )
+    parser.add_argument(
+        "--database-url",
+        type=str,
+        default=None,
+        help="default: fresh SQLite file in a temp dir; use a scratch Postgres "
+        "database for production-like numbers",
+    )
+    parser.add_argument(
+        "--reset-schema",
+        action="store_true",
+        help="drop and recreate all tables first (always on for the temp SQLite)",
+    )
+    parser.add_argument(
+        "--base-url",
+        type=str,
+        default=None,
+        help="target a running server (e.g. uvicorn) instead; no SQL counting",
+    )
+    parser.add_argument("--users", type=int, default=20, help="concurrent sessions")
+    parser.add_argument("--requests-per-user", type=int, default=25)
+    parser.add_argument(
+        "--mix",
+        type=_parse_weights,
+        default=None,
+        help="request weights, e.g. get_plan=4,get_tasks=4,patch_task=2,patch_facts=1",
+    )
+    parser.add_argument(
+        "--budget",
+        type=_parse_budgets,
+        default=None,
+        help="override statement budgets, e.g. patch_facts=20,get_plan=1",
+    )
+    parser.add_argument("--template-key", type=str, default=DEFAULT_TEMPLATE_KEY)
+    parser.add_argument("--profile-rounds", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=str, default=None, help="write JSON here")
+    parser.add_argument(
+        "--baseline",
+        type=str,
+        default=None,
+        help="results JSON to compare p95 latencies against",
+    )
+    parser.add_argument("--threshold", type=float, default=DEFAULT_REGRESSION_THRESHOLD)
+    args = parser.parse_args()
+
+    database = "remote"
+    if args.base_url is None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            database_url = (
+                args.database_url or f"sqlite:///{Path(tmp_dir) / 'api_load.db'}"
+            )
+            database = database_url.split(":", 1)[0]
+            prepare_database(
+                database_url,
+                reset=args.reset_schema or args.database_url is None,
+            )
+            run = _run(args)
+    else:
+        run = _run(args)
+
+    print_load_run(run)
+    document = results_document(SUITE, run.results, database=database, **run.meta)
+    if args.output:
+        write_results(Path(args.output), document)
+        print(f"Wrote {len(run.results)} results to {args.output}")
+
+    status = 0
+    for result in run.budget_violations:
+        print(
+            f"BUDGET EXCEEDED {result.name}: {result.statements_max} statements "
+            f"(budget {result.budget})"
+        )
+        status = 1
+    if run.errors:
+        print(f"ERRORS: {run.errors} requests did not succeed")
+        status = 1
+    if args.baseline:
+        regressions = compare_results(
+            document,
+            load_results(Path(args.baseline)),
+            threshold=args.threshold,
+            metric="p95_s",
+        )
+        status = max(status, report_regressions(regressions, args.threshold))
+    return status
+
+
+def _run(args: Any) -> LoadRun:
+    return asyncio.run(
+        run_api_load(
+            users=args.users,
+            requests_per_user=args.requests_per_user,
+            mix=args.mix,
+            budgets=args.budget,
+            template_key=args.template_key,
+            profile_rounds=args.profile_rounds,
+            seed=args.seed,
+            base_url=args.base_url,
+        )
+    )
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
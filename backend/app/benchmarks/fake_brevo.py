@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import TracebackType
+from typing import Any, Self
+from uuid import uuid4
+
+SEND_PATH = "/v3/smtp/email"
+
+OUTCOME_ACCEPTED = "accepted"
+OUTCOME_RATE_LIMITED = "rate_limited"
+OUTCOME_SERVER_ERROR = "server_error"
+OUTCOME_TIMEOUT = "timeout"
+OUTCOME_REJECTED = "rejected"
+
+
+@dataclass(frozen=True)
+class FakeBrevoBehavior:
+    """How the fake provider answers ``POST /v3/smtp/email``.
+
+    Rates are shares of all requests and must add up to at most 1. A timed
+    out request is held for ``timeout_seconds`` before it is answered, so
+    the client's own timeout has to be shorter.
+    """
+
+    latency_ms: float = 20.0
+    latency_jitter_ms: float = 0.0
+    rate_429: float = 0.0
+    rate_5xx: float = 0.0
+    timeout_rate: float = 0.0
+    timeout_seconds: float = 5.0
+    seed: int | None = None
+
+    def __post_init__(self) -> None:
+        for name in ("rate_429", "rate_5xx", "timeout_rate"):
+            value = getattr(self, name)
+            if not 0.0 <= value <= 1.0:
+                raise ValueError(f"{name} must be between 0 and 1")
+        if self.rate_429 + self.rate_5xx + self.timeout_rate > 1.0:
+            raise ValueError("rate_429 + rate_5xx + timeout_rate must be <= 1")
+        if self.latency_ms < 0 or self.latency_jitter_ms < 0:
+            raise ValueError("latency must not be negative")
+
+
+@dataclass
+class FakeBrevoStats:
+    requests: int = 0
+    outcomes: dict[str, int] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, outcome: str) -> None:
+        with self._lock:
+            self.requests += 1
+            self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+
+    def as_dict(self) -> dict[str, Any]:
+        with self._lock:
+            return {"requests": self.requests, "outcomes": dict(self.outcomes)}
+
+
+class FakeBrevoServer:
+    """Local stand-in for Brevo's transactional email endpoint.
+
+    Runs a threaded HTTP server on ``127.0.0.1`` (an ephemeral port unless
+    ``port`` is given). Point ``BREVO_BASE_URL`` or
+    ``NotificationConfig.brevo_base_url`` at ``base_url``; any non-empty
+    ``api-key`` header is accepted.
+    """
+
+    def __init__(
+        self, behavior: FakeBrevoBehavior | None = None, *, port: int = 0
+    ) -> None:
+        self.behavior = behavior or FakeBrevoBehavior()
+        self.stats = FakeBrevoStats()
+        self._rng = random.Random(self.behavior.seed)
+        self._rng_lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", port), _handler_for(self))
+        self._httpd.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v3"
+
+    def start(self) -> Self:
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name="fake-brevo", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> Self:
+        return self.start()
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.stop()
+
+    def draw(self) -> tuple[str, float]:
+        """Pick the outcome and latency (seconds) of the next request."""
+        behavior = self.behavior
+        with self._rng_lock:
+            roll = self._rng.random()
+            jitter = self._rng.uniform(0, behavior.latency_jitter_ms)
+        latency = (behavior.latency_ms + jitter) / 1000
+        if roll < behavior.timeout_rate:
+            return OUTCOME_TIMEOUT, behavior.timeout_seconds
+        roll -= behavior.timeout_rate
+        if roll < behavior.rate_429:
+            return OUTCOME_RATE_LIMITED, latency
+        roll -= behavior.rate_429
+        if roll < behavior.rate_5xx:
+            return OUTCOME_SERVER_ERROR, latency
+        return OUTCOME_ACCEPTED, latency
+
+
+def _handler_for(server: FakeBrevoServer) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self) -> None:
+            length = int(self.headers.get("content-length") or 0)
+            body = self.rfile.read(length) if length else b""
+            if self.path != SEND_PATH:
+                self._reply(404, {"code": "not_found", "message": "Not found"})
+                return
+            if not self.headers.get("api-key"):
+                server.stats.record(OUTCOME_REJECTED)
+                self._reply(401, {"code": "unauthorized", "message": "Key not found"})
+                return
+            try:
+                payload = json.loads(body)
+            except ValueError:
+                payload = None
+            if not isinstance(payload, dict) or not payload.get("to"):
+                server.stats.record(OUTCOME_REJECTED)
+                self._reply(400, {"code": "invalid_parameter", "message": "to"})
+                return
+
+            outcome, delay = server.draw()
+            server.stats.record(outcome)
+            time.sleep(delay)
+            if outcome == OUTCOME_RATE_LIMITED:
+                self._reply(
+                    429, {"code": "too_many_requests", "message": "Rate limited"}
+                )
+            elif outcome == OUTCOME_SERVER_ERROR:
+                self._reply(503, {"code": "service_unavailable", "message": "Retry"})
+            else:
+                self._reply(201, {"messageId": f"<{uuid4()}@fake-brevo.local>"})
+
+        def _reply(self, status: int, payload: dict[str, Any]) -> None:
+            encoded = json.dumps(payload).encode("utf-8")
+            try:
+                self.send_response(status)
+                self.send_header("content-type", "application/json")
+                self.send_header("content-length", str(len(encoded)))
+                self.end_headers()
+                self.wfile.write(encoded)
+            except (BrokenPipeError, ConnectionResetError):
+                # The client gave up (timeout); nothing left to answer.
+                self.close_connection = True
+
+        def log_message(self, format: str, *args: Any) -> None:
+            return
+
+    return Handler
+
+
+def main() -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Serve a fake Brevo /v3/smtp/email endpoint for load tests."
+    )
+    parser.add_argument("--port", type=int, default=8025)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--latency-jitter-ms", type=float, default=0.0)
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--rate-5xx", type=float, default=0.0)
+    parser.add_argument("--timeout-rate", type=float, default=0.0)
+    parser.add_argument("--timeout-seconds", type=float, default=15.0)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    server = FakeBrevoServer(
+        FakeBrevoBehavior(
+            latency_ms=args.latency_ms,
+            latency_jitter_ms=args.latency_jitter_ms,
+            rate_429=args.rate_429,
+            rate_5xx=args.rate_5xx,
+            timeout_rate=args.timeout_rate,
+            timeout_seconds=args.timeout_seconds,
+            seed=args.seed,
+        ),
+        port=args.port,
+    )
+    print(f"Fake Brevo listening, set BREVO_BASE_URL={server.base_url}")
+    server.start()
+    try:
+        while True:
+            time.sleep(5)
+            print(json.dumps(server.stats.as_dict()))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
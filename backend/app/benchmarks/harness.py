@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import json
+import math
+import platform
+import statistics
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, Protocol
+
+DEFAULT_REPEAT = 5
+DEFAULT_MIN_TIME_SECONDS = 0.05
+DEFAULT_REGRESSION_THRESHOLD = 0.25
+RESULTS_FORMAT_VERSION = 1
+KEY_COLUMN_WIDTH = 28
+
+
+class SupportsAsDict(Protocol):
+    def as_dict(self) -> dict[str, Any]: ...
+
+
+@dataclass(frozen=True)
+class Timing:
+    runs: int
+    loops: int
+    min_s: float
+    median_s: float
+    mean_s: float
+    p95_s: float
+
+
+@dataclass(frozen=True)
+class BenchmarkResult:
+    name: str
+    size: int
+    timing: Timing
+    params: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}[{self.size}]"
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "size": self.size,
+            "params": self.params,
+            **asdict(self.timing),
+        }
+
+
+@dataclass(frozen=True)
+class Regression:
+    key: str
+    baseline_s: float
+    current_s: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current_s / self.baseline_s if self.baseline_s > 0 else math.inf
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile of ``samples`` (``pct`` in 0..100)."""
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def measure(
+    fn: Callable[[], Any],
+    *,
+    repeat: int = DEFAULT_REPEAT,
+    min_time: float = DEFAULT_MIN_TIME_SECONDS,
+    clock: Callable[[], float] = time.perf_counter,
+) -> Timing:
+    """Time ``fn`` per call, like ``timeit.autorange`` plus ``repeat``.
+
+    The loop count doubles until one sample takes at least ``min_time``, so
+    fast and slow cases get comparably stable numbers.
+    """
+    loops = 1
+    while True:
+        elapsed = _run(fn, loops, clock)
+        if elapsed >= min_time or loops >= 1 << 20:
+            break
+        loops *= 2
+
+    samples = [elapsed / loops]
+    for _ in range(repeat - 1):
+        samples.append(_run(fn, loops, clock) / loops)
+    return Timing(
+        runs=len(samples),
+        loops=loops,
+        min_s=min(samples),
+        median_s=statistics.median(samples),
+        mean_s=statistics.fmean(samples),
+        p95_s=percentile(samples, 95),
+    )
+
+
+def _run(fn: Callable[[], Any], loops: int, clock: Callable[[], float]) -> float:
+    started = clock()
+    for _ in range(loops):
+        fn()
+    return clock() - started
+
+
+def results_document(
+    suite: str, results: list[SupportsAsDict], **meta: Any
+) -> dict[str, Any]:
+    return {
+        "format": RESULTS_FORMAT_VERSION,
+        "suite": suite,
+        "created_at": datetime.now(UTC).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        **meta,
+        "results": [result.as_dict() for result in results],
+    }
+
+
+def write_results(path: Path, document: dict[str, Any]) -> None:
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path.write_text(json.dumps(document, indent=2), encoding="utf-8")
+    tmp_path.replace(path)
+
+
+def load_results(path: Path) -> dict[str, Any]:
+    document = json.loads(path.read_text(encoding="utf-8"))
+    if document.get("format") != RESULTS_FORMAT_VERSION:
+        raise ValueError(f"{path}: unsupported benchmark results format")
+    return document
+
+
+def compare_results(
+    current: dict[str, Any],
+    baseline: dict[str, Any],
+    *,
+    threshold: float = DEFAULT_REGRESSION_THRESHOLD,
+    metric: str = "median_s",
+) -> list[Regression]:
+    """Return cases whose ``metric`` grew by more than ``threshold`` (0.25 = 25%).
+
+    Cases missing from either document are ignored, so adding sizes or new
+    benchmarks does not fail a comparison against an older baseline.
+    """
+    if current.get("suite") != baseline.get("suite"):
+        raise ValueError(
+            f"cannot compare suite {current.get('suite')!r} "
+            f"with baseline of {baseline.get('suite')!r}"
+        )
+    baseline_by_key = {_result_key(item): item for item in baseline["results"]}
+    regressions: list[Regression] = []
+    for item in current["results"]:
+        reference = baseline_by_key.get(_result_key(item))
+        if reference is None:
+            continue
+        baseline_s = float(reference[metric])
+        current_s = float(item[metric])
+        if current_s > baseline_s * (1 + threshold):
+            regressions.append(
+                Regression(
+                    key=_result_key(item), baseline_s=baseline_s, current_s=current_s
+                )
+            )
+    return regressions
+
+
+def _result_key(item: dict[str, Any]) -> str:
+    return f"{item['name']}[{item['size']}]"
+
+
+def format_duration(seconds: float) -> str:
+    if seconds >= 1:
+        return f"{seconds:.3f}s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.3f}ms"
+    return f"{seconds * 1e6:.1f}us"
+
+
+def print_results(results: list[BenchmarkResult]) -> None:
+    width = max([KEY_COLUMN_WIDTH, *(len(result.key) for result in results)])
+    for result in results:
+        timing = result.timing
+        print(
+            f"{result.key:<{width}}  "
+            f"median {format_duration(timing.median_s):>10}  "
+            f"p95 {format_duration(timing.p95_s):>10}  "
+            f"min {format_duration(timing.min_s):>10}  "
+            f"({timing.runs}x{timing.loops})"
+        )
+
+
+def report_regressions(regressions: list[Regression], threshold: float) -> int:
+    if not regressions:
+        print(f"OK: no regressions above {threshold:.0%}")
+        return 0
+    for regression in regressions:
+        print(
+            f"REGRESSION {regression.key}: "
+            f"{format_duration(regression.baseline_s)} -> "
+            f"{format_duration(regression.current_s)} "
+            f"(x{regression.ratio:.2f})"
+        )
+    return 1
@@ -0,0 +1,484 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any
+from uuid import uuid4
+
+import httpx
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.benchmarks.api_load import prepare_database
+from app.benchmarks.fake_brevo import FakeBrevoBehavior, FakeBrevoServer
+from app.benchmarks.harness import (
+    DEFAULT_REGRESSION_THRESHOLD,
+    compare_results,
+    load_results,
+    report_regressions,
+    results_document,
+    write_results,
+)
+from app.db.models import (
+    NotificationOutbox,
+    NotificationOutboxStatus,
+    NotificationProfile,
+    Plan,
+    PlanStatus,
+    Task,
+    TaskStatus,
+)
+from app.db.session import get_session_factory
+from app.notifications.brevo_provider import BrevoEmailProvider
+from app.notifications.config import NotificationConfig
+from app.notifications.time_utils import BERLIN_TZ
+from app.services.outbox_dispatcher_service import (
+    DispatchSummary,
+    OutboxDispatcherService,
+)
+from app.services.reminder_scanner_service import (
+    DEFAULT_SCAN_CHUNK_SIZE,
+    ReminderScannerService,
+    ScanSummary,
+)
+
+SUITE = "notifications"
+
+# A Monday morning inside the send window.
+DEFAULT_START = datetime(2026, 3, 2, 9, 0, tzinfo=BERLIN_TZ)
+SEED_CHUNK_SIZE = 1000
+MAX_DISPATCH_ROUNDS = 10_000
+DUE_SOON_DAYS = 4
+
+
+@dataclass(frozen=True)
+class StageResult:
+    name: str
+    size: int
+    seconds: float
+    items: int
+    extra: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def rate_per_s(self) -> float:
+        return self.items / self.seconds if self.seconds > 0 else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "size": self.size,
+            "seconds": self.seconds,
+            "items": self.items,
+            "rate_per_s": self.rate_per_s,
+            **self.extra,
+        }
+
+
+@dataclass
+class DispatchTotals:
+    rounds: int = 0
+    attempts: int = 0
+    sent: int = 0
+    retried: int = 0
+    dead: int = 0
+    time_jumps: int = 0
+    seconds: float = 0.0
+    simulated_minutes: float = 0.0
+
+    def add(self, summary: DispatchSummary) -> None:
+        self.rounds += 1
+        self.attempts += summary.picked
+        self.sent += summary.sent
+        self.retried += summary.retried
+        self.dead += summary.dead
+
+
+@dataclass
+class PipelineRun:
+    stages: list[StageResult]
+    scan: ScanSummary
+    dispatch: DispatchTotals
+    failures_before_outcome: dict[str, dict[int, int]]
+    provider: dict[str, Any]
+
+
+def seed_reminder_data(
+    session_factory: sessionmaker[Session],
+    *,
+    profiles: int,
+    tasks_per_plan: int,
+    due_per_plan: int,
+    today: date,
+) -> int:
+    """Insert ``profiles`` plans with one sendable profile each.
+
+    The first ``due_per_plan`` tasks of every plan fall into the due-soon
+    window, the rest are due a month later. Returns the number of tasks.
+    """
+    task_count = 0
+    for chunk_start in range(0, profiles, SEED_CHUNK_SIZE):
+        chunk = range(chunk_start, min(profiles, chunk_start + SEED_CHUNK_SIZE))
+        plan_ids = [uuid4() for _ in chunk]
+        plan_rows = [
+            {
+                "id": plan_id,
+                "template_id": "birth_de",
+                "template_version": 2,
+                "template_key": "birth_de/v2",
+                "facts": {},
+                "snapshot": {},
+                "status": PlanStatus.active.value,
+            }
+            for plan_id in plan_ids
+        ]
+        task_rows = [
+            {
+                "plan_id": plan_id,
+                "task_key": f"bench_task_{idx}",
+                "title": f"Benchmark task {idx}",
+                "status": TaskStatus.todo.value,
+                "due_date": (
+                    today + timedelta(days=idx % DUE_SOON_DAYS)
+                    if idx < due_per_plan
+                    else today + timedelta(days=30)
+                ),
+                "metadata_json": {"category": "admin", "priority": "normal"},
+                "task_template_version": 2,
+                "task_kind": "normal",
+                "sort_key": idx,
+            }
+            for plan_id in plan_ids
+            for idx in range(tasks_per_plan)
+        ]
+        profile_rows = [
+            {
+                "id": uuid4(),
+                "plan_id": plan_id,
+                "email": f"bench{number}@bench.example",
+                "email_consent": True,
+                "locale": "de-DE",
+                "timezone": "Europe/Berlin",
+                "reminder_due_soon_enabled": True,
+                "max_reminders_per_day": 1,
+                "unsubscribe_token_version": 1,
+            }
+            for number, plan_id in zip(chunk, plan_ids)
+        ]
+        with session_factory() as session:
+            session.execute(insert(Plan), plan_rows)
+            if task_rows:
+                session.execute(insert(Task), task_rows)
+            session.execute(insert(NotificationProfile), profile_rows)
+            session.commit()
+        task_count += len(task_rows)
+    return task_count
+
+
+def drain_outbox(
+    session_factory: sessionmaker[Session],
+    dispatcher: OutboxDispatcherService,
+    *,
+    start: datetime,
+    batch_size: int,
+    max_rounds: int = MAX_DISPATCH_ROUNDS,
+) -> DispatchTotals:
+    """Dispatch until no pending row is left, skipping retry backoffs.
+
+    Whenever a round claims nothing, the simulated clock jumps to the next
+    ``next_attempt_at``, so retries run back to back in wall time while the
+    backoff schedule itself is kept.
+    """
+    totals = DispatchTotals()
+    now = start
+    started = time.perf_counter()
+    for _ in range(max_rounds):
+        with session_factory() as session:
+            summary = dispatcher.dispatch_pending(
+                session, now=now, batch_size=batch_size
+            )
+        totals.add(summary)
+        if summary.picked:
+            continue
+        with session_factory() as session:
+            next_due = session.scalar(
+                select(func.min(NotificationOutbox.next_attempt_at)).where(
+                    NotificationOutbox.status == NotificationOutboxStatus.pending.value
+                )
+            )
+        if next_due is None:
+            break
+        next_due = _as_berlin(next_due)
+        if next_due <= now:
+            break
+        now = next_due
+        totals.time_jumps += 1
+    totals.seconds = time.perf_counter() - started
+    totals.simulated_minutes = (now - start).total_seconds() / 60
+    return totals
+
+
+def _as_berlin(value: datetime) -> datetime:
+    # SQLite drops the offset and keeps the wall time of the aware Berlin
+    # datetimes the services write; Postgres returns aware values.
+    if value.tzinfo is None:
+        return value.replace(tzinfo=BERLIN_TZ)
+    return value.astimezone(BERLIN_TZ)
+
+
+def _failures_before_outcome(
+    session_factory: sessionmaker[Session],
+) -> dict[str, dict[int, int]]:
+    """Failed attempts per outbox row, bucketed by final status."""
+    with session_factory() as session:
+        rows = session.execute(
+            select(
+                NotificationOutbox.status,
+                NotificationOutbox.attempt_count,
+                func.count(),
+            ).group_by(NotificationOutbox.status, NotificationOutbox.attempt_count)
+        ).all()
+    histogram: dict[str, Counter[int]] = {}
+    for status, attempt_count, count in rows:
+        histogram.setdefault(status, Counter())[attempt_count] += count
+    return {
+        status: dict(sorted(counts.items())) for status, counts in histogram.items()
+    }
+
+
+def run_notification_pipeline(
+    *,
+    profiles: int,
+    tasks_per_plan: int = 8,
+    due_per_plan: int = 2,
+    behavior: FakeBrevoBehavior | None = None,
+    dispatch_concurrency: int = 8,
+    rate_limit_per_second: float = 0.0,
+    batch_size: int = 100,
+    scan_chunk_size: int = DEFAULT_SCAN_CHUNK_SIZE,
+    client_timeout: float = 2.0,
+    start: datetime = DEFAULT_START,
+) -> PipelineRun:
+    """Seed, scan and dispatch against a fake Brevo on the configured DB.
+
+    Expects an empty schema (see ``prepare_database``). The provider gets
+    its own ``httpx.Client`` with ``client_timeout`` so simulated provider
+    timeouts do not take the production 10s each.
+    """
+    session_factory = get_session_factory()
+    today = start.astimezone(BERLIN_TZ).date()
+
+    started = time.perf_counter()
+    tasks_seeded = seed_reminder_data(
+        session_factory,
+        profiles=profiles,
+        tasks_per_plan=tasks_per_plan,
+        due_per_plan=due_per_plan,
+        today=today,
+    )
+    seed_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    with session_factory() as session:
+        scan = ReminderScannerService(chunk_size=scan_chunk_size).scan_due_soon(
+            session, now=start, app_base_url="http://localhost:3000"
+        )
+    scan_seconds = time.perf_counter() - started
+
+    with FakeBrevoServer(behavior) as server:
+        config = NotificationConfig(
+            app_base_url="http://localhost:3000",
+            from_email="noreply@bench.example",
+            from_name="Life Event Benchmark",
+            brevo_api_key="bench-key",
+            brevo_base_url=server.base_url,
+            email_dry_run=False,
+            allowed_recipient_domains=set(),
+            dispatch_concurrency=dispatch_concurrency,
+            provider_rate_limit_per_second=rate_limit_per_second,
+        )
+        pool_size = max(1, dispatch_concurrency)
+        http_client = httpx.Client(
+            timeout=client_timeout,
+            limits=httpx.Limits(
+                max_connections=pool_size, max_keepalive_connections=pool_size
+            ),
+        )
+        dispatcher = OutboxDispatcherService(
+            config, provider=BrevoEmailProvider(config, client=http_client)
+        )
+        try:
+            dispatch = drain_outbox(
+                session_factory, dispatcher, start=start, batch_size=batch_size
+            )
+        finally:
+            http_client.close()
+        provider = server.stats.as_dict()
+
+    stages = [
+        StageResult("seed", profiles, seed_seconds, tasks_seeded),
+        StageResult(
+            "scan",
+            profiles,
+            scan_seconds,
+            scan.outbox_created,
+            extra={"tasks_matched": scan.tasks_matched, "errors": scan.errors},
+        ),
+        StageResult(
+            "dispatch",
+            profiles,
+            dispatch.seconds,
+            dispatch.sent,
+            extra={
+                "attempts": dispatch.attempts,
+                "attempts_per_s": (
+                    dispatch.attempts / dispatch.seconds if dispatch.seconds else 0.0
+                ),
+                "retried": dispatch.retried,
+                "dead": dispatch.dead,
+                "rounds": dispatch.rounds,
+                "simulated_minutes": dispatch.simulated_minutes,
+            },
+        ),
+    ]
+    return PipelineRun(
+        stages=stages,
+        scan=scan,
+        dispatch=dispatch,
+        failures_before_outcome=_failures_before_outcome(session_factory),
+        provider=provider,
+    )
+
+
+def print_pipeline_run(run: PipelineRun) -> None:
+    for stage in run.stages:
+        print(
+            f"{stage.name:<9} {stage.items:>8} items in {stage.seconds:8.3f}s "
+            f"({stage.rate_per_s:10.1f}/s)"
+        )
+    dispatch = run.dispatch
+    print(
+        f"dispatch: {dispatch.attempts} attempts, {dispatch.sent} sent, "
+        f"{dispatch.retried} retried, {dispatch.dead} dead in {dispatch.rounds} "
+        f"rounds ({dispatch.simulated_minutes:.0f} simulated minutes of backoff)"
+    )
+    print(f"provider: {run.provider}")
+    print(f"failed attempts per final status: {run.failures_before_outcome}")
+
+
+def main() -> int:
+    import argparse
+
+    os.environ.setdefault("DB_POOL_ROLE", "worker")
+    parser = argparse.ArgumentParser(
+        description="Benchmark reminder scan and outbox dispatch against a local "
+        "fake Brevo server."
+    )
+    parser.add_argument("--profiles", type=int, default=1000)
+    parser.add_argument("--tasks-per-plan", type=int, default=8)
+    parser.add_argument("--due-per-plan", type=int, default=2)
+    parser.add_argument(
+        "--database-url",
+        type=str,
+        default=None,
+        help="default: fresh SQLite file in a temp dir; use a scratch Postgres "
+        "database for production-like numbers",
+    )
+    parser.add_argument(
+        "--reset-schema",
+        action="store_true",
+        help="drop and recreate all tables first (always on for the temp SQLite)",
+    )
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--latency-jitter-ms", type=float, default=0.0)
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--rate-5xx", type=float, default=0.0)
+    parser.add_argument("--timeout-rate", type=float, default=0.0)
+    parser.add_argument("--client-timeout", type=float, default=2.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=8,
+        help="provider requests in flight per dispatch (EMAIL_DISPATCH_CONCURRENCY)",
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        default=0.0,
+        help="provider requests per second (EMAIL_PROVIDER_RATE_LIMIT_PER_SECOND)",
+    )
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--scan-chunk-size", type=int, default=DEFAULT_SCAN_CHUNK_SIZE)
+    parser.add_argument("--output", type=str, default=None, help="write JSON here")
+    parser.add_argument(
+        "--baseline",
+        type=str,
+        default=None,
+        help="results JSON to compare stage durations against",
+    )
+    parser.add_argument("--threshold", type=float, default=DEFAULT_REGRESSION_THRESHOLD)
+    args = parser.parse_args()
+
+    behavior = FakeBrevoBehavior(
+        latency_ms=args.latency_ms,
+        latency_jitter_ms=args.latency_jitter_ms,
+        rate_429=args.rate_429,
+        rate_5xx=args.rate_5xx,
+        timeout_rate=args.timeout_rate,
+        # Held well past the client timeout so timeouts are real ones.
+        timeout_seconds=args.client_timeout * 2,
+        seed=args.seed,
+    )
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        database_url = args.database_url or f"sqlite:///{Path(tmp_dir) / 'bench.db'}"
+        prepare_database(
+            database_url, reset=args.reset_schema or args.database_url is None
+        )
+        run = run_notification_pipeline(
+            profiles=args.profiles,
+            tasks_per_plan=args.tasks_per_plan,
+            due_per_plan=args.due_per_plan,
+            behavior=behavior,
+            dispatch_concurrency=args.concurrency,
+            rate_limit_per_second=args.rate_limit,
+            batch_size=args.batch_size,
+            scan_chunk_size=args.scan_chunk_size,
+            client_timeout=args.client_timeout,
+        )
+
+    print_pipeline_run(run)
+    document = results_document(
+        SUITE,
+        run.stages,
+        database=database_url.split(":", 1)[0],
+        concurrency=args.concurrency,
+        batch_size=args.batch_size,
+        provider=run.provider,
+        failures_before_outcome=run.failures_before_outcome,
+    )
+    if args.output:
+        write_results(Path(args.output), document)
+        print(f"Wrote {len(run.stages)} results to {args.output}")
+
+    status = 0
+    if run.scan.errors:
+        print(f"ERRORS: {run.scan.errors} profiles failed during the scan")
+        status = 1
+    if args.baseline:
+        regressions = compare_results(
+            document,
+            load_results(Path(args.baseline)),
+            threshold=args.threshold,
+            metric="seconds",
+        )
+        status = max(status, report_regressions(regressions, args.threshold))
+    return status
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import replace
+from pathlib import Path
+from typing import Any
+
+from app.benchmarks.harness import (
+    DEFAULT_MIN_TIME_SECONDS,
+    DEFAULT_REGRESSION_THRESHOLD,
+    DEFAULT_REPEAT,
+    BenchmarkResult,
+    compare_results,
+    load_results,
+    measure,
+    print_results,
+    report_regressions,
+    results_document,
+    write_results,
+)
+from app.benchmarks.workflows import (
+    WorkflowSpec,
+    generate_workflow,
+    parse_operator_mix,
+    synthetic_facts,
+)
+from app.domain.workflow_validator import validate_graph
+from app.planner.compiled import compile_workflow
+from app.planner.engine import generate_plan
+from app.planner.rules import eval_rule
+from app.planner.toposort import toposort_task_ids
+
+DEFAULT_SIZES = (10, 100, 1000, 10000)
+FACT_SETS = 8
+
+SUITE = "planner"
+
+
+def planner_cases(spec: WorkflowSpec) -> list[tuple[str, Callable[[], Any]]]:
+    """Benchmark callables for one synthetic workflow.
+
+    ``generate_plan.cold`` passes the workflow dict and so compiles and lays
+    out the graph on every call; ``generate_plan.warm`` reuses one compiled
+    program whose layout memo is filled after the first round of fact sets,
+    which is the steady state of a long-lived API or worker process.
+    """
+    workflow = generate_workflow(spec)
+    facts_pool = [synthetic_facts(spec, seed=spec.seed + n) for n in range(FACT_SETS)]
+    task_ids = set(workflow["tasks"])
+    edges = [(edge["from"], edge["to"]) for edge in workflow["graph"]["edges"]]
+    rules = [task["eligibility"] for task in workflow["tasks"].values()]
+    program = compile_workflow(workflow)
+    rounds = {"cold": 0, "warm": 0}
+
+    def next_facts(kind: str) -> dict[str, Any]:
+        rounds[kind] += 1
+        return facts_pool[rounds[kind] % FACT_SETS]
+
+    def eval_all_rules() -> None:
+        facts = facts_pool[0]
+        for rule in rules:
+            eval_rule(rule, facts)
+
+    return [
+        ("validate_graph", lambda: validate_graph(workflow)),
+        ("toposort_task_ids", lambda: toposort_task_ids(task_ids, edges)),
+        ("eval_rule", eval_all_rules),
+        ("compile_workflow", lambda: compile_workflow(workflow)),
+        ("generate_plan.cold", lambda: generate_plan(workflow, next_facts("cold"))),
+        ("generate_plan.warm", lambda: generate_plan(program, next_facts("warm"))),
+    ]
+
+
+def run_planner_suite(
+    spec: WorkflowSpec,
+    sizes: tuple[int, ...] = DEFAULT_SIZES,
+    *,
+    repeat: int = DEFAULT_REPEAT,
+    min_time: float = DEFAULT_MIN_TIME_SECONDS,
+    only: frozenset[str] | None = None,
+    on_result: Callable[[BenchmarkResult], None] | None = None,
+) -> list[BenchmarkResult]:
+    """Run every planner case once per size; ``spec.tasks`` is overridden."""
+    results: list[BenchmarkResult] = []
+    for size in sizes:
+        sized = replace(spec, tasks=size)
+        params = sized.as_dict()
+        for name, fn in planner_cases(sized):
+            if only is not None and name not in only:
+                continue
+            timing = measure(fn, repeat=repeat, min_time=min_time)
+            result = BenchmarkResult(name=name, size=size, timing=timing, params=params)
+            results.append(result)
+            if on_result is not None:
+                on_result(result)
+    return results
+
+
+def _parse_sizes(raw: str) -> tuple[int, ...]:
+    return tuple(int(part) for part in raw.split(",") if part.strip())
+
+
+def main() -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Benchmark planner, rules, toposort and graph validation "
+        "on synthetic workflows."
+    )
+    parser.add_argument(
+        "--sizes",
+        type=_parse_sizes,
+        default=DEFAULT_SIZES,
+        help="comma separated task counts (default 10,100,1000,10000)",
+    )
+    parser.add_argument("--edge-density", type=float, default=1.5)
+    parser.add_argument("--edge-window", type=int, default=50)
+    parser.add_argument("--rule-depth", type=int, default=2)
+    parser.add_argument("--rule-fanout", type=int, default=2)
+    parser.add_argument(
+        "--operator-mix",
+        type=parse_operator_mix,
+        default=None,
+        help='weights per operator, e.g. "=:4,in:2,>=:1,exists:1"',
+    )
+    parser.add_argument("--fact-cardinality", type=int, default=20)
+    parser.add_argument("--fact-values", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--min-time", type=float, default=DEFAULT_MIN_TIME_SECONDS)
+    parser.add_argument(
+        "--only",
+        type=str,
+        default=None,
+        help="comma separated case names, e.g. generate_plan.warm,eval_rule",
+    )
+    parser.add_argument("--output", type=str, default=None, help="write JSON here")
+    parser.add_argument(
+        "--baseline",
+        type=str,
+        default=None,
+        help="results JSON to compare against; exits 1 on regressions",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_REGRESSION_THRESHOLD,
+        help="allowed median slowdown before flagging (0.25 = 25%%)",
+    )
+    args = parser.parse_args()
+
+    spec_kwargs: dict[str, Any] = {}
+    if args.operator_mix is not None:
+        spec_kwargs["operator_mix"] = args.operator_mix
+    spec = WorkflowSpec(
+        tasks=1,
+        edge_density=args.edge_density,
+        edge_window=args.edge_window,
+        rule_depth=args.rule_depth,
+        rule_fanout=args.rule_fanout,
+        fact_cardinality=args.fact_cardinality,
+        fact_values=args.fact_values,
+        seed=args.seed,
+        **spec_kwargs,
+    )
+    only = frozenset(args.only.split(",")) if args.only else None
+    results = run_planner_suite(
+        spec,
+        args.sizes,
+        repeat=args.repeat,
+        min_time=args.min_time,
+        only=only,
+        on_result=lambda result: print_results([result]),
+    )
+
+    document = results_document(SUITE, results)
+    if args.output:
+        write_results(Path(args.output), document)
+        print(f"Wrote {len(results)} results to {args.output}")
+
+    if args.baseline:
+        baseline = load_results(Path(args.baseline))
+        regressions = compare_results(document, baseline, threshold=args.threshold)
+        return report_regressions(regressions, args.threshold)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
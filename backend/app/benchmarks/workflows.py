@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from typing import Any
+
+CATEGORICAL_OPS = frozenset({"=", "!=", "in"})
+NUMERIC_OPS = frozenset({">", ">=", "<", "<="})
+SUPPORTED_OPS = CATEGORICAL_OPS | NUMERIC_OPS | {"exists"}
+
+DEFAULT_OPERATOR_MIX: tuple[tuple[str, float], ...] = (
+    ("=", 4.0),
+    ("!=", 1.0),
+    ("in", 2.0),
+    (">", 1.0),
+    (">=", 1.0),
+    ("<", 1.0),
+    ("<=", 1.0),
+    ("exists", 1.0),
+)
+
+EVENT_DATE_KEY = "event_date"
+NUMERIC_FACT_MAX = 100
+
+
+@dataclass(frozen=True)
+class WorkflowSpec:
+    """Shape of a synthetic workflow.
+
+    ``edge_density`` is the mean number of predecessors per task, drawn from
+    the ``edge_window`` tasks before it so the graph stays acyclic and local
+    like real templates. ``rule_depth`` nests ``all``/``any``/``not`` groups
+    of ``rule_fanout`` clauses above the predicates; 0 means one predicate.
+    Facts alternate between categorical (``fact_values`` distinct values)
+    and numeric, ``fact_cardinality`` keys in total.
+    """
+
+    tasks: int
+    edge_density: float = 1.5
+    edge_window: int = 50
+    rule_depth: int = 2
+    rule_fanout: int = 2
+    operator_mix: tuple[tuple[str, float], ...] = DEFAULT_OPERATOR_MIX
+    fact_cardinality: int = 20
+    fact_values: int = 5
+    seed: int = 0
+
+    def __post_init__(self) -> None:
+        if self.tasks < 1:
+            raise ValueError("tasks must be >= 1")
+        if self.edge_density < 0 or self.edge_window < 1:
+            raise ValueError("edge_density must be >= 0 and edge_window >= 1")
+        if self.rule_depth < 0 or self.rule_fanout < 1:
+            raise ValueError("rule_depth must be >= 0 and rule_fanout >= 1")
+        if self.fact_cardinality < 2 or self.fact_values < 1:
+            raise ValueError("fact_cardinality must be >= 2 and fact_values >= 1")
+        unknown = {op for op, _ in self.operator_mix} - SUPPORTED_OPS
+        if unknown:
+            raise ValueError(f"unsupported operators in mix: {sorted(unknown)}")
+        if not any(weight > 0 for _, weight in self.operator_mix):
+            raise ValueError("operator_mix needs at least one positive weight")
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "tasks": self.tasks,
+            "edge_density": self.edge_density,
+            "edge_window": self.edge_window,
+            "rule_depth": self.rule_depth,
+            "rule_fanout": self.rule_fanout,
+            "operator_mix": dict(self.operator_mix),
+            "fact_cardinality": self.fact_cardinality,
+            "fact_values": self.fact_values,
+            "seed": self.seed,
+        }
+
+
+def parse_operator_mix(raw: str) -> tuple[tuple[str, float], ...]:
+    """Parse ``"=:4,in:2,>:1"`` into an operator mix."""
+    mix: list[tuple[str, float]] = []
+    for part in raw.split(","):
+        op, sep, weight = part.strip().rpartition(":")
+        if not sep or not op:
+            raise ValueError(f"invalid operator weight {part!r}, expected op:weight")
+        mix.append((op, float(weight)))
+    return tuple(mix)
+
+
+def fact_keys(spec: WorkflowSpec) -> list[str]:
+    return [f"f_{idx:03d}" for idx in range(spec.fact_cardinality)]
+
+
+def _is_numeric_fact(key: str) -> bool:
+    return int(key[2:]) % 2 == 1
+
+
+def _categorical_value(idx: int) -> str:
+    return f"v{idx}"
+
+
+def generate_workflow(spec: WorkflowSpec) -> dict[str, Any]:
+    """Build a deterministic workflow dict for ``spec`` (same seed, same dict)."""
+    rng = random.Random(spec.seed)
+    width = max(5, len(str(spec.tasks - 1)))
+    task_ids = [f"t_{idx:0{width}d}" for idx in range(spec.tasks)]
+    keys = fact_keys(spec)
+    categorical = [key for key in keys if not _is_numeric_fact(key)]
+    numeric = [key for key in keys if _is_numeric_fact(key)]
+    ops = [op for op, weight in spec.operator_mix if weight > 0]
+    weights = [weight for _, weight in spec.operator_mix if weight > 0]
+
+    def predicate() -> dict[str, Any]:
+        op = rng.choices(ops, weights)[0]
+        if op == "exists":
+            return {"fact": rng.choice(keys), "op": op}
+        if op in NUMERIC_OPS:
+            return {
+                "fact": rng.choice(numeric),
+                "op": op,
+                "value": rng.randint(0, NUMERIC_FACT_MAX),
+            }
+        fact = rng.choice(categorical)
+        if op == "in":
+            size = rng.randint(1, spec.fact_values)
+            values = rng.sample(range(spec.fact_values), size)
+            return {
+                "fact": fact,
+                "op": op,
+                "value": [_categorical_value(idx) for idx in sorted(values)],
+            }
+        return {
+            "fact": fact,
+            "op": op,
+            "value": _categorical_value(rng.randrange(spec.fact_values)),
+        }
+
+    def rule(depth: int) -> dict[str, Any]:
+        if depth == 0:
+            return predicate()
+        if rng.random() < 0.1:
+            return {"not": rule(depth - 1)}
+        group = "all" if rng.random() < 0.6 else "any"
+        return {group: [rule(depth - 1) for _ in range(spec.rule_fanout)]}
+
+    whole, fraction = divmod(spec.edge_density, 1)
+    edges: list[dict[str, str]] = []
+    tasks: dict[str, dict[str, Any]] = {}
+    for idx, task_id in enumerate(task_ids):
+        window_start = max(0, idx - spec.edge_window)
+        wanted = int(whole) + (1 if rng.random() < fraction else 0)
+        count = min(wanted, idx - window_start)
+        for source in sorted(rng.sample(range(window_start, idx), count)):
+            edges.append({"from": task_ids[source], "to": task_id})
+
+        tasks[task_id] = {
+            "title": f"Synthetic task {idx}",
+            "eligibility": rule(spec.rule_depth),
+            "deadline": {
+                "type": "relative_days",
+                "offset_days": rng.randint(-30, 365),
+                "grace_days": rng.randint(0, 14),
+            },
+        }
+
+    return {
+        "template_id": f"synthetic_{spec.tasks}",
+        "version": 1,
+        "event_date_key": EVENT_DATE_KEY,
+        "graph": {"nodes": task_ids, "edges": edges},
+        "tasks": tasks,
+    }
+
+
+def synthetic_facts(
+    spec: WorkflowSpec, seed: int, *, presence: float = 0.9
+) -> dict[str, Any]:
+    """Random facts for ``spec``; each key is set with probability ``presence``."""
+    rng = random.Random(seed)
+    facts: dict[str, Any] = {EVENT_DATE_KEY: "2026-01-15"}
+    for key in fact_keys(spec):
+        if rng.random() >= presence:
+            continue
+        if _is_numeric_fact(key):
+            facts[key] = rng.randint(0, NUMERIC_FACT_MAX)
+        else:
+            facts[key] = _categorical_value(rng.randrange(spec.fact_values))
+    return facts
@@ -11,7 +11,9 @@ from sqlalchemy import (
     Date,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
+    LargeBinary,
     String,
     Text,
     UniqueConstraint,
@@ -89,12 +91,66 @@ class Plan(Base):
     tasks: Mapped[list[Task]] = relationship(
         back_populates="plan", cascade="all, delete-orphan"
     )
+    snapshots: Mapped[list[PlanSnapshot]] = relationship(
+        back_populates="plan",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        order_by="PlanSnapshot.created_at",
+    )
+
+
+# Append-only planner output, one row per generation or recompute.
+# plans.snapshot keeps only a meta projection plus the latest row's id.
+class PlanSnapshot(Base):
+    __tablename__ = "plan_snapshots"
+    __table_args__ = (
+        Index("ix_plan_snapshots_plan_id_created_at", "plan_id", "created_at"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
+    plan_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("plans.id", ondelete="CASCADE"), nullable=False
+    )
+    reason: Mapped[str | None] = mapped_column(String(32), nullable=True)
+    facts_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    # Either a shared plan_bodies row plus the event date it is rebased on,
+    # or (for plans that cannot be normalized) the plan body inline.
+    body_hash: Mapped[str | None] = mapped_column(
+        ForeignKey("plan_bodies.body_hash"), nullable=True, index=True
+    )
+    event_date: Mapped[date | None] = mapped_column(Date, nullable=True)
+    planner_plan: Mapped[dict[str, Any] | None] = mapped_column(
+        JSON_TYPE, nullable=True, deferred=True
+    )
+    recompute_delta: Mapped[dict[str, Any] | None] = mapped_column(
+        JSON_TYPE, nullable=True, deferred=True
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+    plan: Mapped[Plan] = relationship(back_populates="snapshots")
+
+
+# Content-addressed planner plan bodies with deadlines as event-date offsets,
+# shared by every snapshot that normalizes to the same body.
+class PlanBody(Base):
+    __tablename__ = "plan_bodies"
+
+    body_hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    encoding: Mapped[str] = mapped_column(String(16), nullable=False)
+    payload: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
 
 
 class Task(Base):
     __tablename__ = "tasks"
     __table_args__ = (
         UniqueConstraint("plan_id", "task_key", name="uq_tasks_plan_task_key"),
+        Index("ix_tasks_plan_id_sort_key_id", "plan_id", "sort_key", "id"),
+        Index("ix_tasks_plan_id_due_date", "plan_id", "due_date"),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
@@ -115,6 +171,7 @@ class Task(Base):
     task_template_version: Mapped[int] = mapped_column(
         Integer, nullable=False, default=1
     )
+    task_kind: Mapped[str] = mapped_column(String(16), nullable=False, default="normal")
     sort_key: Mapped[int] = mapped_column(Integer, nullable=False)
     completed_at: Mapped[datetime | None] = mapped_column(
         DateTime(timezone=True), nullable=True
@@ -236,3 +293,15 @@ class TemplateVersion(Base):
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=False, server_default=func.now()
     )
+
+
+# Single-row counter bumped by every template catalog write, so other
+# processes can tell when their cached catalog is stale.
+class TemplateCatalogRevision(Base):
+    __tablename__ = "template_catalog_revision"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    revision: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
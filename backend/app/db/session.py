@@ -1,42 +1,293 @@
 from __future__ import annotations
 
+import functools
 import os
-from collections.abc import Generator
+import threading
+import time
+from collections.abc import AsyncGenerator, Callable, Generator, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
+from typing import Any, TypeVar
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
 
 
+_DATABASE_URL: str | None = None
+_REPLICA_URL: str | None = None
 _ENGINE = None
+_REPLICA_ENGINE: Engine | None = None
 _SESSION_FACTORY: sessionmaker[Session] | None = None
+_ASYNC_ENGINE: AsyncEngine | None = None
+_ASYNC_REPLICA_ENGINE: AsyncEngine | None = None
+_ASYNC_SESSION_FACTORY: async_sessionmaker[AsyncSession] | None = None
 
+# Async drivers for the sync URLs used by workers and migrations.
+_ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+psycopg",
+    "postgresql+psycopg2": "postgresql+psycopg",
+}
 
-def _create_engine(database_url: str):
+_PREFER_REPLICA = "prefer_replica"
+_STICK_TO_PRIMARY = "stick_to_primary"
+
+_T = TypeVar("_T")
+
+
+@dataclass(frozen=True)
+class PoolProfile:
+    pool_size: int
+    max_overflow: int
+    pool_recycle: int
+    pool_pre_ping: bool
+    pool_timeout: float = 30.0
+
+
+# API processes serve concurrent requests; Celery processes run one task at
+# a time per process, beat only enqueues.
+POOL_PROFILES = {
+    "api": PoolProfile(
+        pool_size=10, max_overflow=20, pool_recycle=1800, pool_pre_ping=True
+    ),
+    "worker": PoolProfile(
+        pool_size=2, max_overflow=2, pool_recycle=1800, pool_pre_ping=True
+    ),
+    "beat": PoolProfile(
+        pool_size=1, max_overflow=0, pool_recycle=3600, pool_pre_ping=True
+    ),
+    "tool": PoolProfile(
+        pool_size=1, max_overflow=1, pool_recycle=-1, pool_pre_ping=False
+    ),
+}
+
+
+def pool_profile(role: str | None = None) -> PoolProfile:
+    """Pool settings for ``DB_POOL_ROLE`` with ``DB_POOL_*`` overrides."""
+    role = role or os.getenv("DB_POOL_ROLE", "api")
+    if role not in POOL_PROFILES:
+        raise ValueError(f"Unknown DB_POOL_ROLE '{role}'")
+    profile = POOL_PROFILES[role]
+    return replace(
+        profile,
+        pool_size=int(os.getenv("DB_POOL_SIZE", profile.pool_size)),
+        max_overflow=int(os.getenv("DB_MAX_OVERFLOW", profile.max_overflow)),
+        pool_recycle=int(os.getenv("DB_POOL_RECYCLE_SECONDS", profile.pool_recycle)),
+        pool_pre_ping=os.getenv(
+            "DB_POOL_PRE_PING", "1" if profile.pool_pre_ping else "0"
+        )
+        == "1",
+        pool_timeout=float(os.getenv("DB_POOL_TIMEOUT_SECONDS", profile.pool_timeout)),
+    )
+
+
+@dataclass
+class PoolStats:
+    checkouts: int = 0
+    timeouts: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, wait_seconds: float, *, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_seconds_total += wait_seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, wait_seconds)
+
+
+_POOL_STATS: dict[str, PoolStats] = {}
+
+
+class _PoolStatsMixin:
+    """Times how long checkouts wait for a free connection."""
+
+    stats: PoolStats | None = None
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            if self.stats is not None:
+                self.stats.record(time.perf_counter() - started, timed_out=True)
+            raise
+        if self.stats is not None:
+            self.stats.record(time.perf_counter() - started)
+        return connection
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+
+class _StatsQueuePool(_PoolStatsMixin, QueuePool):
+    pass
+
+
+class _StatsAsyncQueuePool(_PoolStatsMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+class RoutingSession(Session):
+    """Session that serves calls marked with ``replica_read`` from a replica.
+
+    Once the session has flushed or committed it sticks to the primary, so a
+    request always reads its own writes.
+    """
+
+    def __init__(self, *args: Any, replica_bind: Engine | None = None, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.replica_bind = replica_bind
+
+    def get_bind(self, mapper=None, *, clause=None, **kw):
+        if (
+            self.replica_bind is not None
+            and self.info.get(_PREFER_REPLICA)
+            and not self.info.get(_STICK_TO_PRIMARY)
+        ):
+            return self.replica_bind
+        return super().get_bind(mapper, clause=clause, **kw)
+
+
+@event.listens_for(RoutingSession, "after_flush")
+@event.listens_for(RoutingSession, "after_commit")
+def _stick_to_primary(session: Session, *_: Any) -> None:
+    session.info[_STICK_TO_PRIMARY] = True
+
+
+@contextmanager
+def read_from_replica(session: Session) -> Iterator[Session]:
+    """Route the session's reads to the replica, if one is configured."""
+    previous = session.info.get(_PREFER_REPLICA, False)
+    session.info[_PREFER_REPLICA] = True
+    try:
+        yield session
+    finally:
+        session.info[_PREFER_REPLICA] = previous
+
+
+def replica_read(method: Callable[..., _T]) -> Callable[..., _T]:
+    """Mark a read-only service method taking ``session`` as first argument."""
+
+    @functools.wraps(method)
+    def wrapper(self: Any, session: Session, *args: Any, **kwargs: Any) -> _T:
+        with read_from_replica(session):
+            return method(self, session, *args, **kwargs)
+
+    return wrapper
+
+
+def _is_memory_sqlite(database_url: str) -> bool:
+    url = make_url(database_url)
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def _pool_kwargs(profile: PoolProfile) -> dict[str, Any]:
+    return {
+        "pool_size": profile.pool_size,
+        "max_overflow": profile.max_overflow,
+        "pool_recycle": profile.pool_recycle,
+        "pool_pre_ping": profile.pool_pre_ping,
+        "pool_timeout": profile.pool_timeout,
+    }
+
+
+def _create_engine(database_url: str, *, name: str = "primary"):
     connect_args = (
         {"check_same_thread": False} if database_url.startswith("sqlite") else {}
     )
-    return create_engine(
-        database_url, future=True, pool_pre_ping=True, connect_args=connect_args
+    if _is_memory_sqlite(database_url):
+        return create_engine(
+            database_url, future=True, pool_pre_ping=True, connect_args=connect_args
+        )
+    engine = create_engine(
+        database_url,
+        future=True,
+        connect_args=connect_args,
+        poolclass=_StatsQueuePool,
+        **_pool_kwargs(pool_profile()),
+    )
+    engine.pool.stats = _POOL_STATS.setdefault(name, PoolStats())
+    return engine
+
+
+def _create_async_engine(
+    database_url: str, *, name: str = "async_primary"
+) -> AsyncEngine:
+    url = make_url(database_url)
+    url = url.set(drivername=_ASYNC_DRIVERS.get(url.drivername, url.drivername))
+    if url.get_backend_name() == "sqlite":
+        # aiosqlite connections are cheap and bound to the loop that opened
+        # them; pooling them across event loops is not safe.
+        return create_async_engine(url, poolclass=NullPool)
+    engine = create_async_engine(
+        url, poolclass=_StatsAsyncQueuePool, **_pool_kwargs(pool_profile())
     )
+    engine.sync_engine.pool.stats = _POOL_STATS.setdefault(name, PoolStats())
+    return engine
 
 
-def configure_engine(database_url: str) -> None:
+def configure_engine(database_url: str, *, replica_url: str | None = None) -> None:
+    global _DATABASE_URL
+    global _REPLICA_URL
     global _ENGINE
+    global _REPLICA_ENGINE
     global _SESSION_FACTORY
+    global _ASYNC_ENGINE
+    global _ASYNC_REPLICA_ENGINE
+    global _ASYNC_SESSION_FACTORY
 
-    if _ENGINE is not None:
-        _ENGINE.dispose()
+    for engine in (_ENGINE, _REPLICA_ENGINE):
+        if engine is not None:
+            engine.dispose()
+    for async_engine in (_ASYNC_ENGINE, _ASYNC_REPLICA_ENGINE):
+        if async_engine is not None:
+            # Connections may belong to another event loop; drop the pool
+            # without closing them from here.
+            async_engine.sync_engine.dispose(close=False)
+    _POOL_STATS.clear()
 
+    _DATABASE_URL = database_url
+    _REPLICA_URL = replica_url
     _ENGINE = _create_engine(database_url)
+    _REPLICA_ENGINE = (
+        _create_engine(replica_url, name="replica") if replica_url else None
+    )
     _SESSION_FACTORY = sessionmaker(
-        bind=_ENGINE, autoflush=False, autocommit=False, expire_on_commit=False
+        bind=_ENGINE,
+        class_=RoutingSession,
+        replica_bind=_REPLICA_ENGINE,
+        autoflush=False,
+        autocommit=False,
+        expire_on_commit=False,
     )
+    _ASYNC_ENGINE = None
+    _ASYNC_REPLICA_ENGINE = None
+    _ASYNC_SESSION_FACTORY = None
 
 
 def get_engine():
     global _ENGINE
     if _ENGINE is None:
-        configure_engine(os.getenv("DATABASE_URL", "sqlite:///./life_event.db"))
+        configure_engine(
+            os.getenv("DATABASE_URL", "sqlite:///./life_event.db"),
+            replica_url=os.getenv("DATABASE_REPLICA_URL") or None,
+        )
     return _ENGINE
 
 
@@ -48,9 +299,87 @@ def get_session_factory() -> sessionmaker[Session]:
     return _SESSION_FACTORY
 
 
+def get_async_engine() -> AsyncEngine:
+    """Async engine on the configured database, created on first use.
+
+    Celery workers and tools only use the sync engine and never need the
+    async driver installed.
+    """
+    global _ASYNC_ENGINE
+    global _ASYNC_REPLICA_ENGINE
+    global _ASYNC_SESSION_FACTORY
+    if _ASYNC_ENGINE is None:
+        get_engine()
+        assert _DATABASE_URL is not None
+        _ASYNC_ENGINE = _create_async_engine(_DATABASE_URL)
+        _ASYNC_REPLICA_ENGINE = (
+            _create_async_engine(_REPLICA_URL, name="async_replica")
+            if _REPLICA_URL
+            else None
+        )
+        _ASYNC_SESSION_FACTORY = async_sessionmaker(
+            bind=_ASYNC_ENGINE,
+            sync_session_class=RoutingSession,
+            replica_bind=(
+                _ASYNC_REPLICA_ENGINE.sync_engine
+                if _ASYNC_REPLICA_ENGINE is not None
+                else None
+            ),
+            autoflush=False,
+            expire_on_commit=False,
+        )
+    return _ASYNC_ENGINE
+
+
+def get_async_session_factory() -> async_sessionmaker[AsyncSession]:
+    if _ASYNC_SESSION_FACTORY is None:
+        get_async_engine()
+    assert _ASYNC_SESSION_FACTORY is not None
+    return _ASYNC_SESSION_FACTORY
+
+
+def pool_status() -> dict[str, dict[str, Any]]:
+    """Usage and checkout wait statistics of every pooled engine."""
+    engines: dict[str, Any] = {
+        "primary": _ENGINE,
+        "replica": _REPLICA_ENGINE,
+        "async_primary": _ASYNC_ENGINE.sync_engine if _ASYNC_ENGINE else None,
+        "async_replica": (
+            _ASYNC_REPLICA_ENGINE.sync_engine if _ASYNC_REPLICA_ENGINE else None
+        ),
+    }
+    status: dict[str, dict[str, Any]] = {}
+    for name, engine in engines.items():
+        if engine is None or not isinstance(engine.pool, QueuePool):
+            continue
+        pool = engine.pool
+        stats = getattr(pool, "stats", None) or PoolStats()
+        status[name] = {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": pool.overflow(),
+            "checkouts": stats.checkouts,
+            "timeouts": stats.timeouts,
+            "wait_seconds_avg": (
+                stats.wait_seconds_total / stats.checkouts if stats.checkouts else 0.0
+            ),
+            "wait_seconds_max": stats.wait_seconds_max,
+        }
+    return status
+
+
 def get_db_session() -> Generator[Session, None, None]:
     session = get_session_factory()()
     try:
         yield session
     finally:
         session.close()
+
+
+async def get_async_db_session() -> AsyncGenerator[AsyncSession, None]:
+    session = get_async_session_factory()()
+    try:
+        yield session
+    finally:
+        await session.close()
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import os
+from typing import Any
 
 from fastapi import FastAPI, Request
 from fastapi.exceptions import RequestValidationError
@@ -11,7 +12,7 @@ from app.api.notifications import router as notifications_router
 from app.api.plans import router as plans_router
 from app.api.templates import router as templates_router
 from app.db.base import Base
-from app.db.session import get_engine, get_session_factory
+from app.db.session import get_engine, get_session_factory, pool_status
 from app.services.errors import ApiError
 from app.services.template_catalog_service import TemplateCatalogService
 
@@ -28,6 +29,7 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["ETag", "X-Next-Cursor"],
     )
 
     @app.exception_handler(ApiError)
@@ -68,6 +70,10 @@ def create_app() -> FastAPI:
     def health() -> dict[str, str]:
         return {"status": "ok"}
 
+    @app.get("/health/db-pools", tags=["system"])
+    def health_db_pools() -> dict[str, dict[str, Any]]:
+        return pool_status()
+
     app.include_router(plans_router)
     app.include_router(templates_router)
     app.include_router(notifications_router)
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+import threading
 from dataclasses import dataclass
 
 import httpx
 
 from app.notifications.config import NotificationConfig
+from app.notifications.rate_limit import TokenBucket
 from app.notifications.templates import RenderedEmail
 
 
@@ -18,8 +20,47 @@ class ProviderSendResult:
 
 
 class BrevoEmailProvider:
-    def __init__(self, config: NotificationConfig) -> None:
+    """Brevo transactional email client.
+
+    Uses one long-lived, pooled ``httpx.Client`` (created on first send, sized
+    to ``dispatch_concurrency``) and is safe to call from several threads.
+    Requests are paced by a token bucket of
+    ``provider_rate_limit_per_second``. Call ``close`` when done.
+    """
+
+    def __init__(
+        self,
+        config: NotificationConfig,
+        *,
+        client: httpx.Client | None = None,
+        rate_limiter: TokenBucket | None = None,
+    ) -> None:
         self.config = config
+        self.rate_limiter = rate_limiter or TokenBucket(
+            config.provider_rate_limit_per_second
+        )
+        self._client = client
+        self._owns_client = client is None
+        self._client_lock = threading.Lock()
+
+    def close(self) -> None:
+        with self._client_lock:
+            if self._client is not None and self._owns_client:
+                self._client.close()
+                self._client = None
+
+    def _get_client(self) -> httpx.Client:
+        with self._client_lock:
+            if self._client is None:
+                pool_size = max(1, self.config.dispatch_concurrency)
+                self._client = httpx.Client(
+                    timeout=10.0,
+                    limits=httpx.Limits(
+                        max_connections=pool_size,
+                        max_keepalive_connections=pool_size,
+                    ),
+                )
+            return self._client
 
     def send(
         self,
@@ -76,13 +117,13 @@ class BrevoEmailProvider:
             "content-type": "application/json",
         }
 
+        self.rate_limiter.acquire()
         try:
-            with httpx.Client(timeout=10.0) as client:
-                response = client.post(
-                    f"{self.config.brevo_base_url}/smtp/email",
-                    headers=headers,
-                    json=request_payload,
-                )
+            response = self._get_client().post(
+                f"{self.config.brevo_base_url}/smtp/email",
+                headers=headers,
+                json=request_payload,
+            )
         except httpx.TimeoutException as exc:
             return ProviderSendResult(
                 status="pending",
@@ -13,6 +13,8 @@ class NotificationConfig:
     brevo_base_url: str
     email_dry_run: bool
     allowed_recipient_domains: set[str]
+    dispatch_concurrency: int = 1
+    provider_rate_limit_per_second: float = 0.0
 
 
 def load_notification_config() -> NotificationConfig:
@@ -31,4 +33,8 @@ def load_notification_config() -> NotificationConfig:
         brevo_base_url=os.getenv("BREVO_BASE_URL", "https://api.brevo.com/v3"),
         email_dry_run=os.getenv("EMAIL_DRY_RUN", "true").lower() == "true",
         allowed_recipient_domains=allowed_domains,
+        dispatch_concurrency=max(1, int(os.getenv("EMAIL_DISPATCH_CONCURRENCY", "8"))),
+        provider_rate_limit_per_second=float(
+            os.getenv("EMAIL_PROVIDER_RATE_LIMIT_PER_SECOND", "0")
+        ),
     )
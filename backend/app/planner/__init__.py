@@ -1,4 +1,9 @@
-from app.planner.engine import generate_plan
+from app.planner.compiled import CompiledWorkflow, compile_workflow
+from app.planner.engine import (
+    generate_plan,
+    generate_plan_incremental,
+    generate_plans_batch,
+)
 from app.planner.errors import (
     PlannerCycleError,
     PlannerDependencyError,
@@ -9,6 +14,10 @@ from app.planner.errors import (
 
 __all__ = [
     "generate_plan",
+    "generate_plan_incremental",
+    "generate_plans_batch",
+    "compile_workflow",
+    "CompiledWorkflow",
     "PlannerError",
     "PlannerInputError",
     "PlannerDependencyError",
@@ -0,0 +1,325 @@
+from __future__ import annotations
+
+import heapq
+from collections.abc import Iterable
+from typing import Any
+
+from app.planner.errors import (
+    PlannerCycleError,
+    PlannerDependencyError,
+    PlannerInputError,
+)
+from app.planner.rules import RulePredicate, compile_rule, rule_facts
+
+# Ordered task indices plus depends_on task ids per active task index.
+Layout = tuple[tuple[int, ...], dict[int, tuple[str, ...]]]
+
+PRECOMPUTE_MAX_TASKS = 10
+MAX_CACHED_LAYOUTS = 4096
+
+
+class CompiledTask:
+    __slots__ = (
+        "deadline_facts",
+        "grace_days",
+        "index",
+        "is_active",
+        "offset_days",
+        "predecessors",
+        "rule_facts",
+        "successors",
+        "task_id",
+        "title",
+    )
+
+    def __init__(
+        self,
+        *,
+        index: int,
+        task_id: str,
+        title: str,
+        offset_days: int,
+        grace_days: int,
+        is_active: RulePredicate,
+        rule_facts: frozenset[str],
+        deadline_facts: frozenset[str],
+        predecessors: tuple[int, ...],
+        successors: tuple[int, ...],
+    ) -> None:
+        self.index = index
+        self.task_id = task_id
+        self.title = title
+        self.offset_days = offset_days
+        self.grace_days = grace_days
+        self.is_active = is_active
+        self.rule_facts = rule_facts
+        self.deadline_facts = deadline_facts
+        self.predecessors = predecessors
+        self.successors = successors
+
+
+class CompiledWorkflow:
+    """Validated, index-based form of a workflow template.
+
+    Tasks are ordered by id so that task indices sort the same way as task
+    ids; edges are stored as ``(source_index, target_index)`` pairs in
+    template order. ``rule_facts`` lists every fact key read by any
+    eligibility rule, sorted.
+
+    ``rule_dependents`` maps each fact key to the indices of the tasks whose
+    eligibility reads it; ``planning_facts`` is every fact that can change a
+    generated plan (rule facts, the event date and deadline references).
+
+    Active task sets are integer bitmasks (bit ``i`` set when ``tasks[i]`` is
+    active). The topological order and ``depends_on`` map of each mask are
+    memoized by ``layout``; ``precompute_layouts`` fills the memo eagerly for
+    small templates.
+    """
+
+    __slots__ = (
+        "_layouts",
+        "edges",
+        "event_date_key",
+        "index_by_id",
+        "planning_facts",
+        "rule_dependents",
+        "rule_facts",
+        "tasks",
+        "template_id",
+    )
+
+    def __init__(
+        self,
+        *,
+        template_id: str,
+        event_date_key: str,
+        tasks: tuple[CompiledTask, ...],
+        edges: tuple[tuple[int, int], ...],
+    ) -> None:
+        self.template_id = template_id
+        self.event_date_key = event_date_key
+        self.tasks = tasks
+        self.index_by_id = {task.task_id: task.index for task in tasks}
+        self.edges = edges
+        self.rule_facts = tuple(
+            sorted(frozenset().union(*(task.rule_facts for task in tasks)))
+        )
+        dependents: dict[str, list[int]] = {}
+        for task in tasks:
+            for fact in task.rule_facts:
+                dependents.setdefault(fact, []).append(task.index)
+        self.rule_dependents = {
+            fact: tuple(indices) for fact, indices in dependents.items()
+        }
+        self.planning_facts = frozenset(self.rule_facts).union(
+            {event_date_key}, *(task.deadline_facts for task in tasks)
+        )
+        self._layouts: dict[int, Layout] = {}
+
+    def active_mask(self, facts: dict[str, Any]) -> int:
+        mask = 0
+        for task in self.tasks:
+            if task.is_active(facts):
+                mask |= 1 << task.index
+        return mask
+
+    def mask_of(self, task_ids: Iterable[str]) -> int | None:
+        """Bitmask of the given task ids, ``None`` if any id is unknown."""
+        mask = 0
+        for task_id in task_ids:
+            index = self.index_by_id.get(task_id)
+            if index is None:
+                return None
+            mask |= 1 << index
+        return mask
+
+    def reevaluate(
+        self, mask: int, facts: dict[str, Any], changed: Iterable[str]
+    ) -> int:
+        """Update ``mask`` by re-evaluating only rules that read ``changed``."""
+        indices = {
+            index for fact in changed for index in self.rule_dependents.get(fact, ())
+        }
+        for index in indices:
+            if self.tasks[index].is_active(facts):
+                mask |= 1 << index
+            else:
+                mask &= ~(1 << index)
+        return mask
+
+    def layout(self, mask: int) -> Layout:
+        cached = self._layouts.get(mask)
+        if cached is not None:
+            return cached
+        layout = self._build_layout(mask)
+        if len(self._layouts) < MAX_CACHED_LAYOUTS:
+            self._layouts[mask] = layout
+        return layout
+
+    def precompute_layouts(self, max_tasks: int = PRECOMPUTE_MAX_TASKS) -> int:
+        if len(self.tasks) > max_tasks:
+            return 0
+        for mask in range(1 << len(self.tasks)):
+            try:
+                self.layout(mask)
+            except PlannerCycleError:
+                continue
+        return len(self._layouts)
+
+    def _build_layout(self, mask: int) -> Layout:
+        tasks = self.tasks
+        depends_on: dict[int, tuple[str, ...]] = {}
+        indegree: dict[int, int] = {}
+        for task in tasks:
+            if not mask >> task.index & 1:
+                continue
+            active_predecessors = [
+                source for source in task.predecessors if mask >> source & 1
+            ]
+            indegree[task.index] = len(active_predecessors)
+            depends_on[task.index] = tuple(
+                tasks[source].task_id for source in active_predecessors
+            )
+
+        ready = [index for index, degree in indegree.items() if degree == 0]
+        heapq.heapify(ready)
+        ordered: list[int] = []
+        while ready:
+            current = heapq.heappop(ready)
+            ordered.append(current)
+            for nxt in tasks[current].successors:
+                if not mask >> nxt & 1:
+                    continue
+                indegree[nxt] -= 1
+                if indegree[nxt] == 0:
+                    heapq.heappush(ready, nxt)
+
+        if len(ordered) != len(indegree):
+            raise PlannerCycleError("Cycle detected in active task graph")
+        return tuple(ordered), depends_on
+
+
+def compile_workflow(workflow: dict[str, Any]) -> CompiledWorkflow:
+    template_id = _read_str(workflow, "template_id")
+    event_date_key = _read_str(workflow, "event_date_key")
+    tasks_by_id = _read_tasks(workflow)
+
+    task_ids = sorted(tasks_by_id.keys())
+    index_by_id = {task_id: idx for idx, task_id in enumerate(task_ids)}
+    edges = _read_edges(workflow, index_by_id)
+
+    predecessors: list[list[int]] = [[] for _ in task_ids]
+    successors: list[list[int]] = [[] for _ in task_ids]
+    for source, target in edges:
+        predecessors[target].append(source)
+        successors[source].append(target)
+
+    tasks = tuple(
+        _compile_task(
+            index=idx,
+            task_id=task_id,
+            task=tasks_by_id[task_id],
+            predecessors=tuple(sorted(predecessors[idx])),
+            successors=tuple(sorted(successors[idx])),
+        )
+        for idx, task_id in enumerate(task_ids)
+    )
+    return CompiledWorkflow(
+        template_id=template_id,
+        event_date_key=event_date_key,
+        tasks=tasks,
+        edges=tuple(edges),
+    )
+
+
+def _compile_task(
+    *,
+    index: int,
+    task_id: str,
+    task: dict[str, Any],
+    predecessors: tuple[int, ...],
+    successors: tuple[int, ...],
+) -> CompiledTask:
+    title = _read_str(task, "title", context=f"tasks.{task_id}")
+    deadline_def = _as_dict(task.get("deadline"), f"tasks.{task_id}.deadline")
+    if deadline_def.get("type") != "relative_days":
+        raise PlannerInputError(
+            f"tasks.{task_id}.deadline.type must be 'relative_days'"
+        )
+
+    offset_days = deadline_def.get("offset_days")
+    if not isinstance(offset_days, int):
+        raise PlannerInputError(f"tasks.{task_id}.deadline.offset_days must be int")
+
+    grace_days = deadline_def.get("grace_days", 0)
+    if not isinstance(grace_days, int):
+        raise PlannerInputError(f"tasks.{task_id}.deadline.grace_days must be int")
+
+    reference = deadline_def.get("reference")
+    eligibility = task.get("eligibility", {"all": []})
+    return CompiledTask(
+        index=index,
+        task_id=task_id,
+        title=title,
+        offset_days=offset_days,
+        grace_days=grace_days,
+        is_active=compile_rule(eligibility),
+        rule_facts=rule_facts(eligibility),
+        deadline_facts=(
+            frozenset({reference}) if isinstance(reference, str) else frozenset()
+        ),
+        predecessors=predecessors,
+        successors=successors,
+    )
+
+
+def _read_tasks(workflow: dict[str, Any]) -> dict[str, dict[str, Any]]:
+    raw = workflow.get("tasks")
+    if not isinstance(raw, dict):
+        raise PlannerInputError("workflow.tasks must be an object")
+
+    parsed: dict[str, dict[str, Any]] = {}
+    for task_id, task in raw.items():
+        if not isinstance(task_id, str):
+            raise PlannerInputError("workflow.tasks keys must be strings")
+        parsed[task_id] = _as_dict(task, f"tasks.{task_id}")
+    return parsed
+
+
+def _read_edges(
+    workflow: dict[str, Any],
+    index_by_id: dict[str, int],
+) -> list[tuple[int, int]]:
+    graph = _as_dict(workflow.get("graph"), "workflow.graph")
+    raw_edges = graph.get("edges", [])
+    if not isinstance(raw_edges, list):
+        raise PlannerInputError("workflow.graph.edges must be a list")
+
+    parsed: list[tuple[int, int]] = []
+    for idx, raw_edge in enumerate(raw_edges):
+        edge = _as_dict(raw_edge, f"workflow.graph.edges[{idx}]")
+        source = edge.get("from")
+        target = edge.get("to")
+        if not isinstance(source, str) or not isinstance(target, str):
+            raise PlannerInputError(
+                f"workflow.graph.edges[{idx}] must contain string 'from' and 'to'"
+            )
+        if source not in index_by_id or target not in index_by_id:
+            raise PlannerDependencyError(
+                "dependency references unknown workflow task id"
+            )
+        parsed.append((index_by_id[source], index_by_id[target]))
+    return parsed
+
+
+def _read_str(payload: dict[str, Any], key: str, context: str = "workflow") -> str:
+    value = payload.get(key)
+    if not isinstance(value, str):
+        raise PlannerInputError(f"{context}.{key} must be a string")
+    return value
+
+
+def _as_dict(value: Any, field: str) -> dict[str, Any]:
+    if not isinstance(value, dict):
+        raise PlannerInputError(f"{field} must be an object")
+    return value
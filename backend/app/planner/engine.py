@@ -1,135 +1,177 @@
 from __future__ import annotations
 
+from collections.abc import Iterable, Sequence
+from datetime import date
 from typing import Any
 
+from app.planner.compiled import CompiledWorkflow, compile_workflow
 from app.planner.deadlines import compute_deadline, parse_iso_date
-from app.planner.errors import PlannerDependencyError, PlannerInputError
-from app.planner.rules import is_task_active
+from app.planner.errors import PlannerInputError
 from app.planner.schema import Plan, TaskPlanItem
-from app.planner.toposort import toposort_task_ids
-
-
-def generate_plan(workflow: dict[str, Any], user_input: dict[str, Any]) -> Plan:
-    template_id = _read_str(workflow, "template_id")
-    event_date_key = _read_str(workflow, "event_date_key")
-    tasks_by_id = _read_tasks(workflow)
-    edges = _read_edges(workflow, set(tasks_by_id.keys()))
 
+# (task index, deadline, depends_on) for each active task in plan order.
+_PlanRows = tuple[tuple[int, str, tuple[str, ...]], ...]
+
+_MISSING = object()
+_LIST = object()
+_DICT = object()
+
+
+def generate_plan(
+    workflow: dict[str, Any] | CompiledWorkflow,
+    user_input: dict[str, Any],
+) -> Plan:
+    program = _as_program(workflow)
+    event_date = _read_event_date(program, user_input)
+    ordered, depends_on = program.layout(program.active_mask(user_input))
+    rows = _plan_rows(program, event_date, ordered, depends_on)
+    return _materialize(program, event_date, rows)
+
+
+def generate_plan_incremental(
+    workflow: dict[str, Any] | CompiledWorkflow,
+    user_input: dict[str, Any],
+    *,
+    previous_task_ids: Iterable[str],
+    changed_facts: Iterable[str],
+) -> Plan:
+    """Plan from a previous result, re-evaluating only rules of changed facts.
+
+    ``previous_task_ids`` must be the active tasks of a plan generated by the
+    same workflow from facts that differ from ``user_input`` only in
+    ``changed_facts``. Falls back to ``generate_plan`` if an id is unknown.
+    """
+    program = _as_program(workflow)
+    previous_mask = program.mask_of(previous_task_ids)
+    if previous_mask is None:
+        return generate_plan(program, user_input)
+
+    event_date = _read_event_date(program, user_input)
+    mask = program.reevaluate(previous_mask, user_input, changed_facts)
+    rows = _plan_rows(program, event_date, *program.layout(mask))
+    return _materialize(program, event_date, rows)
+
+
+def generate_plans_batch(
+    workflow: dict[str, Any] | CompiledWorkflow,
+    facts_list: Sequence[dict[str, Any]],
+) -> list[Plan]:
+    """Generate one plan per fact set, sharing work between equivalent inputs.
+
+    Fact sets are grouped by the values of the facts that eligibility rules
+    actually read, and each rule is evaluated once per group. Ordering and
+    dependency resolution run once per distinct active-task set, deadlines
+    once per (active-task set, event date). The result is identical to
+    calling ``generate_plan`` for each fact set in order.
+    """
+    program = _as_program(workflow)
+
+    parsed_dates: dict[str, date] = {}
+    event_dates: list[date] = []
+    for user_input in facts_list:
+        raw_date = user_input.get(program.event_date_key)
+        if not isinstance(raw_date, str) or raw_date not in parsed_dates:
+            parsed = _read_event_date(program, user_input)
+            if isinstance(raw_date, str):
+                parsed_dates[raw_date] = parsed
+            event_dates.append(parsed)
+        else:
+            event_dates.append(parsed_dates[raw_date])
+
+    group_by_signature: dict[tuple[Any, ...], int] = {}
+    representatives: list[dict[str, Any]] = []
+    group_of_input: list[int] = []
+    for user_input in facts_list:
+        signature = tuple(
+            _freeze(user_input.get(key, _MISSING)) for key in program.rule_facts
+        )
+        group = group_by_signature.get(signature)
+        if group is None:
+            group = len(representatives)
+            group_by_signature[signature] = group
+            representatives.append(user_input)
+        group_of_input.append(group)
+
+    columns = [
+        [task.is_active(user_input) for user_input in representatives]
+        for task in program.tasks
+    ]
+    mask_by_group = [0] * len(representatives)
+    for task, column in zip(program.tasks, columns):
+        bit = 1 << task.index
+        for group, is_active in enumerate(column):
+            if is_active:
+                mask_by_group[group] |= bit
+
+    rows_cache: dict[tuple[int, date], _PlanRows] = {}
+    plans: list[Plan] = []
+    for group, event_date in zip(group_of_input, event_dates):
+        mask = mask_by_group[group]
+        rows = rows_cache.get((mask, event_date))
+        if rows is None:
+            rows = _plan_rows(program, event_date, *program.layout(mask))
+            rows_cache[(mask, event_date)] = rows
+        plans.append(_materialize(program, event_date, rows))
+    return plans
+
+
+def _as_program(workflow: dict[str, Any] | CompiledWorkflow) -> CompiledWorkflow:
+    if isinstance(workflow, CompiledWorkflow):
+        return workflow
+    return compile_workflow(workflow)
+
+
+def _read_event_date(program: CompiledWorkflow, user_input: dict[str, Any]) -> date:
+    event_date_key = program.event_date_key
     if event_date_key not in user_input:
         raise PlannerInputError(f"missing event date fact '{event_date_key}'")
-    event_date = parse_iso_date(user_input[event_date_key])
-
-    active_task_ids = {
-        task_id
-        for task_id in sorted(tasks_by_id.keys())
-        if is_task_active(
-            _as_dict(tasks_by_id[task_id], f"tasks.{task_id}"), user_input
-        )
-    }
-
-    depends_on_map: dict[str, list[str]] = {task_id: [] for task_id in active_task_ids}
-    active_edges: list[tuple[str, str]] = []
-
-    for source, target in edges:
-        if target not in active_task_ids:
-            continue
-        if source in active_task_ids:
-            depends_on_map[target].append(source)
-            active_edges.append((source, target))
-
-    for task_id in active_task_ids:
-        depends_on_map[task_id] = sorted(depends_on_map[task_id])
-
-    ordered_ids = toposort_task_ids(active_task_ids, active_edges)
-
-    items_by_id: dict[str, TaskPlanItem] = {}
-    for task_id in active_task_ids:
-        task = _as_dict(tasks_by_id[task_id], f"tasks.{task_id}")
-        title = _read_str(task, "title", context=f"tasks.{task_id}")
-        deadline_def = _as_dict(task.get("deadline"), f"tasks.{task_id}.deadline")
-        deadline_type = deadline_def.get("type")
-        if deadline_type != "relative_days":
-            raise PlannerInputError(
-                f"tasks.{task_id}.deadline.type must be 'relative_days'"
-            )
-
-        offset_days = deadline_def.get("offset_days")
-        if not isinstance(offset_days, int):
-            raise PlannerInputError(f"tasks.{task_id}.deadline.offset_days must be int")
-
-        grace_days = deadline_def.get("grace_days", 0)
-        if not isinstance(grace_days, int):
-            raise PlannerInputError(f"tasks.{task_id}.deadline.grace_days must be int")
-
+    return parse_iso_date(user_input[event_date_key])
+
+
+def _plan_rows(
+    program: CompiledWorkflow,
+    event_date: date,
+    ordered: tuple[int, ...],
+    depends_on: dict[int, tuple[str, ...]],
+) -> _PlanRows:
+    rows: list[tuple[int, str, tuple[str, ...]]] = []
+    for index in ordered:
+        task = program.tasks[index]
         due_date = compute_deadline(
             event_date=event_date,
-            relative_days=offset_days,
-            grace_days=grace_days,
+            relative_days=task.offset_days,
+            grace_days=task.grace_days,
         )
-
-        items_by_id[task_id] = {
-            "id": task_id,
-            "title": title,
-            "relative_days": offset_days,
-            "deadline": due_date.isoformat(),
-            "depends_on": depends_on_map[task_id],
+        rows.append((index, due_date.isoformat(), depends_on[index]))
+    return tuple(rows)
+
+
+def _materialize(program: CompiledWorkflow, event_date: date, rows: _PlanRows) -> Plan:
+    tasks = program.tasks
+    plan_tasks: list[TaskPlanItem] = [
+        {
+            "id": tasks[index].task_id,
+            "title": tasks[index].title,
+            "relative_days": tasks[index].offset_days,
+            "deadline": deadline,
+            "depends_on": list(depends_on),
             "meta": {},
         }
-
+        for index, deadline, depends_on in rows
+    ]
     return {
-        "workflow_id": template_id,
+        "workflow_id": program.template_id,
         "event_date": event_date.isoformat(),
-        "tasks": [items_by_id[task_id] for task_id in ordered_ids],
+        "tasks": plan_tasks,
     }
 
 
-def _read_tasks(workflow: dict[str, Any]) -> dict[str, dict[str, Any]]:
-    raw = workflow.get("tasks")
-    if not isinstance(raw, dict):
-        raise PlannerInputError("workflow.tasks must be an object")
-
-    parsed: dict[str, dict[str, Any]] = {}
-    for task_id, task in raw.items():
-        if not isinstance(task_id, str):
-            raise PlannerInputError("workflow.tasks keys must be strings")
-        parsed[task_id] = _as_dict(task, f"tasks.{task_id}")
-    return parsed
-
-
-def _read_edges(
-    workflow: dict[str, Any],
-    known_task_ids: set[str],
-) -> list[tuple[str, str]]:
-    graph = _as_dict(workflow.get("graph"), "workflow.graph")
-    raw_edges = graph.get("edges", [])
-    if not isinstance(raw_edges, list):
-        raise PlannerInputError("workflow.graph.edges must be a list")
-
-    parsed: list[tuple[str, str]] = []
-    for idx, raw_edge in enumerate(raw_edges):
-        edge = _as_dict(raw_edge, f"workflow.graph.edges[{idx}]")
-        source = edge.get("from")
-        target = edge.get("to")
-        if not isinstance(source, str) or not isinstance(target, str):
-            raise PlannerInputError(
-                f"workflow.graph.edges[{idx}] must contain string 'from' and 'to'"
-            )
-        if source not in known_task_ids or target not in known_task_ids:
-            raise PlannerDependencyError(
-                "dependency references unknown workflow task id"
-            )
-        parsed.append((source, target))
-    return parsed
-
-
-def _read_str(payload: dict[str, Any], key: str, context: str = "workflow") -> str:
-    value = payload.get(key)
-    if not isinstance(value, str):
-        raise PlannerInputError(f"{context}.{key} must be a string")
-    return value
-
-
-def _as_dict(value: Any, field: str) -> dict[str, Any]:
-    if not isinstance(value, dict):
-        raise PlannerInputError(f"{field} must be an object")
+def _freeze(value: Any) -> Any:
+    if isinstance(value, list):
+        return (_LIST, *(_freeze(item) for item in value))
+    if isinstance(value, dict):
+        return (
+            _DICT,
+            *((key, _freeze(item)) for key, item in sorted(value.items())),
+        )
     return value
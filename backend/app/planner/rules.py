@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import operator
 from typing import Any, Callable
 
 from app.planner.errors import PlannerRuleError
 
+RulePredicate = Callable[[dict[str, Any]], bool]
+
 
 def is_task_active(task: dict[str, Any], user_input: dict[str, Any]) -> bool:
     eligibility = task.get("eligibility", {"all": []})
@@ -70,3 +73,131 @@ def _compare_numeric(left: Any, right: Any, fn: Callable[[float, float], bool])
     if isinstance(left, (int, float)) and isinstance(right, (int, float)):
         return bool(fn(float(left), float(right)))
     return False
+
+
+def rule_facts(rule: Any) -> frozenset[str]:
+    """Return the fact keys an eligibility tree reads."""
+    if not isinstance(rule, dict):
+        return frozenset()
+    if "all" in rule or "any" in rule:
+        clauses = rule["all"] if "all" in rule else rule["any"]
+        if not isinstance(clauses, list):
+            return frozenset()
+        return frozenset().union(*(rule_facts(clause) for clause in clauses))
+    if "not" in rule:
+        return rule_facts(rule["not"])
+    fact_key = rule.get("fact")
+    return frozenset((fact_key,)) if isinstance(fact_key, str) else frozenset()
+
+
+def compile_rule(rule: Any) -> RulePredicate:
+    """Compile an eligibility tree into a closure equivalent to ``eval_rule``.
+
+    Rule shape and operators are resolved once; invalid nodes raise
+    ``PlannerRuleError`` at compile time rather than on first evaluation.
+    """
+    if rule is None:
+        raise PlannerRuleError("eligibility cannot be null")
+    if not isinstance(rule, dict):
+        raise PlannerRuleError("rule must be an object")
+
+    if "all" in rule:
+        clauses = rule["all"]
+        if not isinstance(clauses, list):
+            raise PlannerRuleError("rule.all must be a list")
+        compiled = tuple(compile_rule(clause) for clause in clauses)
+        if not compiled:
+            return _always_true
+        if len(compiled) == 1:
+            return compiled[0]
+        return lambda facts: all(clause(facts) for clause in compiled)
+
+    if "any" in rule:
+        clauses = rule["any"]
+        if not isinstance(clauses, list):
+            raise PlannerRuleError("rule.any must be a list")
+        compiled = tuple(compile_rule(clause) for clause in clauses)
+        if not compiled:
+            return _always_false
+        if len(compiled) == 1:
+            return compiled[0]
+        return lambda facts: any(clause(facts) for clause in compiled)
+
+    if "not" in rule:
+        inner = compile_rule(rule["not"])
+        return lambda facts: not inner(facts)
+
+    return _compile_predicate(rule)
+
+
+def _compile_predicate(pred: dict[str, Any]) -> RulePredicate:
+    fact_key = pred.get("fact")
+    op = pred.get("op")
+    if not isinstance(fact_key, str) or not isinstance(op, str):
+        raise PlannerRuleError(f"invalid predicate shape: {pred!r}")
+
+    right = pred.get("value")
+
+    if op == "exists":
+        return lambda facts: fact_key in facts
+    if op == "=":
+        return lambda facts: fact_key in facts and facts[fact_key] == right
+    if op == "!=":
+        return lambda facts: fact_key in facts and facts[fact_key] != right
+    if op == "in":
+        if not isinstance(right, list):
+            return _always_false
+        return _compile_membership(fact_key, right)
+    if op in _NUMERIC_OPS:
+        if not isinstance(right, (int, float)):
+            return _always_false
+        return _compile_numeric(fact_key, float(right), _NUMERIC_OPS[op])
+
+    raise PlannerRuleError(f"unsupported predicate op: {op}")
+
+
+def _compile_membership(fact_key: str, values: list[Any]) -> RulePredicate:
+    options = tuple(values)
+    try:
+        lookup = frozenset(options)
+    except TypeError:
+        return lambda facts: fact_key in facts and facts[fact_key] in options
+
+    def predicate(facts: dict[str, Any]) -> bool:
+        if fact_key not in facts:
+            return False
+        left = facts[fact_key]
+        try:
+            return left in lookup
+        except TypeError:
+            return left in options
+
+    return predicate
+
+
+def _compile_numeric(
+    fact_key: str, right: float, fn: Callable[[float, float], bool]
+) -> RulePredicate:
+    def predicate(facts: dict[str, Any]) -> bool:
+        left = facts.get(fact_key)
+        if not isinstance(left, (int, float)):
+            return False
+        return fn(float(left), right)
+
+    return predicate
+
+
+def _always_true(_: dict[str, Any]) -> bool:
+    return True
+
+
+def _always_false(_: dict[str, Any]) -> bool:
+    return False
+
+
+_NUMERIC_OPS: dict[str, Callable[[float, float], bool]] = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+}
@@ -0,0 +1,395 @@
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.db.models import Plan, PlanSnapshot, Task
+from app.planner.engine import generate_plan, generate_plans_batch
+from app.planner.errors import (
+    PlannerDependencyError,
+    PlannerInputError,
+    PlannerRuleError,
+)
+from app.services.errors import ApiError
+from app.services.plan_service import RECOMPUTE_REASON_TEMPLATE_UPDATE, PlanService
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 500
+
+_PLANNER_ERRORS = (
+    ApiError,
+    PlannerInputError,
+    PlannerDependencyError,
+    PlannerRuleError,
+    ValueError,
+)
+
+
+@dataclass(frozen=True)
+class RecomputeChunkResult:
+    plans_processed: int
+    failed_plan_ids: list[UUID]
+    tasks_inserted: int
+    tasks_updated: int
+    last_plan_id: UUID | None
+
+
+@dataclass
+class BulkRecomputeProgress:
+    template_key: str
+    chunks: int = 0
+    plans_processed: int = 0
+    plans_failed: int = 0
+    tasks_inserted: int = 0
+    tasks_updated: int = 0
+    last_plan_id: UUID | None = None
+    done: bool = False
+    started_at: datetime = field(default_factory=lambda: datetime.now(UTC))
+
+    def add(self, chunk: RecomputeChunkResult) -> None:
+        self.chunks += 1
+        self.plans_processed += chunk.plans_processed
+        self.plans_failed += len(chunk.failed_plan_ids)
+        self.tasks_inserted += chunk.tasks_inserted
+        self.tasks_updated += chunk.tasks_updated
+        if chunk.last_plan_id is not None:
+            self.last_plan_id = chunk.last_plan_id
+
+    def as_dict(self) -> dict[str, Any]:
+        payload = asdict(self)
+        payload["last_plan_id"] = (
+            str(self.last_plan_id) if self.last_plan_id is not None else None
+        )
+        payload["started_at"] = self.started_at.isoformat()
+        return payload
+
+    @classmethod
+    def from_dict(cls, payload: dict[str, Any]) -> BulkRecomputeProgress:
+        last_plan_id = payload.get("last_plan_id")
+        started_at = payload.get("started_at")
+        return cls(
+            template_key=str(payload["template_key"]),
+            chunks=int(payload.get("chunks", 0)),
+            plans_processed=int(payload.get("plans_processed", 0)),
+            plans_failed=int(payload.get("plans_failed", 0)),
+            tasks_inserted=int(payload.get("tasks_inserted", 0)),
+            tasks_updated=int(payload.get("tasks_updated", 0)),
+            last_plan_id=UUID(last_plan_id) if last_plan_id else None,
+            done=bool(payload.get("done", False)),
+            started_at=(
+                datetime.fromisoformat(started_at)
+                if isinstance(started_at, str)
+                else datetime.now(UTC)
+            ),
+        )
+
+
+class BulkRecomputeService:
+    """Recomputes every plan of a template key in keyset-paginated chunks.
+
+    Each chunk locks its plan rows ordered by id, prefetches their tasks with
+    a single ``IN`` query and writes the task diffs as bulk INSERT/UPDATE
+    statements in one transaction. The template and its planner program are
+    loaded once per chunk from the shared template cache. Plans whose facts
+    cannot be planned are skipped and reported, not retried. If the bulk
+    write fails, the chunk is written again plan by plan and only the plans
+    that still fail are reported.
+    """
+
+    def __init__(self, plan_service: PlanService | None = None) -> None:
+        self.plan_service = plan_service or PlanService()
+
+    def run(
+        self,
+        session_factory: sessionmaker[Session],
+        *,
+        template_key: str,
+        after_plan_id: UUID | None = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_chunks: int | None = None,
+        reason: str = RECOMPUTE_REASON_TEMPLATE_UPDATE,
+        progress: BulkRecomputeProgress | None = None,
+        on_progress: Callable[[BulkRecomputeProgress], None] | None = None,
+    ) -> BulkRecomputeProgress:
+        if progress is None:
+            progress = BulkRecomputeProgress(
+                template_key=template_key, last_plan_id=after_plan_id
+            )
+        cursor = after_plan_id
+
+        chunks_run = 0
+        while max_chunks is None or chunks_run < max_chunks:
+            with session_factory() as session:
+                chunk = self.recompute_chunk(
+                    session,
+                    template_key=template_key,
+                    after_plan_id=cursor,
+                    limit=chunk_size,
+                    reason=reason,
+                )
+            chunks_run += 1
+            progress.add(chunk)
+            if chunk.failed_plan_ids:
+                logger.warning(
+                    "bulk_recompute_failed_plans",
+                    extra={
+                        "template_key": template_key,
+                        "plan_ids": [str(plan_id) for plan_id in chunk.failed_plan_ids],
+                    },
+                )
+            if chunk.last_plan_id is None or chunk.plans_processed < chunk_size:
+                progress.done = True
+            cursor = chunk.last_plan_id
+            if on_progress is not None:
+                on_progress(progress)
+            if progress.done:
+                break
+        return progress
+
+    def recompute_chunk(
+        self,
+        session: Session,
+        *,
+        template_key: str,
+        after_plan_id: UUID | None,
+        limit: int = DEFAULT_CHUNK_SIZE,
+        reason: str = RECOMPUTE_REASON_TEMPLATE_UPDATE,
+    ) -> RecomputeChunkResult:
+        query = (
+            select(Plan.id, Plan.facts, Plan.snapshot)
+            .where(Plan.template_key == template_key)
+            .order_by(Plan.id)
+            .limit(limit)
+            .with_for_update(of=Plan)
+        )
+        if after_plan_id is not None:
+            query = query.where(Plan.id > after_plan_id)
+        plan_rows = session.execute(query).all()
+        if not plan_rows:
+            return RecomputeChunkResult(
+                plans_processed=0,
+                failed_plan_ids=[],
+                tasks_inserted=0,
+                tasks_updated=0,
+                last_plan_id=None,
+            )
+
+        template = self.plan_service.load_template(session, template_key=template_key)
+        try:
+            failed_plan_ids, tasks_inserted, tasks_updated = self._write_plans(
+                session,
+                plan_rows,
+                template_key=template_key,
+                template=template,
+                reason=reason,
+            )
+        except SQLAlchemyError:
+            session.rollback()
+            logger.warning(
+                "bulk_recompute_chunk_retried_per_plan",
+                extra={"template_key": template_key, "plans": len(plan_rows)},
+            )
+            failed_plan_ids, tasks_inserted, tasks_updated = self._write_each_plan(
+                session,
+                [row.id for row in plan_rows],
+                template_key=template_key,
+                template=template,
+                reason=reason,
+            )
+
+        return RecomputeChunkResult(
+            plans_processed=len(plan_rows),
+            failed_plan_ids=failed_plan_ids,
+            tasks_inserted=tasks_inserted,
+            tasks_updated=tasks_updated,
+            last_plan_id=plan_rows[-1].id,
+        )
+
+    def _write_each_plan(
+        self,
+        session: Session,
+        plan_ids: list[UUID],
+        *,
+        template_key: str,
+        template: dict[str, Any],
+        reason: str,
+    ) -> tuple[list[UUID], int, int]:
+        """Fallback after a failed chunk write: one transaction per plan.
+
+        A plan whose write fails again (e.g. a concurrent single-plan
+        recompute won the race) is reported as failed instead of aborting
+        the whole run.
+        """
+        failed_plan_ids: list[UUID] = []
+        tasks_inserted = 0
+        tasks_updated = 0
+        for plan_id in plan_ids:
+            plan_rows = session.execute(
+                select(Plan.id, Plan.facts, Plan.snapshot)
+                .where(Plan.id == plan_id)
+                .with_for_update(of=Plan)
+            ).all()
+            try:
+                failed, inserted, updated = self._write_plans(
+                    session,
+                    plan_rows,
+                    template_key=template_key,
+                    template=template,
+                    reason=reason,
+                )
+            except SQLAlchemyError:
+                session.rollback()
+                failed_plan_ids.append(plan_id)
+                continue
+            failed_plan_ids.extend(failed)
+            tasks_inserted += inserted
+            tasks_updated += updated
+        return failed_plan_ids, tasks_inserted, tasks_updated
+
+    def _write_plans(
+        self,
+        session: Session,
+        plan_rows: list[Any],
+        *,
+        template_key: str,
+        template: dict[str, Any],
+        reason: str,
+    ) -> tuple[list[UUID], int, int]:
+        """Recompute ``plan_rows`` and commit them as bulk statements.
+
+        Returns the plans that could not be planned and the number of
+        inserted and updated tasks. Persistence errors propagate without a
+        rollback.
+        """
+        program = self.plan_service.template_repository.compiled_program(template)
+
+        failed_plan_ids: list[UUID] = []
+        prepared: list[tuple[Any, dict[str, Any], dict[str, Any], int, int]] = []
+        for row in plan_rows:
+            current_facts = row.facts if isinstance(row.facts, dict) else {}
+            snapshot = row.snapshot if isinstance(row.snapshot, dict) else {}
+            try:
+                normalized_facts, schema_from, schema_to = (
+                    self.plan_service.prepare_recompute_facts(
+                        template_key=template_key,
+                        template=template,
+                        facts=dict(current_facts),
+                        snapshot=snapshot,
+                    )
+                )
+            except _PLANNER_ERRORS:
+                failed_plan_ids.append(row.id)
+                continue
+            prepared.append(
+                (row, current_facts, normalized_facts, schema_from, schema_to)
+            )
+
+        facts_list = [item[2] for item in prepared]
+        try:
+            planner_plans: list[dict[str, Any] | None] = list(
+                generate_plans_batch(program, facts_list)
+            )
+        except _PLANNER_ERRORS:
+            planner_plans = []
+            for facts in facts_list:
+                try:
+                    planner_plans.append(generate_plan(program, facts))
+                except _PLANNER_ERRORS:
+                    planner_plans.append(None)
+
+        plan_ids = [item[0].id for item in prepared]
+        tasks_by_plan: dict[UUID, list[Any]] = {plan_id: [] for plan_id in plan_ids}
+        if plan_ids:
+            task_rows = session.execute(
+                select(
+                    Task.id,
+                    Task.plan_id,
+                    Task.task_key,
+                    Task.title,
+                    Task.status,
+                    Task.due_date,
+                    Task.metadata_json,
+                    Task.task_template_version,
+                    Task.sort_key,
+                )
+                .where(Task.plan_id.in_(plan_ids))
+                .order_by(Task.plan_id, Task.sort_key)
+            ).all()
+            for task_row in task_rows:
+                tasks_by_plan[task_row.plan_id].append(task_row)
+
+        now = datetime.now(UTC)
+        task_inserts: list[dict[str, Any]] = []
+        task_updates: list[dict[str, Any]] = []
+        plan_updates: list[dict[str, Any]] = []
+        snapshot_inserts: list[dict[str, Any]] = []
+        body_inserts: list[dict[str, Any]] = []
+        for (row, current_facts, normalized_facts, schema_from, schema_to), (
+            planner_plan
+        ) in zip(prepared, planner_plans):
+            if planner_plan is None:
+                failed_plan_ids.append(row.id)
+                continue
+            try:
+                diff = self.plan_service.diff_tasks(
+                    existing_tasks=tasks_by_plan[row.id],
+                    planner_plan=planner_plan,
+                    template=template,
+                    now=now,
+                )
+            except ApiError:
+                failed_plan_ids.append(row.id)
+                continue
+
+            task_inserts.extend(
+                {"plan_id": row.id, **values} for values in diff.inserts
+            )
+            task_updates.extend(
+                {"id": existing.id, **changes} for existing, changes in diff.updates
+            )
+            snapshot_row, snapshot_meta, body_row = (
+                self.plan_service.build_recompute_rows(
+                    plan_id=row.id,
+                    template_key=template_key,
+                    template=template,
+                    planner_plan=planner_plan,
+                    facts_before=current_facts,
+                    facts=normalized_facts,
+                    schema_from=schema_from,
+                    schema_to=schema_to,
+                    reason=reason,
+                    task_delta=diff.delta,
+                    created_at=now,
+                )
+            )
+            snapshot_inserts.append(snapshot_row)
+            if body_row is not None:
+                body_inserts.append(body_row)
+            plan_updates.append(
+                {
+                    "id": row.id,
+                    "facts": normalized_facts,
+                    "snapshot": snapshot_meta,
+                    "updated_at": now,
+                }
+            )
+
+        if task_inserts:
+            session.execute(insert(Task), task_inserts)
+        if task_updates:
+            session.execute(update(Task), task_updates)
+        if plan_updates:
+            session.execute(update(Plan), plan_updates)
+            self.plan_service.plan_body_store.save(session, body_inserts)
+            session.execute(insert(PlanSnapshot), snapshot_inserts)
+        session.commit()
+        return failed_plan_ids, len(task_inserts), len(task_updates)
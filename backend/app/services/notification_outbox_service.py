@@ -1,13 +1,17 @@
 from __future__ import annotations
 
 import random
+from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
+from typing import Any
 from uuid import UUID
 
-from sqlalchemy import and_, func, select
+from sqlalchemy import and_, func, select, update
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
+from sqlalchemy.sql import Subquery
 
+from app.db.dialect import dialect_insert
 from app.db.models import (
     NotificationFailureClass,
     NotificationOutbox,
@@ -20,6 +24,19 @@ from app.notifications.time_utils import (
 )
 
 
+@dataclass(frozen=True)
+class OutboxOutcome:
+    """Result of one send attempt; ``failure_class=None`` means sent."""
+
+    outbox_id: UUID
+    attempt_count: int
+    provider_message_id: str | None = None
+    failure_class: str | None = None
+    error_code: str | None = None
+    error_message: str | None = None
+    count_attempt: bool = True
+
+
 class NotificationOutboxService:
     def enqueue_due_soon(
         self,
@@ -50,6 +67,43 @@ class NotificationOutboxService:
             session.rollback()
             return None, False
 
+    def enqueue_due_soon_many(
+        self,
+        session: Session,
+        *,
+        items: list[dict[str, Any]],
+        now: datetime,
+    ) -> int:
+        """Insert due-soon outbox rows, skipping existing dedupe keys.
+
+        ``items`` carry ``profile_id``, ``dedupe_key_raw`` and ``payload``.
+        Returns the number of rows actually inserted. Does not commit.
+        """
+        if not items:
+            return 0
+
+        rows = [
+            {
+                "profile_id": item["profile_id"],
+                "channel": "email",
+                "type": "task_due_soon",
+                "dedupe_key_raw": item["dedupe_key_raw"],
+                "payload": item["payload"],
+                "status": NotificationOutboxStatus.pending.value,
+                "failure_class": None,
+                "next_attempt_at": now,
+                "attempt_count": 0,
+            }
+            for item in items
+        ]
+        insert = dialect_insert(session)
+        stmt = (
+            insert(NotificationOutbox.__table__)
+            .on_conflict_do_nothing(index_elements=["dedupe_key_raw"])
+            .returning(NotificationOutbox.__table__.c.id)
+        )
+        return len(session.execute(stmt, rows).all())
+
     def count_created_today(
         self,
         session: Session,
@@ -57,11 +111,7 @@ class NotificationOutboxService:
         profile_id: UUID,
         now: datetime,
     ) -> int:
-        local_day = now.astimezone(BERLIN_TZ).date()
-        start_local = datetime.combine(local_day, datetime.min.time(), tzinfo=BERLIN_TZ)
-        end_local = start_local + timedelta(days=1)
-        start_utc = start_local.astimezone(UTC)
-        end_utc = end_local.astimezone(UTC)
+        start_utc, end_utc = _local_day_bounds_utc(now)
 
         stmt = select(func.count(NotificationOutbox.id)).where(
             NotificationOutbox.profile_id == profile_id,
@@ -77,11 +127,7 @@ class NotificationOutboxService:
         profile_id: UUID,
         now: datetime,
     ) -> int:
-        local_day = now.astimezone(BERLIN_TZ).date()
-        start_local = datetime.combine(local_day, datetime.min.time(), tzinfo=BERLIN_TZ)
-        end_local = start_local + timedelta(days=1)
-        start_utc = start_local.astimezone(UTC)
-        end_utc = end_local.astimezone(UTC)
+        start_utc, end_utc = _local_day_bounds_utc(now)
 
         stmt = select(func.count(NotificationOutbox.id)).where(
             NotificationOutbox.profile_id == profile_id,
@@ -92,6 +138,24 @@ class NotificationOutboxService:
         )
         return int(session.scalar(stmt) or 0)
 
+    def sent_today_counts(self, *, now: datetime) -> Subquery:
+        """Per-profile count of emails sent on the current Berlin day."""
+        start_utc, end_utc = _local_day_bounds_utc(now)
+        return (
+            select(
+                NotificationOutbox.profile_id,
+                func.count(NotificationOutbox.id).label("sent_count"),
+            )
+            .where(
+                NotificationOutbox.status == NotificationOutboxStatus.sent.value,
+                NotificationOutbox.sent_at.is_not(None),
+                NotificationOutbox.sent_at >= start_utc,
+                NotificationOutbox.sent_at < end_utc,
+            )
+            .group_by(NotificationOutbox.profile_id)
+            .subquery("sent_today")
+        )
+
     def lock_pending_batch(
         self, session: Session, *, now: datetime, limit: int
     ) -> list[NotificationOutbox]:
@@ -126,11 +190,7 @@ class NotificationOutboxService:
         item = session.get(NotificationOutbox, outbox_id)
         if item is None:
             return
-        item.status = NotificationOutboxStatus.sent.value
-        item.failure_class = None
-        item.provider_message_id = provider_message_id
-        item.sent_at = now
-        item.updated_at = now
+        _apply(item, _sent_values(provider_message_id, now))
         session.add(item)
         session.commit()
 
@@ -149,33 +209,21 @@ class NotificationOutboxService:
         item = session.get(NotificationOutbox, outbox_id)
         if item is None:
             return
-
-        if count_attempt:
-            item.attempt_count += 1
-        item.failure_class = failure_class
-        item.last_error_code = error_code
-        item.last_error_message = (error_message or "")[:500]
-        item.updated_at = now
-
-        if failure_class == NotificationFailureClass.permanent.value:
-            item.status = NotificationOutboxStatus.dead.value
-            item.next_attempt_at = now
-        elif count_attempt and item.attempt_count >= max_attempts:
-            item.status = NotificationOutboxStatus.dead.value
-            item.failure_class = NotificationFailureClass.permanent.value
-            item.last_error_code = "retry_exhausted"
-            item.next_attempt_at = now
-        else:
-            backoff_minutes = [1, 5, 15, 60, 180]
-            idx = max(0, min(item.attempt_count - 1, len(backoff_minutes) - 1))
-            delay_minutes = backoff_minutes[idx]
-            jitter = random.uniform(0.9, 1.1)
-            candidate = now + timedelta(minutes=delay_minutes * jitter)
-            if not is_within_send_window(candidate):
-                candidate = next_send_window_start(candidate)
-            item.status = NotificationOutboxStatus.pending.value
-            item.next_attempt_at = candidate
-
+        _apply(
+            item,
+            _failure_values(
+                OutboxOutcome(
+                    outbox_id=outbox_id,
+                    attempt_count=item.attempt_count,
+                    failure_class=failure_class,
+                    error_code=error_code,
+                    error_message=error_message,
+                    count_attempt=count_attempt,
+                ),
+                now,
+                max_attempts,
+            ),
+        )
         session.add(item)
         session.commit()
 
@@ -189,16 +237,69 @@ class NotificationOutboxService:
         item = session.get(NotificationOutbox, outbox_id)
         if item is None:
             return
-
-        item.status = NotificationOutboxStatus.pending.value
-        item.failure_class = None
-        item.last_error_code = "QUIET_HOURS_DELAY"
-        item.last_error_message = "Delayed due to quiet hours"
-        item.next_attempt_at = next_send_window_start(now)
-        item.updated_at = now
+        _apply(item, _quiet_hours_values(now))
         session.add(item)
         session.commit()
 
+    def record_outcomes(
+        self,
+        session: Session,
+        *,
+        outcomes: list[OutboxOutcome],
+        now: datetime,
+        max_attempts: int = 5,
+    ) -> None:
+        """Apply send outcomes with bulk UPDATEs by primary key, one commit.
+
+        Backoff is computed per row from ``OutboxOutcome.attempt_count``,
+        the value the caller read when it claimed the row.
+        """
+        if not outcomes:
+            return
+        rows = [
+            {
+                "id": outcome.outbox_id,
+                **(
+                    _sent_values(outcome.provider_message_id, now)
+                    if outcome.failure_class is None
+                    else _failure_values(outcome, now, max_attempts)
+                ),
+            }
+            for outcome in outcomes
+        ]
+        session.execute(update(NotificationOutbox), rows)
+        session.commit()
+
+    def reschedule_quiet_hours_many(
+        self,
+        session: Session,
+        *,
+        now: datetime,
+        outbox_ids: list[UUID] | None = None,
+    ) -> int:
+        """Move rows to the next send window with a single UPDATE.
+
+        Without ``outbox_ids`` every pending row that is already due is
+        rescheduled, so no row needs to be claimed first.
+        """
+        stmt = update(NotificationOutbox)
+        if outbox_ids is None:
+            stmt = stmt.where(
+                NotificationOutbox.status == NotificationOutboxStatus.pending.value,
+                NotificationOutbox.next_attempt_at <= now,
+            )
+        elif outbox_ids:
+            stmt = stmt.where(NotificationOutbox.id.in_(outbox_ids))
+        else:
+            return 0
+        result = session.execute(
+            stmt.values(**_quiet_hours_values(now)).execution_options(
+                synchronize_session=False
+            )
+        )
+        session.commit()
+        return int(result.rowcount or 0)
+
     def recover_stuck_sending(self, session: Session, *, now: datetime) -> int:
         threshold = now - timedelta(minutes=15)
         stmt = select(NotificationOutbox).where(
@@ -221,3 +322,69 @@ class NotificationOutboxService:
         if recovered:
             session.commit()
         return recovered
+
+
+def _apply(item: NotificationOutbox, values: dict[str, Any]) -> None:
+    for attribute, value in values.items():
+        setattr(item, attribute, value)
+
+
+def _sent_values(provider_message_id: str | None, now: datetime) -> dict[str, Any]:
+    return {
+        "status": NotificationOutboxStatus.sent.value,
+        "failure_class": None,
+        "provider_message_id": provider_message_id,
+        "sent_at": now,
+        "updated_at": now,
+    }
+
+
+def _failure_values(
+    outcome: OutboxOutcome, now: datetime, max_attempts: int
+) -> dict[str, Any]:
+    attempt_count = outcome.attempt_count + (1 if outcome.count_attempt else 0)
+    values: dict[str, Any] = {
+        "attempt_count": attempt_count,
+        "failure_class": outcome.failure_class,
+        "last_error_code": outcome.error_code,
+        "last_error_message": (outcome.error_message or "")[:500],
+        "updated_at": now,
+    }
+
+    if outcome.failure_class == NotificationFailureClass.permanent.value:
+        values["status"] = NotificationOutboxStatus.dead.value
+        values["next_attempt_at"] = now
+    elif outcome.count_attempt and attempt_count >= max_attempts:
+        values["status"] = NotificationOutboxStatus.dead.value
+        values["failure_class"] = NotificationFailureClass.permanent.value
+        values["last_error_code"] = "retry_exhausted"
+        values["next_attempt_at"] = now
+    else:
+        backoff_minutes = [1, 5, 15, 60, 180]
+        idx = max(0, min(attempt_count - 1, len(backoff_minutes) - 1))
+        delay_minutes = backoff_minutes[idx]
+        jitter = random.uniform(0.9, 1.1)
+        candidate = now + timedelta(minutes=delay_minutes * jitter)
+        if not is_within_send_window(candidate):
+            candidate = next_send_window_start(candidate)
+        values["status"] = NotificationOutboxStatus.pending.value
+        values["next_attempt_at"] = candidate
+    return values
+
+
+def _quiet_hours_values(now: datetime) -> dict[str, Any]:
+    return {
+        "status": NotificationOutboxStatus.pending.value,
+        "failure_class": None,
+        "last_error_code": "QUIET_HOURS_DELAY",
+        "last_error_message": "Delayed due to quiet hours",
+        "next_attempt_at": next_send_window_start(now),
+        "updated_at": now,
+    }
+
+
+def _local_day_bounds_utc(now: datetime) -> tuple[datetime, datetime]:
+    local_day = now.astimezone(BERLIN_TZ).date()
+    start_local = datetime.combine(local_day, datetime.min.time(), tzinfo=BERLIN_TZ)
+    end_local = start_local + timedelta(days=1)
+    return start_local.astimezone(UTC), end_local.astimezone(UTC)
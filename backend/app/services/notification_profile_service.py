@@ -6,11 +6,17 @@ import os
 from datetime import UTC, datetime
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import ColumnElement, and_, func, select
 from sqlalchemy.orm import Session
 
 from app.db.models import NotificationProfile
 
+# Every character ``str.strip()`` removes, so SQL trimming matches Python.
+_WHITESPACE = (
+    "\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f \x85\xa0\u1680\u2000\u2001\u2002\u2003"
+    "\u2004\u2005\u2006\u2007\u2008\u2009\u200a\u2028\u2029\u202f\u205f\u3000"
+)
+
 
 class NotificationProfileService:
     def __init__(self) -> None:
@@ -67,13 +73,26 @@ class NotificationProfileService:
             and profile.reminder_due_soon_enabled
         )
 
+    def sendable_clause(self) -> ColumnElement[bool]:
+        """SQL counterpart of ``is_sendable`` for set-based queries."""
+        return and_(
+            NotificationProfile.email.is_not(None),
+            func.trim(NotificationProfile.email, _WHITESPACE) != "",
+            NotificationProfile.email_consent.is_(True),
+            NotificationProfile.unsubscribed_at.is_(None),
+            NotificationProfile.reminder_due_soon_enabled.is_(True),
+        )
+
+    def unsubscribe_token_for(self, profile_id: UUID, version: int) -> tuple[str, str]:
+        token = self._stable_unsubscribe_token(profile_id, version)
+        return token, self._hash_token(token)
+
     def issue_unsubscribe_token(
         self, session: Session, *, profile: NotificationProfile
     ) -> str:
-        token = self._stable_unsubscribe_token(
+        token, token_hash = self.unsubscribe_token_for(
             profile.id, profile.unsubscribe_token_version
         )
-        token_hash = self._hash_token(token)
         if profile.unsubscribe_token_hash != token_hash:
             profile.unsubscribe_token_hash = token_hash
         profile.updated_at = datetime.now(UTC)
@@ -1,16 +1,22 @@
 from __future__ import annotations
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
+from typing import Any
+from uuid import UUID
 
 from sqlalchemy.orm import Session
 
-from app.notifications.brevo_provider import BrevoEmailProvider
+from app.notifications.brevo_provider import BrevoEmailProvider, ProviderSendResult
 from app.notifications.config import NotificationConfig
 from app.notifications.templates import render_task_due_soon
 from app.notifications.time_utils import is_within_send_window
-from app.services.notification_outbox_service import NotificationOutboxService
+from app.services.notification_outbox_service import (
+    NotificationOutboxService,
+    OutboxOutcome,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -26,15 +32,46 @@ class DispatchSummary:
 
 
 class OutboxDispatcherService:
-    def __init__(self, config: NotificationConfig) -> None:
+    """Sends locked outbox items through the email provider.
+
+    Provider calls run on a thread pool of ``config.dispatch_concurrency``
+    workers sharing the provider's pooled HTTP client; all database writes
+    stay on the calling thread once the sends have finished and are written
+    back as one batch.
+    """
+
+    def __init__(
+        self,
+        config: NotificationConfig,
+        *,
+        provider: BrevoEmailProvider | None = None,
+    ) -> None:
         self.config = config
         self.outbox_service = NotificationOutboxService()
-        self.provider = BrevoEmailProvider(config)
+        self.provider = provider or BrevoEmailProvider(config)
+
+    def close(self) -> None:
+        self.provider.close()
 
     def dispatch_pending(
         self, session: Session, *, now: datetime, batch_size: int = 100
     ) -> DispatchSummary:
         recovered_stuck = self.outbox_service.recover_stuck_sending(session, now=now)
+        if not is_within_send_window(now):
+            # Nothing can be sent: push due rows to the next window in one
+            # UPDATE instead of claiming them. Later runs in the same quiet
+            # period find no due rows.
+            return DispatchSummary(
+                picked=0,
+                sent=0,
+                retried=0,
+                dead=0,
+                recovered_stuck=recovered_stuck,
+                skipped_quiet_hours=self.outbox_service.reschedule_quiet_hours_many(
+                    session, now=now
+                ),
+            )
+
         items = self.outbox_service.lock_pending_batch(
             session, now=now, limit=batch_size
         )
@@ -43,54 +80,51 @@ class OutboxDispatcherService:
         sent = 0
         retried = 0
         dead = 0
-        skipped_quiet_hours = 0
 
+        jobs: list[_SendJob] = []
         for item in items:
             payload = item.payload if isinstance(item.payload, dict) else {}
             to_email = payload.get("to_email")
             if not isinstance(to_email, str):
                 to_email = ""
-
-            if not is_within_send_window(now):
-                self.outbox_service.reschedule_quiet_hours(
-                    session,
+            jobs.append(
+                _SendJob(
                     outbox_id=item.id,
-                    now=now,
+                    attempt_count=item.attempt_count,
+                    to_email=to_email,
+                    payload=payload,
                 )
-                skipped_quiet_hours += 1
-                continue
-
-            rendered = render_task_due_soon(payload)
-            result = self.provider.send(to_email=to_email, rendered=rendered)
+            )
 
+        outcomes: list[OutboxOutcome] = []
+        for job, result in zip(jobs, self._send_all(jobs)):
             if result.status == "sent":
-                self.outbox_service.mark_sent(
-                    session,
-                    outbox_id=item.id,
-                    provider_message_id=result.provider_message_id,
-                    now=now,
+                outcomes.append(
+                    OutboxOutcome(
+                        outbox_id=job.outbox_id,
+                        attempt_count=job.attempt_count,
+                        provider_message_id=result.provider_message_id,
+                    )
                 )
                 sent += 1
-            elif result.failure_class == "permanent":
-                self.outbox_service.mark_failed_or_retry(
-                    session,
-                    outbox_id=item.id,
-                    failure_class="permanent",
-                    error_code=result.error_code,
-                    error_message=result.error_message,
-                    now=now,
-                )
+                continue
+
+            if result.failure_class == "permanent":
+                failure_class = "permanent"
                 dead += 1
             else:
-                self.outbox_service.mark_failed_or_retry(
-                    session,
-                    outbox_id=item.id,
-                    failure_class="retryable",
+                failure_class = "retryable"
+                retried += 1
+            outcomes.append(
+                OutboxOutcome(
+                    outbox_id=job.outbox_id,
+                    attempt_count=job.attempt_count,
+                    failure_class=failure_class,
                     error_code=result.error_code,
                     error_message=result.error_message,
-                    now=now,
                 )
-                retried += 1
+            )
+        self.outbox_service.record_outcomes(session, outcomes=outcomes, now=now)
 
         return DispatchSummary(
             picked=picked,
@@ -98,5 +132,39 @@ class OutboxDispatcherService:
             retried=retried,
             dead=dead,
             recovered_stuck=recovered_stuck,
-            skipped_quiet_hours=skipped_quiet_hours,
+            skipped_quiet_hours=0,
         )
+
+    def _send_all(self, jobs: list[_SendJob]) -> list[ProviderSendResult]:
+        workers = min(self.config.dispatch_concurrency, len(jobs))
+        if workers <= 1:
+            return [self._send(job) for job in jobs]
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="outbox-dispatch"
+        ) as executor:
+            return list(executor.map(self._send, jobs))
+
+    def _send(self, job: _SendJob) -> ProviderSendResult:
+        try:
+            rendered = render_task_due_soon(job.payload)
+            return self.provider.send(to_email=job.to_email, rendered=rendered)
+        except Exception as exc:
+            logger.exception(
+                "outbox_dispatch_send_failed",
+                extra={"outbox_id": str(job.outbox_id)},
+            )
+            return ProviderSendResult(
+                status="pending",
+                failure_class="retryable",
+                error_code="UNEXPECTED_ERROR",
+                error_message=str(exc),
+                provider_message_id=None,
+            )
+
+
+@dataclass(frozen=True)
+class _SendJob:
+    outbox_id: UUID
+    attempt_count: int
+    to_email: str
+    payload: dict[str, Any]
@@ -2,16 +2,25 @@ from __future__ import annotations
 
 import hashlib
 import json
-from datetime import UTC, date, datetime
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, timedelta
 from typing import Any
-from uuid import UUID
+from uuid import UUID, uuid4
 
-from sqlalchemy import select
+from sqlalchemy import Row, insert, select
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import Session
-
-from app.db.models import Plan, PlanStatus, Task, TaskStatus, TemplateVersion
-from app.planner.engine import generate_plan
+from sqlalchemy.orm import Session, undefer
+
+from app.db.models import (
+    Plan,
+    PlanSnapshot,
+    PlanStatus,
+    Task,
+    TaskStatus,
+)
+from app.db.session import replica_read
+from app.planner.engine import generate_plan, generate_plan_incremental
 from app.planner.errors import (
     PlannerDependencyError,
     PlannerInputError,
@@ -22,6 +31,8 @@ from app.services.facts_normalizer import (
     migrate_facts_to_latest_schema,
     normalize_facts,
 )
+from app.services.snapshot_store import PlanBodyStore
+from app.services.task_service import derive_task_kind
 from app.services.template_catalog_service import TemplateCatalogService
 from app.services.template_repository import TemplateRepository
 
@@ -29,6 +40,11 @@ ENGINE_VERSION = "0.2.0"
 RECOMPUTE_REASON_MANUAL = "MANUAL"
 RECOMPUTE_REASON_FACT_CHANGE = "FACT_CHANGE"
 RECOMPUTE_REASON_TEMPLATE_UPDATE = "TEMPLATE_UPDATE"
+_METADATA_SKELETONS = "task_metadata_skeletons"
+_RECOMPUTE_PENDING = "recompute_pending"
+# A pending recompute whose worker run has not checked in for this long past
+# the debounce window is assumed lost and gets scheduled again.
+RECOMPUTE_SCHEDULE_GRACE = timedelta(seconds=60)
 OPEN_TASK_STATUSES = {
     TaskStatus.todo.value,
     TaskStatus.in_progress.value,
@@ -41,11 +57,13 @@ class PlanService:
         self,
         template_repository: TemplateRepository | None = None,
         template_catalog_service: TemplateCatalogService | None = None,
+        plan_body_store: PlanBodyStore | None = None,
     ) -> None:
         self.template_repository = template_repository or TemplateRepository()
         self.template_catalog_service = (
             template_catalog_service or TemplateCatalogService(self.template_repository)
         )
+        self.plan_body_store = plan_body_store or PlanBodyStore()
 
     def create_plan(
         self,
@@ -78,7 +96,10 @@ class PlanService:
                 input_facts=facts,
                 source_schema_version=None,
             )
-            planner_plan = generate_plan(template, normalized_facts)
+            planner_plan = generate_plan(
+                self.template_repository.compiled_program(template),
+                normalized_facts,
+            )
         except ApiError:
             raise
         except (
@@ -109,34 +130,42 @@ class PlanService:
 
         try:
             plan = Plan(
+                id=uuid4(),
                 template_id=resolved_template_id,
                 template_version=resolved_template_version,
                 template_key=resolved_template_key,
                 upgraded_from_plan_id=upgraded_from_plan_id,
                 facts=normalized_facts,
-                snapshot=snapshot,
                 status=PlanStatus.active.value,
             )
+            self._append_snapshot(session, plan, snapshot, created_at=now)
             session.add(plan)
             session.flush()
 
+            skeletons = self.metadata_skeletons(template)
+            task_template_version = _read_template_version(template)
+            task_rows = []
             for idx, item in enumerate(planner_plan["tasks"]):
-                template_task = _read_template_task(template, item["id"])
-                due_date = _read_due_date(item.get("deadline"))
-                metadata = _build_task_metadata(item=item, template_task=template_task)
-
-                task = Task(
-                    plan_id=plan.id,
-                    task_key=item["id"],
-                    title=item["title"],
-                    description=None,
-                    status=TaskStatus.todo.value,
-                    due_date=due_date,
-                    metadata_json=metadata,
-                    task_template_version=_read_template_version(template),
-                    sort_key=idx,
+                metadata = _build_task_metadata(
+                    item=item,
+                    skeleton=skeletons.get(item["id"], _EMPTY_SKELETON),
                 )
-                session.add(task)
+                task_rows.append(
+                    {
+                        "plan_id": plan.id,
+                        "task_key": item["id"],
+                        "title": item["title"],
+                        "description": None,
+                        "status": TaskStatus.todo.value,
+                        "due_date": _read_due_date(item.get("deadline")),
+                        "metadata_json": metadata,
+                        "task_kind": derive_task_kind(metadata),
+                        "task_template_version": task_template_version,
+                        "sort_key": idx,
+                    }
+                )
+            if task_rows:
+                session.execute(insert(Task), task_rows)
 
             session.commit()
             session.refresh(plan)
@@ -171,23 +200,104 @@ class PlanService:
                 facts_override=merged_facts,
             )
 
-        template = self._load_template_for_plan(session, plan)
-        snapshot = plan.snapshot if isinstance(plan.snapshot, dict) else {}
-        source_schema_version = _read_snapshot_fact_schema_version(snapshot)
-        normalized_facts, _, _ = self._prepare_facts(
-            template_key=plan.template_key,
-            template=template,
-            input_facts=merged_facts,
-            source_schema_version=source_schema_version,
-        )
-
-        plan.facts = normalized_facts
+        plan.facts = self._normalize_plan_facts(session, plan, merged_facts)
         plan.updated_at = datetime.now(UTC)
         session.add(plan)
         session.commit()
         session.refresh(plan)
         return plan
 
+    def defer_recompute(
+        self,
+        session: Session,
+        *,
+        plan_id: UUID,
+        facts_patch: dict[str, Any],
+        debounce_seconds: float,
+        now: datetime | None = None,
+    ) -> tuple[Plan, bool]:
+        """Store a fact patch and mark the plan's snapshot as pending.
+
+        Returns the plan and whether a worker run must be scheduled. Patches
+        arriving while a run is scheduled only extend its debounce window, so
+        a burst of patches is recomputed once.
+        """
+        now = now or datetime.now(UTC)
+        plan = self._lock_plan(session, plan_id)
+        previous_facts = dict(plan.facts) if isinstance(plan.facts, dict) else {}
+        merged_facts = {**previous_facts, **facts_patch}
+        normalized_facts = self._normalize_plan_facts(session, plan, merged_facts)
+
+        pending = _read_pending_recompute(plan.snapshot)
+        if pending is None:
+            schedule = True
+            base_facts = previous_facts
+        else:
+            stale_after = pending["scheduled_at"] + timedelta(seconds=debounce_seconds)
+            schedule = now > stale_after + RECOMPUTE_SCHEDULE_GRACE
+            base_facts = pending["base_facts"]
+        plan.snapshot = _with_pending_recompute(
+            plan.snapshot,
+            base_facts=base_facts,
+            requested_at=now,
+            scheduled_at=now if schedule else pending["scheduled_at"],
+        )
+        plan.facts = normalized_facts
+        plan.updated_at = now
+        session.add(plan)
+        session.commit()
+        session.refresh(plan)
+        return plan, schedule
+
+    def run_deferred_recompute(
+        self,
+        session: Session,
+        *,
+        plan_id: UUID,
+        debounce_seconds: float,
+        now: datetime | None = None,
+    ) -> float | None:
+        """Recompute a pending plan once its debounce window has passed.
+
+        Returns the seconds left in the window while patches keep arriving, so
+        the caller can reschedule; ``None`` once nothing is pending.
+        """
+        now = now or datetime.now(UTC)
+        plan = self._lock_plan(session, plan_id)
+        pending = _read_pending_recompute(plan.snapshot)
+        if pending is None:
+            session.rollback()
+            return None
+
+        remaining = (
+            pending["requested_at"] + timedelta(seconds=debounce_seconds) - now
+        ).total_seconds()
+        if remaining > 0:
+            plan.snapshot = _with_pending_recompute(
+                plan.snapshot,
+                base_facts=pending["base_facts"],
+                requested_at=pending["requested_at"],
+                scheduled_at=now,
+            )
+            session.add(plan)
+            session.commit()
+            return remaining
+
+        try:
+            self.recompute_plan(
+                session, plan_id=plan_id, reason=RECOMPUTE_REASON_FACT_CHANGE
+            )
+        except ApiError:
+            session.rollback()
+            plan = self._lock_plan(session, plan_id)
+            snapshot = dict(plan.snapshot)
+            snapshot.pop(_RECOMPUTE_PENDING, None)
+            plan.snapshot = snapshot
+            session.add(plan)
+            session.commit()
+            raise
+        return None
+
     def recompute_plan(
         self,
         session: Session,
@@ -215,6 +325,7 @@ class PlanService:
                 input_facts=input_facts,
                 source_schema_version=source_schema_version,
             )
+            program = self.template_repository.compiled_program(template)
         except ApiError:
             raise
         except (
@@ -229,22 +340,51 @@ class PlanService:
                 message=str(exc),
             ) from exc
 
-        current_facts = dict(plan.facts) if isinstance(plan.facts, dict) else {}
+        # Facts the snapshot was generated from; a deferred recompute keeps
+        # them on its pending marker while plan.facts moves ahead.
+        pending = _read_pending_recompute(snapshot_before)
+        current_facts = (
+            pending["base_facts"]
+            if pending is not None
+            else (dict(plan.facts) if isinstance(plan.facts, dict) else {})
+        )
         facts_hash = _hash_facts(normalized_facts)
         current_facts_hash = _read_snapshot_facts_hash(snapshot_before)
         target_template_version = _read_template_version(template)
         current_template_version = _read_snapshot_template_version(snapshot_before)
         current_engine_version = _read_snapshot_engine_version(snapshot_before)
-
-        if (
+        changed_facts = {
+            change["fact"] for change in _facts_diff(current_facts, normalized_facts)
+        }
+        can_reuse_plan = (
             reason == RECOMPUTE_REASON_FACT_CHANGE
             and current_facts_hash is not None
-            and facts_hash == current_facts_hash
             and target_template_version == current_template_version
             and current_engine_version == ENGINE_VERSION
+        )
+        existing_plan_payload = (
+            self._load_planner_plan(session, snapshot_before)
+            if can_reuse_plan
+            else None
+        )
+        previous_task_ids = _read_planner_task_ids(existing_plan_payload)
+        # Incremental reuse is only sound when current_facts are the ones the
+        # snapshot plan was generated from (update_facts without recompute
+        # moves the stored facts ahead of the snapshot).
+        can_reuse_incrementally = (
+            can_reuse_plan
+            and previous_task_ids is not None
+            and _hash_facts(current_facts) == current_facts_hash
+        )
+
+        if can_reuse_plan and (
+            facts_hash == current_facts_hash
+            or (
+                can_reuse_incrementally
+                and changed_facts.isdisjoint(program.planning_facts)
+            )
         ):
             now = datetime.now(UTC)
-            existing_plan_payload = snapshot_before.get("planner_plan")
             existing_plan = (
                 existing_plan_payload
                 if isinstance(existing_plan_payload, dict)
@@ -271,7 +411,7 @@ class PlanService:
             )
 
             plan.facts = normalized_facts
-            plan.snapshot = snapshot
+            self._append_snapshot(session, plan, snapshot, created_at=now)
             plan.updated_at = now
             session.add(plan)
             session.commit()
@@ -279,7 +419,15 @@ class PlanService:
             return plan
 
         try:
-            planner_plan = generate_plan(template, normalized_facts)
+            if can_reuse_incrementally:
+                planner_plan = generate_plan_incremental(
+                    program,
+                    normalized_facts,
+                    previous_task_ids=previous_task_ids,
+                    changed_facts=changed_facts,
+                )
+            else:
+                planner_plan = generate_plan(program, normalized_facts)
         except (
             PlannerInputError,
             PlannerDependencyError,
@@ -293,141 +441,27 @@ class PlanService:
             ) from exc
 
         existing_tasks = list(
-            session.scalars(select(Task).where(Task.plan_id == plan.id)).all()
+            session.scalars(
+                select(Task).where(Task.plan_id == plan.id).order_by(Task.sort_key)
+            ).all()
         )
-        existing_by_key = {task.task_key: task for task in existing_tasks}
-
-        added_task_keys: list[str] = []
-        soft_dismissed_task_keys: list[str] = []
-        reactivated_task_keys: list[str] = []
-        updated_task_keys: list[str] = []
-        status_changes: list[dict[str, str]] = []
-        deadline_changes: list[dict[str, str | None]] = []
-
         now = datetime.now(UTC)
-        sort_index = 0
-
-        for item in planner_plan["tasks"]:
-            task_key = item["id"]
-            template_task = _read_template_task(template, task_key)
-            new_due_date = _read_due_date(item.get("deadline"))
-            new_metadata = _build_task_metadata(item=item, template_task=template_task)
-            new_title = item["title"]
-            existing = existing_by_key.pop(task_key, None)
-
-            if existing is None:
-                task = Task(
-                    plan_id=plan.id,
-                    task_key=task_key,
-                    title=new_title,
-                    description=None,
-                    status=TaskStatus.todo.value,
-                    due_date=new_due_date,
-                    metadata_json=new_metadata,
-                    task_template_version=target_template_version,
-                    sort_key=sort_index,
-                )
-                session.add(task)
-                added_task_keys.append(task_key)
-                sort_index += 1
-                continue
-
-            changed = False
-            old_status = existing.status
-            old_due_date = existing.due_date
-            old_title = existing.title
-            old_metadata = (
-                existing.metadata_json
-                if isinstance(existing.metadata_json, dict)
-                else {}
-            )
-
-            next_status = _next_status(old_status=old_status, eligible=True)
-            if next_status != old_status:
-                existing.status = next_status
-                existing.updated_at = now
-                changed = True
-                status_changes.append(
-                    {
-                        "task_key": task_key,
-                        "from": old_status,
-                        "to": next_status,
-                    }
-                )
-                if (
-                    old_status == TaskStatus.skipped.value
-                    and next_status == TaskStatus.todo.value
-                ):
-                    reactivated_task_keys.append(task_key)
-                if next_status != TaskStatus.done.value:
-                    existing.completed_at = None
-
-            if existing.status != TaskStatus.done.value:
-                if old_title != new_title:
-                    existing.title = new_title
-                    changed = True
-                if old_metadata != new_metadata:
-                    existing.metadata_json = new_metadata
-                    changed = True
-                if existing.task_template_version != target_template_version:
-                    existing.task_template_version = target_template_version
-                    changed = True
-
-            existing.sort_key = sort_index
-            sort_index += 1
-
-            if old_due_date != new_due_date and existing.status in OPEN_TASK_STATUSES:
-                existing.due_date = new_due_date
-                changed = True
-                deadline_changes.append(
-                    {
-                        "task_key": task_key,
-                        "from": _date_to_iso(old_due_date),
-                        "to": _date_to_iso(new_due_date),
-                    }
-                )
-
-            if changed:
-                existing.updated_at = now
-                session.add(existing)
-                updated_task_keys.append(task_key)
-
-        for task_key, existing in existing_by_key.items():
-            changed = False
-            old_status = existing.status
-            next_status = _next_status(old_status=old_status, eligible=False)
-            if next_status != old_status:
-                existing.status = next_status
-                existing.updated_at = now
-                changed = True
-                status_changes.append(
-                    {
-                        "task_key": task_key,
-                        "from": old_status,
-                        "to": next_status,
-                    }
-                )
-                if (
-                    next_status == TaskStatus.skipped.value
-                    and old_status != TaskStatus.skipped.value
-                ):
-                    soft_dismissed_task_keys.append(task_key)
-
-            existing.sort_key = sort_index
-            sort_index += 1
-            changed = True
-
-            if changed:
-                session.add(existing)
-                updated_task_keys.append(task_key)
+        diff = _diff_tasks(
+            existing_tasks=existing_tasks,
+            planner_plan=planner_plan,
+            skeletons=self.metadata_skeletons(template),
+            target_template_version=target_template_version,
+            now=now,
+        )
+        for values in diff.inserts:
+            session.add(Task(plan_id=plan.id, **values))
+        for existing, changes in diff.updates:
+            for attribute, value in changes.items():
+                setattr(existing, attribute, value)
+            session.add(existing)
 
         recompute_delta = {
-            "added_task_keys": sorted(set(added_task_keys)),
-            "soft_dismissed_task_keys": sorted(set(soft_dismissed_task_keys)),
-            "reactivated_task_keys": sorted(set(reactivated_task_keys)),
-            "updated_task_keys": sorted(set(updated_task_keys)),
-            "status_changes": status_changes,
-            "deadline_changes": deadline_changes,
+            **diff.delta,
             "facts_diff": _facts_diff(current_facts, normalized_facts),
         }
 
@@ -445,7 +479,7 @@ class PlanService:
 
         try:
             plan.facts = normalized_facts
-            plan.snapshot = snapshot
+            self._append_snapshot(session, plan, snapshot, created_at=now)
             plan.updated_at = now
             session.add(plan)
             session.commit()
@@ -459,6 +493,88 @@ class PlanService:
                 message="Could not persist recomputed plan",
             ) from exc
 
+    def load_snapshot(self, session: Session, plan: Plan | Row[Any]) -> dict[str, Any]:
+        """Reassemble the full snapshot from the plan meta and its stored body."""
+        meta = plan.snapshot if isinstance(plan.snapshot, dict) else {}
+        if "planner_plan" in meta:
+            return dict(meta)
+        snapshot = dict(meta)
+        snapshot_id = _read_snapshot_id(meta)
+        stored = (
+            session.get(
+                PlanSnapshot,
+                snapshot_id,
+                options=[
+                    undefer(PlanSnapshot.planner_plan),
+                    undefer(PlanSnapshot.recompute_delta),
+                ],
+            )
+            if snapshot_id is not None
+            else None
+        )
+        planner_plan = (
+            self._resolve_planner_plan(
+                session, stored.planner_plan, stored.body_hash, stored.event_date
+            )
+            if stored is not None
+            else None
+        )
+        snapshot["planner_plan"] = planner_plan or {"tasks": []}
+        if stored is not None and stored.recompute_delta is not None:
+            snapshot["recompute_delta"] = stored.recompute_delta
+        return snapshot
+
+    @replica_read
+    def get_plan_view(self, session: Session, plan_id: UUID) -> Row[Any]:
+        """Read-only plan columns as a single column tuple.
+
+        Nothing is hydrated into the identity map; use ``get_plan`` when the
+        plan will be modified. The latest published version comes from the
+        catalog cache via ``latest_published_version``.
+        """
+        row = session.execute(
+            select(
+                Plan.id,
+                Plan.template_id,
+                Plan.template_version,
+                Plan.template_key,
+                Plan.facts,
+                Plan.snapshot,
+                Plan.status,
+                Plan.created_at,
+                Plan.updated_at,
+            ).where(Plan.id == plan_id)
+        ).one_or_none()
+        if row is None:
+            raise ApiError(
+                status_code=404,
+                code="PLAN_NOT_FOUND",
+                message=f"Plan '{plan_id}' not found",
+            )
+        return row
+
+    @replica_read
+    def get_plan_validator(self, session: Session, plan_id: UUID) -> Row[Any]:
+        """``updated_at``, template id and facts hash of a plan.
+
+        Used for conditional GETs: reads scalars only, so a matching
+        ``If-None-Match`` is answered without loading facts or snapshot.
+        """
+        row = session.execute(
+            select(
+                Plan.updated_at,
+                Plan.template_id,
+                Plan.snapshot["facts_hash"].as_string().label("facts_hash"),
+            ).where(Plan.id == plan_id)
+        ).one_or_none()
+        if row is None:
+            raise ApiError(
+                status_code=404,
+                code="PLAN_NOT_FOUND",
+                message=f"Plan '{plan_id}' not found",
+            )
+        return row
+
     def get_plan(self, session: Session, plan_id: UUID) -> Plan:
         plan = session.get(Plan, plan_id)
         if plan is None:
@@ -496,6 +612,168 @@ class PlanService:
             upgraded_from_plan_id=source_plan.id,
         )
 
+    def metadata_skeletons(self, template: dict[str, Any]) -> dict[str, dict[str, Any]]:
+        """Template-derived task metadata per task key, memoized per template."""
+        return self.template_repository.cache.derive(
+            template, _METADATA_SKELETONS, _build_metadata_skeletons
+        )
+
+    def prepare_recompute_facts(
+        self,
+        *,
+        template_key: str,
+        template: dict[str, Any],
+        facts: dict[str, Any],
+        snapshot: dict[str, Any],
+    ) -> tuple[dict[str, Any], int, int]:
+        """Migrate and normalize stored plan facts as ``recompute_plan`` does.
+
+        Returns the normalized facts and the fact schema versions they were
+        migrated from and to.
+        """
+        return self._prepare_facts(
+            template_key=template_key,
+            template=template,
+            input_facts=facts,
+            source_schema_version=_read_snapshot_fact_schema_version(snapshot),
+        )
+
+    def diff_tasks(
+        self,
+        *,
+        existing_tasks: Iterable[Any],
+        planner_plan: dict[str, Any],
+        template: dict[str, Any],
+        now: datetime,
+    ) -> TaskDiff:
+        """Changes that bring a plan's stored tasks in line with ``planner_plan``."""
+        return _diff_tasks(
+            existing_tasks=existing_tasks,
+            planner_plan=planner_plan,
+            skeletons=self.metadata_skeletons(template),
+            target_template_version=_read_template_version(template),
+            now=now,
+        )
+
+    def build_recompute_rows(
+        self,
+        *,
+        plan_id: UUID,
+        template_key: str,
+        template: dict[str, Any],
+        planner_plan: dict[str, Any],
+        facts_before: dict[str, Any],
+        facts: dict[str, Any],
+        schema_from: int,
+        schema_to: int,
+        reason: str,
+        task_delta: dict[str, Any],
+        created_at: datetime,
+    ) -> tuple[dict[str, Any], dict[str, Any], dict[str, Any] | None]:
+        """Build a recompute snapshot as rows for a bulk write.
+
+        Returns the plan_snapshots row, the ``plans.snapshot`` meta and the
+        plan_bodies row (``None`` when the body is stored inline), the same
+        values ``recompute_plan`` persists for these inputs.
+        """
+        snapshot = self._build_snapshot(
+            template_key=template_key,
+            template=template,
+            planner_plan=planner_plan,
+            generated_at=created_at,
+            facts_hash=_hash_facts(facts),
+            schema_from=schema_from,
+            schema_to=schema_to,
+            recompute_reason=reason,
+            recompute_delta={
+                **task_delta,
+                "facts_diff": _facts_diff(facts_before, facts),
+            },
+        )
+        return _split_snapshot(
+            plan_id,
+            snapshot,
+            created_at=created_at,
+            body_store=self.plan_body_store,
+        )
+
+    def _append_snapshot(
+        self,
+        session: Session,
+        plan: Plan,
+        snapshot: dict[str, Any],
+        *,
+        created_at: datetime,
+    ) -> None:
+        row, meta, body_row = _split_snapshot(
+            plan.id, snapshot, created_at=created_at, body_store=self.plan_body_store
+        )
+        if body_row is not None:
+            self.plan_body_store.save(session, [body_row])
+        session.add(PlanSnapshot(**row))
+        plan.snapshot = meta
+
+    def _load_planner_plan(
+        self, session: Session, snapshot: dict[str, Any]
+    ) -> dict[str, Any] | None:
+        if "planner_plan" in snapshot:
+            return snapshot["planner_plan"]
+        snapshot_id = _read_snapshot_id(snapshot)
+        if snapshot_id is None:
+            return None
+        stored = session.execute(
+            select(
+                PlanSnapshot.planner_plan,
+                PlanSnapshot.body_hash,
+                PlanSnapshot.event_date,
+            ).where(PlanSnapshot.id == snapshot_id)
+        ).first()
+        if stored is None:
+            return None
+        return self._resolve_planner_plan(
+            session, stored.planner_plan, stored.body_hash, stored.event_date
+        )
+
+    def _resolve_planner_plan(
+        self,
+        session: Session,
+        inline_plan: dict[str, Any] | None,
+        body_hash: str | None,
+        event_date: date | None,
+    ) -> dict[str, Any] | None:
+        if body_hash is None or event_date is None:
+            return inline_plan
+        return self.plan_body_store.load(session, body_hash, event_date)
+
+    def _lock_plan(self, session: Session, plan_id: UUID) -> Plan:
+        plan = session.scalars(
+            select(Plan)
+            .where(Plan.id == plan_id)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        ).one_or_none()
+        if plan is None:
+            raise ApiError(
+                status_code=404,
+                code="PLAN_NOT_FOUND",
+                message=f"Plan '{plan_id}' not found",
+            )
+        return plan
+
+    def _normalize_plan_facts(
+        self, session: Session, plan: Plan, facts: dict[str, Any]
+    ) -> dict[str, Any]:
+        template = self._load_template_for_plan(session, plan)
+        snapshot = plan.snapshot if isinstance(plan.snapshot, dict) else {}
+        source_schema_version = _read_snapshot_fact_schema_version(snapshot)
+        normalized_facts, _, _ = self._prepare_facts(
+            template_key=plan.template_key,
+            template=template,
+            input_facts=facts,
+            source_schema_version=source_schema_version,
+        )
+        return normalized_facts
+
     def _prepare_facts(
         self,
         *,
@@ -569,14 +847,15 @@ class PlanService:
         session: Session,
         plan: Plan,
     ) -> dict[str, Any]:
-        row = session.scalar(
-            select(TemplateVersion).where(
-                TemplateVersion.template_key == plan.template_key
-            )
+        return self.load_template(session, template_key=plan.template_key)
+
+    def load_template(self, session: Session, *, template_key: str) -> dict[str, Any]:
+        row = self.template_catalog_service.find_by_key(
+            session, template_key=template_key
         )
         expected_compiled_hash = row.compiled_hash if row is not None else None
         return self.template_repository.load(
-            plan.template_key, expected_compiled_hash=expected_compiled_hash
+            template_key, expected_compiled_hash=expected_compiled_hash
         )
 
     def latest_published_version(
@@ -630,6 +909,43 @@ class PlanService:
         return snapshot
 
 
+def _split_snapshot(
+    plan_id: UUID,
+    snapshot: dict[str, Any],
+    *,
+    created_at: datetime,
+    body_store: PlanBodyStore,
+) -> tuple[dict[str, Any], dict[str, Any], dict[str, Any] | None]:
+    """Split a built snapshot into plan_snapshots row, plans meta and body row.
+
+    The plan_bodies row is ``None`` when the plan body is stored inline.
+    """
+    meta = dict(snapshot)
+    recompute = meta.get("recompute")
+    body_columns, body_row = body_store.prepare(meta.pop("planner_plan"))
+    row = {
+        "id": uuid4(),
+        "plan_id": plan_id,
+        "reason": recompute.get("reason") if isinstance(recompute, dict) else None,
+        "facts_hash": meta.get("facts_hash"),
+        **body_columns,
+        "recompute_delta": meta.pop("recompute_delta", None),
+        "created_at": created_at,
+    }
+    meta["snapshot_id"] = str(row["id"])
+    return row, meta, body_row
+
+
+def _read_snapshot_id(snapshot: dict[str, Any]) -> UUID | None:
+    value = snapshot.get("snapshot_id")
+    if not isinstance(value, str):
+        return None
+    try:
+        return UUID(value)
+    except ValueError:
+        return None
+
+
 def _read_due_date(raw_deadline: Any) -> date | None:
     if raw_deadline is None:
         return None
@@ -659,17 +975,18 @@ def _read_template_task(template: dict[str, Any], task_key: str) -> dict[str, An
     return {}
 
 
-def _build_task_metadata(
-    *,
-    item: dict[str, Any],
-    template_task: dict[str, Any],
-) -> dict[str, Any]:
-    metadata = item.get("meta") or {}
-    if not isinstance(metadata, dict):
-        metadata = {}
+def _build_metadata_skeletons(template: dict[str, Any]) -> dict[str, dict[str, Any]]:
+    template_tasks = template.get("tasks", {})
+    if not isinstance(template_tasks, dict):
+        return {}
+    return {
+        task_key: _metadata_skeleton(_read_template_task(template, task_key))
+        for task_key in template_tasks
+    }
+
 
+def _metadata_skeleton(template_task: dict[str, Any]) -> dict[str, Any]:
     return {
-        **metadata,
         "category": template_task.get("category"),
         "priority": template_task.get("priority"),
         "effort": (
@@ -697,6 +1014,24 @@ def _build_task_metadata(
             if isinstance(template_task.get("ui_actions"), list)
             else []
         ),
+    }
+
+
+_EMPTY_SKELETON = _metadata_skeleton({})
+
+
+def _build_task_metadata(
+    *,
+    item: dict[str, Any],
+    skeleton: dict[str, Any],
+) -> dict[str, Any]:
+    metadata = item.get("meta") or {}
+    if not isinstance(metadata, dict):
+        metadata = {}
+
+    return {
+        **metadata,
+        **skeleton,
         "blocked_by": (
             item.get("depends_on") if isinstance(item.get("depends_on"), list) else []
         ),
@@ -705,6 +1040,169 @@ def _build_task_metadata(
     }
 
 
+@dataclass
+class TaskDiff:
+    """Changes that bring a plan's stored tasks in line with a planner plan.
+
+    ``inserts`` holds column values for new tasks (without ``plan_id``);
+    ``updates`` pairs each existing task with the attributes to change.
+    ``existing_tasks`` may be ORM instances or column rows, they are only read.
+    """
+
+    inserts: list[dict[str, Any]]
+    updates: list[tuple[Any, dict[str, Any]]]
+    delta: dict[str, Any]
+
+
+def _diff_tasks(
+    *,
+    existing_tasks: Iterable[Any],
+    planner_plan: dict[str, Any],
+    skeletons: dict[str, dict[str, Any]],
+    target_template_version: int,
+    now: datetime,
+) -> TaskDiff:
+    existing_by_key = {task.task_key: task for task in existing_tasks}
+    inserts: list[dict[str, Any]] = []
+    updates: list[tuple[Any, dict[str, Any]]] = []
+
+    added_task_keys: list[str] = []
+    soft_dismissed_task_keys: list[str] = []
+    reactivated_task_keys: list[str] = []
+    updated_task_keys: list[str] = []
+    status_changes: list[dict[str, str]] = []
+    deadline_changes: list[dict[str, str | None]] = []
+
+    sort_index = 0
+    for item in planner_plan["tasks"]:
+        task_key = item["id"]
+        new_due_date = _read_due_date(item.get("deadline"))
+        new_metadata = _build_task_metadata(
+            item=item, skeleton=skeletons.get(task_key, _EMPTY_SKELETON)
+        )
+        new_title = item["title"]
+        existing = existing_by_key.pop(task_key, None)
+
+        if existing is None:
+            inserts.append(
+                {
+                    "task_key": task_key,
+                    "title": new_title,
+                    "description": None,
+                    "status": TaskStatus.todo.value,
+                    "due_date": new_due_date,
+                    "metadata_json": new_metadata,
+                    "task_kind": derive_task_kind(new_metadata),
+                    "task_template_version": target_template_version,
+                    "sort_key": sort_index,
+                }
+            )
+            added_task_keys.append(task_key)
+            sort_index += 1
+            continue
+
+        changes: dict[str, Any] = {}
+        changed = False
+        old_status = existing.status
+        old_due_date = existing.due_date
+        old_metadata = (
+            existing.metadata_json if isinstance(existing.metadata_json, dict) else {}
+        )
+
+        status = _next_status(old_status=old_status, eligible=True)
+        if status != old_status:
+            changes["status"] = status
+            changed = True
+            status_changes.append(
+                {
+                    "task_key": task_key,
+                    "from": old_status,
+                    "to": status,
+                }
+            )
+            if (
+                old_status == TaskStatus.skipped.value
+                and status == TaskStatus.todo.value
+            ):
+                reactivated_task_keys.append(task_key)
+            if status != TaskStatus.done.value:
+                changes["completed_at"] = None
+
+        if status != TaskStatus.done.value:
+            if existing.title != new_title:
+                changes["title"] = new_title
+                changed = True
+            if old_metadata != new_metadata:
+                changes["metadata_json"] = new_metadata
+                changes["task_kind"] = derive_task_kind(new_metadata)
+                changed = True
+            if existing.task_template_version != target_template_version:
+                changes["task_template_version"] = target_template_version
+                changed = True
+
+        if existing.sort_key != sort_index:
+            changes["sort_key"] = sort_index
+        sort_index += 1
+
+        if old_due_date != new_due_date and status in OPEN_TASK_STATUSES:
+            changes["due_date"] = new_due_date
+            changed = True
+            deadline_changes.append(
+                {
+                    "task_key": task_key,
+                    "from": _date_to_iso(old_due_date),
+                    "to": _date_to_iso(new_due_date),
+                }
+            )
+
+        if changed:
+            changes["updated_at"] = now
+            updated_task_keys.append(task_key)
+        if changes:
+            updates.append((existing, changes))
+
+    for task_key, existing in existing_by_key.items():
+        changes = {}
+        old_status = existing.status
+        status = _next_status(old_status=old_status, eligible=False)
+        if status != old_status:
+            changes["status"] = status
+            changes["updated_at"] = now
+            status_changes.append(
+                {
+                    "task_key": task_key,
+                    "from": old_status,
+                    "to": status,
+                }
+            )
+            if (
+                status == TaskStatus.skipped.value
+                and old_status != TaskStatus.skipped.value
+            ):
+                soft_dismissed_task_keys.append(task_key)
+
+        if existing.sort_key != sort_index:
+            changes["sort_key"] = sort_index
+        sort_index += 1
+
+        updated_task_keys.append(task_key)
+        if changes:
+            updates.append((existing, changes))
+
+    return TaskDiff(
+        inserts=inserts,
+        updates=updates,
+        delta={
+            "added_task_keys": sorted(set(added_task_keys)),
+            "soft_dismissed_task_keys": sorted(set(soft_dismissed_task_keys)),
+            "reactivated_task_keys": sorted(set(reactivated_task_keys)),
+            "updated_task_keys": sorted(set(updated_task_keys)),
+            "status_changes": status_changes,
+            "deadline_changes": deadline_changes,
+        },
+    )
+
+
 def _read_template_version(template: dict[str, Any]) -> int:
     value = template.get("version")
     if isinstance(value, int):
@@ -745,6 +1243,58 @@ def _facts_diff(before: dict[str, Any], after: dict[str, Any]) -> list[dict[str,
     return changes
 
 
+def _read_pending_recompute(snapshot: Any) -> dict[str, Any] | None:
+    if not isinstance(snapshot, dict):
+        return None
+    pending = snapshot.get(_RECOMPUTE_PENDING)
+    if not isinstance(pending, dict):
+        return None
+    try:
+        requested_at = datetime.fromisoformat(pending["requested_at"])
+        scheduled_at = datetime.fromisoformat(pending["scheduled_at"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    base_facts = pending.get("base_facts")
+    return {
+        "requested_at": requested_at,
+        "scheduled_at": scheduled_at,
+        "base_facts": dict(base_facts) if isinstance(base_facts, dict) else {},
+    }
+
+
+def _with_pending_recompute(
+    snapshot: Any,
+    *,
+    base_facts: dict[str, Any],
+    requested_at: datetime,
+    scheduled_at: datetime,
+) -> dict[str, Any]:
+    updated = dict(snapshot) if isinstance(snapshot, dict) else {}
+    updated[_RECOMPUTE_PENDING] = {
+        "requested_at": requested_at.isoformat(),
+        "scheduled_at": scheduled_at.isoformat(),
+        "base_facts": base_facts,
+    }
+    return updated
+
+
+def is_recompute_pending(snapshot: Any) -> bool:
+    return _read_pending_recompute(snapshot) is not None
+
+
+def _read_planner_task_ids(planner_plan: Any) -> list[str] | None:
+    if not isinstance(planner_plan, dict) or not isinstance(
+        planner_plan.get("tasks"), list
+    ):
+        return None
+    task_ids: list[str] = []
+    for item in planner_plan["tasks"]:
+        if not isinstance(item, dict) or not isinstance(item.get("id"), str):
+            return None
+        task_ids.append(item["id"])
+    return task_ids
+
+
 def _hash_facts(facts: dict[str, Any]) -> str:
     serialized = json.dumps(
         facts, sort_keys=True, separators=(",", ":"), ensure_ascii=True
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
 import logging
-from dataclasses import dataclass
-from datetime import datetime, timedelta
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import asdict, dataclass, fields
+from datetime import UTC, date, datetime, timedelta
+from itertools import groupby
+from typing import Any
+from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import ColumnElement, and_, case, func, select, true, update
 from sqlalchemy.orm import Session
 
 from app.db.models import NotificationProfile, Task, TaskStatus
@@ -15,6 +19,9 @@ from app.services.notification_profile_service import NotificationProfileService
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_SCAN_CHUNK_SIZE = 500
+_UUID_SPACE = 1 << 128
+
 
 @dataclass(frozen=True)
 class ScanSummary:
@@ -25,136 +32,274 @@ class ScanSummary:
     skipped_daily_cap: int
     errors: int
 
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+    @classmethod
+    def combine(cls, summaries: Iterable[ScanSummary]) -> ScanSummary:
+        totals = dict.fromkeys(_SUMMARY_FIELDS, 0)
+        for summary in summaries:
+            for name in _SUMMARY_FIELDS:
+                totals[name] += getattr(summary, name)
+        return cls(**totals)
+
+
+_SUMMARY_FIELDS = tuple(item.name for item in fields(ScanSummary))
+
+
+def profile_shard_bounds(
+    shard_index: int, shard_count: int
+) -> tuple[UUID | None, UUID | None]:
+    """Inclusive lower / exclusive upper profile id of a shard.
+
+    The UUID space is split into ``shard_count`` equal ranges; ``None``
+    means unbounded. Random (v4) profile ids spread evenly across shards.
+    """
+    if shard_count < 1 or not 0 <= shard_index < shard_count:
+        raise ValueError(f"invalid shard {shard_index}/{shard_count}")
+    lower = (_UUID_SPACE * shard_index) // shard_count
+    upper = (_UUID_SPACE * (shard_index + 1)) // shard_count
+    return (
+        UUID(int=lower) if shard_index > 0 else None,
+        UUID(int=upper) if shard_index < shard_count - 1 else None,
+    )
+
 
 class ReminderScannerService:
-    def __init__(self) -> None:
+    """Set-based due-soon scan.
+
+    Sendable profiles are paged by id together with their sent-today count
+    (aggregate subquery). For each page, one query joins the profiles that
+    are under their daily cap to their due-soon tasks and is streamed with
+    ``yield_per``. Outbox rows are inserted in bulk with
+    ``ON CONFLICT (dedupe_key_raw) DO NOTHING`` and each page is committed
+    on its own, so a failing page only affects its own profiles.
+    """
+
+    def __init__(self, *, chunk_size: int = DEFAULT_SCAN_CHUNK_SIZE) -> None:
         self.profile_service = NotificationProfileService()
         self.outbox_service = NotificationOutboxService()
+        self.chunk_size = max(1, chunk_size)
 
     def scan_due_soon(
-        self, session: Session, *, now: datetime, app_base_url: str
+        self,
+        session: Session,
+        *,
+        now: datetime,
+        app_base_url: str,
+        shard_index: int = 0,
+        shard_count: int = 1,
     ) -> ScanSummary:
         local_today = now.astimezone(BERLIN_TZ).date()
         local_end = local_today + timedelta(days=3)
+        sendable = self.profile_service.sendable_clause()
+        in_shard = _shard_clause(shard_index, shard_count)
 
-        profiles = list(session.scalars(select(NotificationProfile)).all())
+        profiles_scanned, skipped_not_sendable = session.execute(
+            select(
+                func.count(NotificationProfile.id),
+                func.coalesce(func.sum(case((sendable, 0), else_=1)), 0),
+            ).where(in_shard)
+        ).one()
 
-        profiles_scanned = 0
         tasks_matched = 0
         outbox_created = 0
-        skipped_not_sendable = 0
         skipped_daily_cap = 0
         errors = 0
 
-        for profile in profiles:
-            profiles_scanned += 1
+        for page in self._sendable_pages(session, now=now, in_shard=in_shard):
+            eligible_ids = [row.id for row in page if not row.capped]
+            skipped_daily_cap += len(page) - len(eligible_ids)
+            if not eligible_ids:
+                continue
             try:
-                if not self.profile_service.is_sendable(profile):
-                    skipped_not_sendable += 1
-                    continue
-
-                sent_today = self.outbox_service.count_sent_today(
+                matched, created = self._scan_page(
                     session,
-                    profile_id=profile.id,
+                    profile_ids=eligible_ids,
+                    local_today=local_today,
+                    local_end=local_end,
                     now=now,
+                    app_base_url=app_base_url,
                 )
-                if sent_today >= profile.max_reminders_per_day:
-                    skipped_daily_cap += 1
-                    continue
-
-                tasks = list(
-                    session.scalars(
-                        select(Task)
-                        .where(Task.plan_id == profile.plan_id)
-                        .where(Task.status == TaskStatus.todo.value)
-                        .where(Task.due_date.is_not(None))
-                        .where(Task.due_date >= local_today)
-                        .where(Task.due_date <= local_end)
-                        .order_by(Task.due_date.asc(), Task.sort_key.asc())
-                    ).all()
+                session.commit()
+                tasks_matched += matched
+                outbox_created += created
+            except Exception:
+                session.rollback()
+                errors += len(eligible_ids)
+                logger.exception(
+                    "reminder_scan_page_failed",
+                    extra={
+                        "first_profile_id": str(eligible_ids[0]),
+                        "last_profile_id": str(eligible_ids[-1]),
+                    },
                 )
 
-                if not tasks:
-                    continue
+        return ScanSummary(
+            profiles_scanned=int(profiles_scanned),
+            tasks_matched=tasks_matched,
+            outbox_created=outbox_created,
+            skipped_not_sendable=int(skipped_not_sendable),
+            skipped_daily_cap=skipped_daily_cap,
+            errors=errors,
+        )
 
-                tasks_matched += len(tasks)
+    def _sendable_pages(
+        self, session: Session, *, now: datetime, in_shard: ColumnElement[bool]
+    ) -> Iterator[Sequence[Any]]:
+        sent_today = self.outbox_service.sent_today_counts(now=now)
+        capped = (
+            func.coalesce(sent_today.c.sent_count, 0)
+            >= NotificationProfile.max_reminders_per_day
+        )
+        query = (
+            select(NotificationProfile.id, capped.label("capped"))
+            .outerjoin(sent_today, sent_today.c.profile_id == NotificationProfile.id)
+            .where(self.profile_service.sendable_clause(), in_shard)
+            .order_by(NotificationProfile.id)
+            .limit(self.chunk_size)
+        )
 
-                unsubscribe_token = self.profile_service.issue_unsubscribe_token(
-                    session,
-                    profile=profile,
-                )
-                dedupe_key = build_due_soon_dedupe_key_raw(
-                    profile_id=profile.id,
-                    local_day=local_today,
+        cursor: UUID | None = None
+        while True:
+            page_query = (
+                query
+                if cursor is None
+                else query.where(NotificationProfile.id > cursor)
+            )
+            page = session.execute(page_query).all()
+            if not page:
+                return
+            yield page
+            if len(page) < self.chunk_size:
+                return
+            cursor = page[-1].id
+
+    def _scan_page(
+        self,
+        session: Session,
+        *,
+        profile_ids: list[UUID],
+        local_today: date,
+        local_end: date,
+        now: datetime,
+        app_base_url: str,
+    ) -> tuple[int, int]:
+        rows = session.execute(
+            select(
+                NotificationProfile.id.label("profile_id"),
+                NotificationProfile.plan_id,
+                NotificationProfile.email,
+                NotificationProfile.locale,
+                NotificationProfile.timezone,
+                NotificationProfile.unsubscribe_token_version,
+                NotificationProfile.unsubscribe_token_hash,
+                Task.id.label("task_id"),
+                Task.task_key,
+                Task.title,
+                Task.due_date,
+                Task.metadata_json,
+            )
+            .join(Task, Task.plan_id == NotificationProfile.plan_id)
+            .where(NotificationProfile.id.in_(profile_ids))
+            .where(Task.status == TaskStatus.todo.value)
+            .where(Task.due_date.is_not(None))
+            .where(Task.due_date >= local_today)
+            .where(Task.due_date <= local_end)
+            .order_by(NotificationProfile.id, Task.due_date.asc(), Task.sort_key.asc())
+            .execution_options(yield_per=self.chunk_size)
+        )
+
+        tasks_matched = 0
+        outbox_items: list[dict[str, Any]] = []
+        token_updates: list[dict[str, Any]] = []
+        for profile_id, group in groupby(rows, key=lambda row: row.profile_id):
+            tasks = list(group)
+            tasks_matched += len(tasks)
+            profile = tasks[0]
+
+            token, token_hash = self.profile_service.unsubscribe_token_for(
+                profile_id, profile.unsubscribe_token_version
+            )
+            if profile.unsubscribe_token_hash != token_hash:
+                token_updates.append(
+                    {
+                        "id": profile_id,
+                        "unsubscribe_token_hash": token_hash,
+                        "updated_at": datetime.now(UTC),
+                    }
                 )
 
-                payload_tasks = []
-                for task in tasks:
-                    if task.due_date is None:
-                        continue
-                    payload_tasks.append(
-                        {
-                            "task_key": task.task_key,
-                            "task_instance_id": str(task.id),
-                            "title": task.title,
-                            "due_date": task.due_date.isoformat(),
-                            "due_in_days": (task.due_date - local_today).days,
-                            "category": (
-                                task.metadata_json.get("category")
-                                if isinstance(task.metadata_json, dict)
-                                else None
-                            ),
-                            "priority": (
-                                task.metadata_json.get("priority")
-                                if isinstance(task.metadata_json, dict)
-                                else None
-                            ),
-                        }
-                    )
-
-                if not payload_tasks:
-                    continue
-
-                payload = {
-                    "profile_id": str(profile.id),
-                    "plan_id": str(profile.plan_id),
-                    "to_email": profile.email,
-                    "locale": profile.locale,
-                    "timezone": profile.timezone,
-                    "tasks": payload_tasks,
-                    "user_display_name": None,
-                    "plan_url": f"{app_base_url}/app/plan/{profile.plan_id}",
-                    "settings_url": (
-                        f"{app_base_url}/notifications/unsubscribe?token={unsubscribe_token}"
+            outbox_items.append(
+                {
+                    "profile_id": profile_id,
+                    "dedupe_key_raw": build_due_soon_dedupe_key_raw(
+                        profile_id=profile_id,
+                        local_day=local_today,
                     ),
-                    "unsubscribe_url": (
-                        f"{app_base_url}/notifications/unsubscribe?token={unsubscribe_token}"
+                    "payload": _build_payload(
+                        profile=profile,
+                        tasks=tasks,
+                        local_today=local_today,
+                        unsubscribe_token=token,
+                        app_base_url=app_base_url,
                     ),
                 }
+            )
 
-                _, created = self.outbox_service.enqueue_due_soon(
-                    session,
-                    profile_id=profile.id,
-                    dedupe_key_raw=dedupe_key,
-                    payload=payload,
-                    now=now,
-                )
-                if created:
-                    session.commit()
-                    outbox_created += 1
-            except Exception:
-                session.rollback()
-                errors += 1
-                logger.exception(
-                    "reminder_scan_profile_failed",
-                    extra={"profile_id": str(profile.id)},
-                )
+        if token_updates:
+            session.execute(update(NotificationProfile), token_updates)
+        created = self.outbox_service.enqueue_due_soon_many(
+            session, items=outbox_items, now=now
+        )
+        return tasks_matched, created
 
-        return ScanSummary(
-            profiles_scanned=profiles_scanned,
-            tasks_matched=tasks_matched,
-            outbox_created=outbox_created,
-            skipped_not_sendable=skipped_not_sendable,
-            skipped_daily_cap=skipped_daily_cap,
-            errors=errors,
+
+def _shard_clause(shard_index: int, shard_count: int) -> ColumnElement[bool]:
+    lower, upper = profile_shard_bounds(shard_index, shard_count)
+    clauses = []
+    if lower is not None:
+        clauses.append(NotificationProfile.id >= lower)
+    if upper is not None:
+        clauses.append(NotificationProfile.id < upper)
+    return and_(true(), *clauses)
+
+
+def _build_payload(
+    *,
+    profile: Any,
+    tasks: list[Any],
+    local_today: date,
+    unsubscribe_token: str,
+    app_base_url: str,
+) -> dict[str, Any]:
+    payload_tasks = []
+    for task in tasks:
+        metadata = task.metadata_json if isinstance(task.metadata_json, dict) else {}
+        payload_tasks.append(
+            {
+                "task_key": task.task_key,
+                "task_instance_id": str(task.task_id),
+                "title": task.title,
+                "due_date": task.due_date.isoformat(),
+                "due_in_days": (task.due_date - local_today).days,
+                "category": metadata.get("category"),
+                "priority": metadata.get("priority"),
+            }
         )
+
+    unsubscribe_url = (
+        f"{app_base_url}/notifications/unsubscribe?token={unsubscribe_token}"
+    )
+    return {
+        "profile_id": str(profile.profile_id),
+        "plan_id": str(profile.plan_id),
+        "to_email": profile.email,
+        "locale": profile.locale,
+        "timezone": profile.timezone,
+        "tasks": payload_tasks,
+        "user_display_name": None,
+        "plan_url": f"{app_base_url}/app/plan/{profile.plan_id}",
+        "settings_url": unsubscribe_url,
+        "unsubscribe_url": unsubscribe_url,
+    }
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import zlib
+from collections.abc import Iterable
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.db.dialect import dialect_insert
+from app.db.models import PlanBody
+
+PLAN_BODY_ENCODING = "zlib+json"
+_COMPRESSION_LEVEL = 6
+_DECODED_CACHE_SIZE = 1024
+
+
+def split_plan_body(
+    planner_plan: dict[str, Any],
+) -> tuple[dict[str, Any], date] | None:
+    """Split a planner plan into a date-free body and its event date.
+
+    Deadlines become day offsets from the event date, so plans that differ
+    only in their event date share one body. Returns ``None`` for plans that
+    cannot be normalized; those are stored inline.
+    """
+    try:
+        event_date = date.fromisoformat(planner_plan["event_date"])
+        tasks = [_task_to_body(item, event_date) for item in planner_plan["tasks"]]
+    except (KeyError, TypeError, ValueError, AttributeError):
+        return None
+    return {**planner_plan, "event_date": None, "tasks": tasks}, event_date
+
+
+def join_plan_body(body: dict[str, Any], event_date: date) -> dict[str, Any]:
+    tasks = [_task_from_body(item, event_date) for item in body["tasks"]]
+    return {**body, "event_date": event_date.isoformat(), "tasks": tasks}
+
+
+def _task_to_body(item: dict[str, Any], event_date: date) -> dict[str, Any]:
+    offset = (date.fromisoformat(item["deadline"]) - event_date).days
+    return {
+        ("deadline_offset_days" if key == "deadline" else key): (
+            offset if key == "deadline" else value
+        )
+        for key, value in item.items()
+    }
+
+
+def _task_from_body(item: dict[str, Any], event_date: date) -> dict[str, Any]:
+    return {
+        ("deadline" if key == "deadline_offset_days" else key): (
+            (event_date + timedelta(days=value)).isoformat()
+            if key == "deadline_offset_days"
+            else value
+        )
+        for key, value in item.items()
+    }
+
+
+def encode_plan_body(body: dict[str, Any]) -> tuple[str, bytes]:
+    """Return the content hash and compressed payload of a plan body."""
+    serialized = json.dumps(
+        body, sort_keys=True, separators=(",", ":"), ensure_ascii=True
+    ).encode("utf-8")
+    return (
+        hashlib.sha256(serialized).hexdigest(),
+        zlib.compress(serialized, _COMPRESSION_LEVEL),
+    )
+
+
+def decode_plan_body(payload: bytes) -> dict[str, Any]:
+    return json.loads(_decompress(bytes(payload)))
+
+
+@lru_cache(maxsize=_DECODED_CACHE_SIZE)
+def _decompress(payload: bytes) -> str:
+    return zlib.decompress(payload).decode("utf-8")
+
+
+class PlanBodyStore:
+    """Content-addressed store for normalized, compressed plan bodies."""
+
+    def prepare(
+        self, planner_plan: dict[str, Any]
+    ) -> tuple[dict[str, Any], dict[str, Any] | None]:
+        """Map a planner plan to plan_snapshots columns and a plan_bodies row.
+
+        The body row is ``None`` when the plan is kept inline.
+        """
+        split = split_plan_body(planner_plan)
+        if split is None:
+            return {
+                "planner_plan": planner_plan,
+                "body_hash": None,
+                "event_date": None,
+            }, None
+        body, event_date = split
+        body_hash, payload = encode_plan_body(body)
+        return {
+            "planner_plan": None,
+            "body_hash": body_hash,
+            "event_date": event_date,
+        }, {
+            "body_hash": body_hash,
+            "encoding": PLAN_BODY_ENCODING,
+            "payload": payload,
+        }
+
+    def save(self, session: Session, rows: Iterable[dict[str, Any]]) -> None:
+        unique = list({row["body_hash"]: row for row in rows}.values())
+        if not unique:
+            return
+        insert = dialect_insert(session)
+        session.execute(
+            insert(PlanBody.__table__).on_conflict_do_nothing(
+                index_elements=["body_hash"]
+            ),
+            unique,
+        )
+
+    def load(
+        self, session: Session, body_hash: str, event_date: date
+    ) -> dict[str, Any] | None:
+        payload = session.scalar(
+            select(PlanBody.payload).where(PlanBody.body_hash == body_hash)
+        )
+        if payload is None:
+            return None
+        return join_plan_body(decode_plan_body(payload), event_date)
@@ -1,18 +1,41 @@
 from __future__ import annotations
 
 import json
-from datetime import UTC, datetime
+from collections.abc import Sequence
+from datetime import UTC, date, datetime
 from typing import Any
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import Row, and_, func, or_, select
 from sqlalchemy.orm import Session
 
-from app.db.models import Task, TaskStatus
+from app.db.models import Plan, Task, TaskStatus
+from app.db.session import replica_read
 from app.services.errors import ApiError
 
+TASK_KIND_NORMAL = "normal"
+TASK_KIND_DECISION = "decision"
+
+# Response field name -> column, in response order.
+TASK_FIELDS = {
+    "id": Task.id,
+    "plan_id": Task.plan_id,
+    "task_key": Task.task_key,
+    "title": Task.title,
+    "description": Task.description,
+    "task_kind": Task.task_kind,
+    "status": Task.status,
+    "due_date": Task.due_date,
+    "metadata": Task.metadata_json,
+    "sort_key": Task.sort_key,
+    "completed_at": Task.completed_at,
+    "created_at": Task.created_at,
+    "updated_at": Task.updated_at,
+}
+
 
 class TaskService:
+    @replica_read
     def list_tasks(
         self,
         session: Session,
@@ -26,6 +49,84 @@ class TaskService:
         stmt = stmt.order_by(Task.sort_key.asc())
         return list(session.scalars(stmt).all())
 
+    @replica_read
+    def list_task_page(
+        self,
+        session: Session,
+        *,
+        plan_id: UUID,
+        fields: Sequence[str],
+        status: TaskStatus | None = None,
+        due_before: date | None = None,
+        due_after: date | None = None,
+        after: tuple[int, UUID] | None = None,
+        limit: int | None = None,
+        with_validator: bool = False,
+    ) -> tuple[list[Row[Any]], tuple[int, UUID] | None]:
+        """Task rows with only the requested ``TASK_FIELDS`` columns.
+
+        Rows are ordered by ``(sort_key, id)``; ``after`` continues behind a
+        previous page. Returns the rows and the position to pass as ``after``
+        for the next page, or ``None`` on the last page. ``due_before`` and
+        ``due_after`` are exclusive and skip tasks without a due date.
+        ``with_validator`` adds the ``get_tasks_validator`` columns to every
+        row, so the list and its ETag come from one statement.
+        """
+        columns = [TASK_FIELDS[name].label(name) for name in fields]
+        if with_validator:
+            columns.extend(_tasks_validator_columns(plan_id, status))
+        stmt = select(
+            *columns,
+            Task.sort_key.label("_sort_key"),
+            Task.id.label("_id"),
+        ).where(Task.plan_id == plan_id)
+        if status is not None:
+            stmt = stmt.where(Task.status == status.value)
+        if due_before is not None:
+            stmt = stmt.where(Task.due_date < due_before)
+        if due_after is not None:
+            stmt = stmt.where(Task.due_date > due_after)
+        if after is not None:
+            after_sort_key, after_id = after
+            stmt = stmt.where(
+                or_(
+                    Task.sort_key > after_sort_key,
+                    and_(Task.sort_key == after_sort_key, Task.id > after_id),
+                )
+            )
+        stmt = stmt.order_by(Task.sort_key.asc(), Task.id.asc())
+        if limit is not None:
+            stmt = stmt.limit(limit + 1)
+
+        rows = list(session.execute(stmt).all())
+        if limit is None or len(rows) <= limit:
+            return rows, None
+        rows = rows[:limit]
+        return rows, (rows[-1]._sort_key, rows[-1]._id)
+
+    @replica_read
+    def get_tasks_validator(
+        self,
+        session: Session,
+        *,
+        plan_id: UUID,
+        status: TaskStatus | None,
+    ) -> Row[Any]:
+        """Plan ``updated_at``, task count and newest task ``updated_at``.
+
+        Recomputes bump the plan timestamp, which also covers reordering;
+        status patches bump the task's own timestamp. Raises
+        ``PLAN_NOT_FOUND`` for unknown plans.
+        """
+        row = session.execute(select(*_tasks_validator_columns(plan_id, status))).one()
+        if row.plan_updated_at is None:
+            raise ApiError(
+                status_code=404,
+                code="PLAN_NOT_FOUND",
+                message=f"Plan '{plan_id}' not found",
+            )
+        return row
+
     def update_status(
         self,
         session: Session,
@@ -113,14 +214,7 @@ class TaskService:
         return block_type
 
     def _is_decision_task(self, task: Task) -> bool:
-        metadata = self._read_metadata(task.metadata_json)
-        tags = metadata.get("tags", [])
-        has_decision_tag = isinstance(tags, list) and any(
-            isinstance(tag, str) and tag == "decision" for tag in tags
-        )
-        ui_actions = metadata.get("ui_actions", [])
-        has_ui_actions = isinstance(ui_actions, list) and len(ui_actions) > 0
-        return has_decision_tag or has_ui_actions
+        return task.task_kind == TASK_KIND_DECISION
 
     def _read_metadata(self, metadata: Any) -> dict[str, Any]:
         if isinstance(metadata, dict):
@@ -132,3 +226,38 @@ class TaskService:
                 return {}
             return parsed if isinstance(parsed, dict) else {}
         return {}
+
+
+def derive_task_kind(metadata: Any) -> str:
+    """``decision`` for tasks tagged ``decision`` or offering UI actions."""
+    if not isinstance(metadata, dict):
+        return TASK_KIND_NORMAL
+    tags = metadata.get("tags", [])
+    has_decision_tag = isinstance(tags, list) and any(
+        isinstance(tag, str) and tag == "decision" for tag in tags
+    )
+    ui_actions = metadata.get("ui_actions", [])
+    has_ui_actions = isinstance(ui_actions, list) and len(ui_actions) > 0
+    if has_decision_tag or has_ui_actions:
+        return TASK_KIND_DECISION
+    return TASK_KIND_NORMAL
+
+
+def _tasks_validator_columns(plan_id: UUID, status: TaskStatus | None) -> list[Any]:
+    task_filter = Task.plan_id == plan_id
+    if status is not None:
+        task_filter = and_(task_filter, Task.status == status.value)
+    return [
+        select(Plan.updated_at)
+        .where(Plan.id == plan_id)
+        .scalar_subquery()
+        .label("plan_updated_at"),
+        select(func.count(Task.id))
+        .where(task_filter)
+        .scalar_subquery()
+        .label("task_count"),
+        select(func.max(Task.updated_at))
+        .where(task_filter)
+        .scalar_subquery()
+        .label("tasks_updated_at"),
+    ]
@@ -1,24 +1,127 @@
 from __future__ import annotations
 
+import os
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
 from datetime import UTC, datetime
 from typing import Any
 
-from sqlalchemy import func, select
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 
-from app.db.models import TemplateVersion
+from app.db.models import TemplateCatalogRevision, TemplateVersion
+from app.db.session import replica_read
 from app.services.errors import ApiError
 from app.services.template_repository import TemplateRepository
 
 STATUS_DRAFT = "draft"
 STATUS_PUBLISHED = "published"
 STATUS_DEPRECATED = "deprecated"
+_CATALOG_REVISION_ID = 1
+_DEFAULT_CATALOG_TTL_SECONDS = 30.0
+
+
+@dataclass(frozen=True)
+class CatalogEntry:
+    template_id: str
+    version: int
+    status: str
+    template_key: str
+    compiled_hash: str | None
+    published_at: datetime | None
+    deprecated_at: datetime | None
+
+    @property
+    def is_published(self) -> bool:
+        return self.status == STATUS_PUBLISHED and self.deprecated_at is None
+
+
+@dataclass(frozen=True)
+class _CatalogSnapshot:
+    revision: int
+    by_key: dict[str, CatalogEntry]
+    latest_published: dict[str, CatalogEntry]
+    template_ids: frozenset[str]
+
+
+@dataclass
+class _CatalogState:
+    snapshot: _CatalogSnapshot
+    checked_at: float
+
+
+class TemplateVersionCatalogCache:
+    """Process-wide snapshot of ``template_versions``, one per database.
+
+    Within ``ttl_seconds`` of the last check the snapshot is served without
+    touching the database. After that only the shared revision counter is
+    read; rows are reloaded when another process bumped it. Local writes
+    call ``invalidate``.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = _DEFAULT_CATALOG_TTL_SECONDS,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.loads = 0
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._states: dict[str, _CatalogState] = {}
+
+    def snapshot(self, session: Session) -> _CatalogSnapshot:
+        key = str(session.get_bind().url)
+        now = self._clock()
+        with self._lock:
+            state = self._states.get(key)
+        if state is not None and now - state.checked_at < self.ttl_seconds:
+            return state.snapshot
+
+        # Read the revision before the rows: a concurrent publish can then
+        # only make the rows newer than the revision, never older.
+        revision = _read_catalog_revision(session)
+        if state is not None and state.snapshot.revision == revision:
+            snapshot = state.snapshot
+        else:
+            snapshot = _load_catalog_snapshot(session, revision)
+            self.loads += 1
+        with self._lock:
+            self._states[key] = _CatalogState(snapshot=snapshot, checked_at=now)
+        return snapshot
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._states.clear()
+
+
+_CATALOG_CACHE = TemplateVersionCatalogCache(
+    ttl_seconds=float(
+        os.getenv(
+            "TEMPLATE_CATALOG_CACHE_TTL_SECONDS", str(_DEFAULT_CATALOG_TTL_SECONDS)
+        )
+    )
+)
+
+
+def get_catalog_cache() -> TemplateVersionCatalogCache:
+    return _CATALOG_CACHE
 
 
 class TemplateCatalogService:
-    def __init__(self, template_repository: TemplateRepository | None = None) -> None:
+    def __init__(
+        self,
+        template_repository: TemplateRepository | None = None,
+        *,
+        catalog_cache: TemplateVersionCatalogCache | None = None,
+    ) -> None:
         self.template_repository = template_repository or TemplateRepository()
+        self.catalog_cache = catalog_cache or _CATALOG_CACHE
 
+    @replica_read
     def list_templates(self, session: Session) -> list[dict[str, Any]]:
         rows = list(
             session.scalars(
@@ -76,8 +179,11 @@ class TemplateCatalogService:
             )
             changed = True
         if changed:
+            bump_catalog_revision(session)
             session.commit()
+            self.catalog_cache.invalidate()
 
+    @replica_read
     def list_versions(self, session: Session, template_id: str) -> list[dict[str, Any]]:
         rows = self._list_rows_for_template(session, template_id)
         if not rows:
@@ -153,32 +259,21 @@ class TemplateCatalogService:
         row.compiled_hash = self.template_repository.compiled_hash(template_id, version)
         row.updated_at = now
         session.add(row)
+        bump_catalog_revision(session)
         session.commit()
+        self.catalog_cache.invalidate()
         session.refresh(row)
         return row
 
     def resolve_latest_published(
         self, session: Session, *, template_id: str
-    ) -> TemplateVersion:
-        latest = session.scalar(
-            select(TemplateVersion)
-            .where(
-                TemplateVersion.template_id == template_id,
-                TemplateVersion.status == STATUS_PUBLISHED,
-                TemplateVersion.deprecated_at.is_(None),
-            )
-            .order_by(TemplateVersion.version.desc())
-            .limit(1)
-        )
+    ) -> CatalogEntry:
+        catalog = self.catalog_cache.snapshot(session)
+        latest = catalog.latest_published.get(template_id)
         if latest is not None:
             return latest
 
-        exists = session.scalar(
-            select(func.count())
-            .select_from(TemplateVersion)
-            .where(TemplateVersion.template_id == template_id)
-        )
-        if int(exists or 0) == 0:
+        if template_id not in catalog.template_ids:
             raise ApiError(
                 status_code=404,
                 code="TEMPLATE_NOT_FOUND",
@@ -193,17 +288,15 @@ class TemplateCatalogService:
 
     def resolve_published_by_key(
         self, session: Session, *, template_key: str
-    ) -> TemplateVersion:
-        row = session.scalar(
-            select(TemplateVersion).where(TemplateVersion.template_key == template_key)
-        )
+    ) -> CatalogEntry:
+        row = self.find_by_key(session, template_key=template_key)
         if row is None:
             raise ApiError(
                 status_code=404,
                 code="TEMPLATE_NOT_FOUND",
                 message=f"Template '{template_key}' not found",
             )
-        if row.status != STATUS_PUBLISHED or row.deprecated_at is not None:
+        if not row.is_published:
             raise ApiError(
                 status_code=409,
                 code="NO_PUBLISHED_TEMPLATE",
@@ -211,20 +304,16 @@ class TemplateCatalogService:
             )
         return row
 
+    def find_by_key(
+        self, session: Session, *, template_key: str
+    ) -> CatalogEntry | None:
+        return self.catalog_cache.snapshot(session).by_key.get(template_key)
+
     def get_latest_published_version(
         self, session: Session, *, template_id: str
     ) -> int | None:
-        row = session.scalar(
-            select(TemplateVersion.version)
-            .where(
-                TemplateVersion.template_id == template_id,
-                TemplateVersion.status == STATUS_PUBLISHED,
-                TemplateVersion.deprecated_at.is_(None),
-            )
-            .order_by(TemplateVersion.version.desc())
-            .limit(1)
-        )
-        return int(row) if isinstance(row, int) else None
+        latest = self.catalog_cache.snapshot(session).latest_published.get(template_id)
+        return latest.version if latest is not None else None
 
     def _list_rows_for_template(
         self,
@@ -249,3 +338,51 @@ def _latest_published_version(rows: list[TemplateVersion]) -> int | None:
     if not published_versions:
         return None
     return max(published_versions)
+
+
+def bump_catalog_revision(session: Session) -> None:
+    """Advance the shared catalog revision inside the caller's transaction."""
+    now = datetime.now(UTC)
+    result = session.execute(
+        update(TemplateCatalogRevision)
+        .where(TemplateCatalogRevision.id == _CATALOG_REVISION_ID)
+        .values(revision=TemplateCatalogRevision.revision + 1, updated_at=now)
+    )
+    if result.rowcount == 0:
+        session.add(
+            TemplateCatalogRevision(id=_CATALOG_REVISION_ID, revision=1, updated_at=now)
+        )
+
+
+def _read_catalog_revision(session: Session) -> int:
+    revision = session.scalar(
+        select(TemplateCatalogRevision.revision).where(
+            TemplateCatalogRevision.id == _CATALOG_REVISION_ID
+        )
+    )
+    return int(revision) if revision is not None else 0
+
+
+def _load_catalog_snapshot(session: Session, revision: int) -> _CatalogSnapshot:
+    rows = session.execute(
+        select(
+            TemplateVersion.template_id,
+            TemplateVersion.version,
+            TemplateVersion.status,
+            TemplateVersion.template_key,
+            TemplateVersion.compiled_hash,
+            TemplateVersion.published_at,
+            TemplateVersion.deprecated_at,
+        ).order_by(TemplateVersion.template_id, TemplateVersion.version)
+    ).all()
+    entries = [CatalogEntry(**row._asdict()) for row in rows]
+    latest_published: dict[str, CatalogEntry] = {}
+    for entry in entries:
+        if entry.is_published:
+            latest_published[entry.template_id] = entry
+    return _CatalogSnapshot(
+        revision=revision,
+        by_key={entry.template_key: entry for entry in entries},
+        latest_published=latest_published,
+        template_ids=frozenset(entry.template_id for entry in entries),
+    )
@@ -2,22 +2,161 @@ from __future__ import annotations
 
 import hashlib
 import json
+import os
 import re
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, TypeVar
 
-from app.domain.workflow_validator import WorkflowValidationError
-from app.domain.workflow_validator import validate_graph
+from app.domain.workflow_validator import WorkflowValidationError, validate_graph
+from app.planner.compiled import CompiledWorkflow, compile_workflow
 from app.services.errors import ApiError
 
 _TEMPLATE_KEY_PATTERN = re.compile(r"^[a-zA-Z0-9_\-]+/v[0-9]+$")
+_DEFAULT_CACHE_SIZE = 32
+_PLANNER_PROGRAM = "planner_program"
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class TemplateCacheStats:
+    hits: int
+    misses: int
+    size: int
+    maxsize: int
+
+
+@dataclass
+class _CacheEntry:
+    payload: dict[str, Any]
+    derived: dict[str, Any]
+
+
+class CompiledTemplateCache:
+    """Process-wide LRU of parsed and validated ``compiled.json`` payloads.
+
+    Entries are keyed by ``(template_key, compiled_hash)``. A per-file
+    ``(mtime_ns, size)`` fingerprint lets repeated loads skip reading and
+    hashing the file; any change to either value forces a re-read. Cached
+    payloads are shared between callers and must be treated as read-only.
+
+    Artifacts derived from a cached payload (e.g. the compiled planner
+    program) can be memoized alongside it via ``derive`` and are dropped
+    together with the entry.
+    """
+
+    def __init__(self, maxsize: int = _DEFAULT_CACHE_SIZE) -> None:
+        self.maxsize = max(1, maxsize)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple[str, str], _CacheEntry] = OrderedDict()
+        self._keys_by_payload: dict[int, tuple[str, str]] = {}
+        self._fingerprints: OrderedDict[str, tuple[int, int, str]] = OrderedDict()
+
+    def known_hash(self, path: Path, stat: os.stat_result) -> str | None:
+        with self._lock:
+            fingerprint = self._fingerprints.get(str(path))
+        if fingerprint is None:
+            return None
+        mtime_ns, size, compiled_hash = fingerprint
+        if mtime_ns != stat.st_mtime_ns or size != stat.st_size:
+            return None
+        return compiled_hash
+
+    def remember_hash(
+        self, path: Path, stat: os.stat_result, compiled_hash: str
+    ) -> None:
+        key = str(path)
+        with self._lock:
+            self._fingerprints[key] = (stat.st_mtime_ns, stat.st_size, compiled_hash)
+            self._fingerprints.move_to_end(key)
+            while len(self._fingerprints) > self.maxsize * 4:
+                self._fingerprints.popitem(last=False)
+
+    def get(self, template_key: str, compiled_hash: str) -> dict[str, Any] | None:
+        key = (template_key, compiled_hash)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.payload
+
+    def put(
+        self, template_key: str, compiled_hash: str, payload: dict[str, Any]
+    ) -> None:
+        key = (template_key, compiled_hash)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._keys_by_payload.pop(id(previous.payload), None)
+            self._entries[key] = _CacheEntry(payload=payload, derived={})
+            self._keys_by_payload[id(payload)] = key
+            while len(self._entries) > self.maxsize:
+                _, evicted = self._entries.popitem(last=False)
+                self._keys_by_payload.pop(id(evicted.payload), None)
+
+    def derive(
+        self, payload: dict[str, Any], name: str, factory: Callable[[dict[str, Any]], T]
+    ) -> T:
+        with self._lock:
+            key = self._keys_by_payload.get(id(payload))
+            entry = self._entries.get(key) if key is not None else None
+        if entry is None or entry.payload is not payload:
+            return factory(payload)
+
+        value = entry.derived.get(name)
+        if value is None:
+            value = factory(payload)
+            with self._lock:
+                value = entry.derived.setdefault(name, value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_payload.clear()
+            self._fingerprints.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> TemplateCacheStats:
+        with self._lock:
+            return TemplateCacheStats(
+                hits=self.hits,
+                misses=self.misses,
+                size=len(self._entries),
+                maxsize=self.maxsize,
+            )
+
+
+_TEMPLATE_CACHE = CompiledTemplateCache(
+    maxsize=int(os.getenv("TEMPLATE_CACHE_SIZE", str(_DEFAULT_CACHE_SIZE)))
+)
+
+
+def get_template_cache() -> CompiledTemplateCache:
+    return _TEMPLATE_CACHE
 
 
 class TemplateRepository:
-    def __init__(self, workflows_root: Path | None = None) -> None:
+    def __init__(
+        self,
+        workflows_root: Path | None = None,
+        *,
+        cache: CompiledTemplateCache | None = None,
+    ) -> None:
         if workflows_root is None:
             workflows_root = Path(__file__).resolve().parents[3] / "workflows"
         self.workflows_root = workflows_root
+        self.cache = cache or _TEMPLATE_CACHE
 
     def derive_template_key(self, template_id: str, version: int) -> str:
         return f"{template_id}/v{version}"
@@ -50,33 +189,33 @@ class TemplateRepository:
         *,
         expected_compiled_hash: str | None = None,
     ) -> dict[str, Any]:
-        version_key = f"v{version}"
         template_key = self.derive_template_key(template_id, version)
-        template_path = (
-            self.workflows_root / template_id / version_key / "compiled.json"
-        )
-        if not template_path.exists():
-            raise ApiError(
-                status_code=404,
-                code="TEMPLATE_NOT_FOUND",
-                message=f"Template '{template_key}' not found",
-            )
+        template_path = self._template_path(template_id, version)
+        stat = self._stat_template(template_path, template_key)
 
-        raw = template_path.read_bytes()
-        compiled_hash = hashlib.sha256(raw).hexdigest()
-        if (
-            isinstance(expected_compiled_hash, str)
-            and expected_compiled_hash
-            and compiled_hash != expected_compiled_hash
-        ):
-            raise ApiError(
-                status_code=409,
-                code="TEMPLATE_INTEGRITY_ERROR",
-                message=(
-                    "Template integrity check failed for "
-                    f"'{template_key}': compiled hash mismatch"
-                ),
-            )
+        raw: bytes | None = None
+        compiled_hash = self.cache.known_hash(template_path, stat)
+        if compiled_hash is None:
+            raw = template_path.read_bytes()
+            compiled_hash = hashlib.sha256(raw).hexdigest()
+            self.cache.remember_hash(template_path, stat, compiled_hash)
+
+        _assert_expected_hash(template_key, compiled_hash, expected_compiled_hash)
+
+        cached = self.cache.get(template_key, compiled_hash)
+        if cached is not None:
+            return cached
+
+        if raw is None:
+            raw = template_path.read_bytes()
+            actual_hash = hashlib.sha256(raw).hexdigest()
+            if actual_hash != compiled_hash:
+                # Content changed without touching mtime/size; trust the bytes.
+                compiled_hash = actual_hash
+                self.cache.remember_hash(template_path, stat, compiled_hash)
+                _assert_expected_hash(
+                    template_key, compiled_hash, expected_compiled_hash
+                )
 
         payload = json.loads(raw.decode("utf-8"))
         if not isinstance(payload, dict):
@@ -107,19 +246,60 @@ class TemplateRepository:
                 code="PLANNER_INPUT_INVALID",
                 message=str(exc),
             ) from exc
+
+        self.cache.put(template_key, compiled_hash, payload)
         return payload
 
     def compiled_hash(self, template_id: str, version: int) -> str:
-        version_key = f"v{version}"
-        template_path = (
-            self.workflows_root / template_id / version_key / "compiled.json"
-        )
-        if not template_path.exists():
+        template_key = self.derive_template_key(template_id, version)
+        template_path = self._template_path(template_id, version)
+        stat = self._stat_template(template_path, template_key)
+
+        compiled_hash = self.cache.known_hash(template_path, stat)
+        if compiled_hash is None:
+            compiled_hash = hashlib.sha256(template_path.read_bytes()).hexdigest()
+            self.cache.remember_hash(template_path, stat, compiled_hash)
+        return compiled_hash
+
+    def compiled_program(self, template: dict[str, Any]) -> CompiledWorkflow:
+        return self.cache.derive(template, _PLANNER_PROGRAM, _compile_planner_program)
+
+    def cache_stats(self) -> TemplateCacheStats:
+        return self.cache.stats()
+
+    def _template_path(self, template_id: str, version: int) -> Path:
+        return self.workflows_root / template_id / f"v{version}" / "compiled.json"
+
+    def _stat_template(self, template_path: Path, template_key: str) -> os.stat_result:
+        try:
+            return template_path.stat()
+        except OSError as exc:
             raise ApiError(
                 status_code=404,
                 code="TEMPLATE_NOT_FOUND",
-                message=(
-                    f"Template '{self.derive_template_key(template_id, version)}' not found"
-                ),
-            )
-        return hashlib.sha256(template_path.read_bytes()).hexdigest()
+                message=f"Template '{template_key}' not found",
+            ) from exc
+
+
+def _compile_planner_program(template: dict[str, Any]) -> CompiledWorkflow:
+    program = compile_workflow(template)
+    program.precompute_layouts()
+    return program
+
+
+def _assert_expected_hash(
+    template_key: str, compiled_hash: str, expected_compiled_hash: str | None
+) -> None:
+    if (
+        isinstance(expected_compiled_hash, str)
+        and expected_compiled_hash
+        and compiled_hash != expected_compiled_hash
+    ):
+        raise ApiError(
+            status_code=409,
+            code="TEMPLATE_INTEGRITY_ERROR",
+            message=(
+                "Template integrity check failed for "
+                f"'{template_key}': compiled hash mismatch"
+            ),
+        )
@@ -6,6 +6,7 @@ from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.db.models import TemplateVersion
+from app.services.template_catalog_service import bump_catalog_revision
 from app.services.template_repository import TemplateRepository
 
 
@@ -35,4 +36,5 @@ def seed_published_templates(
         )
         session.add(row)
 
+    bump_catalog_revision(session)
     session.commit()
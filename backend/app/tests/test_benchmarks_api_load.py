@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from app.benchmarks.api_load import (
+    GET_PLAN,
+    REQUEST_TYPES,
+    prepare_database,
+    run_api_load,
+)
+
+
+@pytest.fixture()
+def database(tmp_path: Path) -> None:
+    prepare_database(f"sqlite:///{tmp_path / 'test_api_load.db'}", reset=True)
+
+
+def test_load_run_covers_every_request_type_within_budgets(database) -> None:
+    run = asyncio.run(
+        run_api_load(users=3, requests_per_user=12, profile_rounds=1, seed=3)
+    )
+
+    assert [result.name for result in run.results] == list(REQUEST_TYPES)
+    assert run.errors == 0
+    assert run.budget_violations == []
+    by_name = {result.name: result for result in run.results}
+    assert by_name["create_plan"].requests == 3
+    assert by_name[GET_PLAN].statements_max == 1
+    assert all(result.p99_s >= result.p50_s for result in run.results)
+    assert run.statements_total is not None and run.statements_total > 0
+
+
+def test_exceeded_budget_is_reported(database) -> None:
+    run = asyncio.run(
+        run_api_load(
+            users=1, requests_per_user=2, profile_rounds=1, budgets={GET_PLAN: 0}
+        )
+    )
+
+    assert [result.name for result in run.budget_violations] == [GET_PLAN]
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import httpx
+import pytest
+
+from app.benchmarks.api_load import prepare_database
+from app.benchmarks.fake_brevo import (
+    OUTCOME_ACCEPTED,
+    OUTCOME_TIMEOUT,
+    FakeBrevoBehavior,
+    FakeBrevoServer,
+)
+from app.benchmarks.notifications import run_notification_pipeline
+from app.notifications.brevo_provider import BrevoEmailProvider
+from app.notifications.config import NotificationConfig
+from app.notifications.templates import RenderedEmail
+
+
+def _config(base_url: str) -> NotificationConfig:
+    return NotificationConfig(
+        app_base_url="http://localhost:3000",
+        from_email="noreply@example.com",
+        from_name="Life Event",
+        brevo_api_key="test-key",
+        brevo_base_url=base_url,
+        email_dry_run=False,
+        allowed_recipient_domains=set(),
+    )
+
+
+def test_fake_brevo_maps_to_provider_results() -> None:
+    rendered = RenderedEmail(
+        subject="s", text_body="t", html_body="<p>h</p>", short_text="t"
+    )
+    behavior = FakeBrevoBehavior(latency_ms=0, rate_429=0.5, seed=4)
+    with FakeBrevoServer(behavior) as server:
+        provider = BrevoEmailProvider(_config(server.base_url))
+        try:
+            results = [
+                provider.send(to_email="user@example.com", rendered=rendered)
+                for _ in range(20)
+            ]
+        finally:
+            provider.close()
+
+    assert {result.error_code for result in results} == {None, "HTTP_429"}
+    sent = [result for result in results if result.status == "sent"]
+    assert all(result.provider_message_id for result in sent)
+    assert server.stats.requests == 20
+
+
+def test_fake_brevo_timeout_is_retryable() -> None:
+    rendered = RenderedEmail(
+        subject="s", text_body="t", html_body="<p>h</p>", short_text="t"
+    )
+    behavior = FakeBrevoBehavior(timeout_rate=1.0, timeout_seconds=0.5)
+    with FakeBrevoServer(behavior) as server:
+        client = httpx.Client(timeout=0.05)
+        provider = BrevoEmailProvider(_config(server.base_url), client=client)
+        try:
+            result = provider.send(to_email="user@example.com", rendered=rendered)
+        finally:
+            client.close()
+
+    assert (result.status, result.error_code) == ("pending", "TIMEOUT")
+    assert server.stats.as_dict()["outcomes"] == {OUTCOME_TIMEOUT: 1}
+
+
+@pytest.fixture()
+def database(tmp_path: Path) -> None:
+    prepare_database(f"sqlite:///{tmp_path / 'test_reminder_bench.db'}", reset=True)
+
+
+def test_pipeline_drains_outbox_through_retries(database) -> None:
+    run = run_notification_pipeline(
+        profiles=30,
+        tasks_per_plan=3,
+        due_per_plan=2,
+        behavior=FakeBrevoBehavior(latency_ms=0, rate_5xx=0.3, seed=2),
+        dispatch_concurrency=4,
+        batch_size=8,
+    )
+
+    assert run.scan.outbox_created == 30
+    assert run.scan.tasks_matched == 60
+    dispatch = run.dispatch
+    assert dispatch.sent + dispatch.dead == 30
+    assert dispatch.attempts == dispatch.sent + dispatch.retried + dispatch.dead
+    assert dispatch.attempts == run.provider["requests"]
+    assert run.provider["outcomes"][OUTCOME_ACCEPTED] == dispatch.sent
+    assert dispatch.retried > 0 and dispatch.time_jumps > 0
+    assert sum(run.failures_before_outcome["sent"].values()) == dispatch.sent
+    assert [stage.name for stage in run.stages] == ["seed", "scan", "dispatch"]
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from app.benchmarks.harness import (
+    BenchmarkResult,
+    Timing,
+    compare_results,
+    measure,
+    results_document,
+)
+from app.benchmarks.planner import run_planner_suite
+from app.benchmarks.workflows import (
+    WorkflowSpec,
+    generate_workflow,
+    parse_operator_mix,
+    synthetic_facts,
+)
+from app.domain.workflow_validator import validate_graph
+from app.planner.engine import generate_plan
+
+
+def test_synthetic_workflow_is_valid_and_deterministic() -> None:
+    spec = WorkflowSpec(
+        tasks=300,
+        edge_density=2.5,
+        rule_depth=3,
+        operator_mix=parse_operator_mix(">=:1,in:1,exists:1"),
+        fact_cardinality=6,
+        seed=7,
+    )
+
+    workflow = generate_workflow(spec)
+
+    assert workflow == generate_workflow(spec)
+    assert len(workflow["tasks"]) == 300
+    assert 2.0 < len(workflow["graph"]["edges"]) / 300 <= 2.5
+    validate_graph(workflow)
+    plan = generate_plan(workflow, synthetic_facts(spec, seed=1))
+    assert 0 < len(plan["tasks"]) < 300
+
+
+def test_suite_runs_every_case_for_each_size() -> None:
+    results = run_planner_suite(WorkflowSpec(tasks=1), (10, 20), repeat=2, min_time=0.0)
+
+    assert [result.key for result in results[:6]] == [
+        "validate_graph[10]",
+        "toposort_task_ids[10]",
+        "eval_rule[10]",
+        "compile_workflow[10]",
+        "generate_plan.cold[10]",
+        "generate_plan.warm[10]",
+    ]
+    assert len(results) == 12
+    assert all(result.timing.runs == 2 for result in results)
+    assert results[-1].params["tasks"] == 20
+
+
+def test_measure_scales_loops_to_min_time() -> None:
+    calls: list[None] = []
+
+    timing = measure(
+        lambda: calls.append(None), repeat=3, min_time=4, clock=lambda: len(calls)
+    )
+
+    assert timing.loops == 4
+    assert timing.runs == 3
+    assert timing.median_s == 1.0
+
+
+def _document(**medians: float) -> dict:
+    return results_document(
+        "planner",
+        [
+            BenchmarkResult(
+                name=name,
+                size=100,
+                timing=Timing(
+                    runs=1,
+                    loops=1,
+                    min_s=median,
+                    median_s=median,
+                    mean_s=median,
+                    p95_s=median,
+                ),
+            )
+            for name, median in medians.items()
+        ],
+    )
+
+
+def test_compare_flags_only_slowdowns_beyond_threshold() -> None:
+    baseline = _document(eval_rule=1.0, validate_graph=1.0, compile_workflow=1.0)
+    current = _document(eval_rule=1.2, validate_graph=1.5, toposort_task_ids=9.0)
+
+    regressions = compare_results(current, baseline, threshold=0.25)
+
+    assert [(item.key, item.ratio) for item in regressions] == [
+        ("validate_graph[100]", 1.5)
+    ]
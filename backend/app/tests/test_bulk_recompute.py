@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+from app.db.models import Plan, Task, TaskStatus
+from app.services.bulk_recompute_service import BulkRecomputeService
+from app.services.plan_service import PlanService
+from app.services.task_service import TaskService
+from app.services.template_repository import TemplateRepository
+
+FACT_VARIANTS = [
+    {
+        "birth_date": "2026-04-01",
+        "employment_type": "employed",
+        "public_insurance": True,
+        "private_insurance": False,
+        "child_insurance_kind": "gkv",
+    },
+    {
+        "birth_date": "2026-05-15",
+        "employment_type": "unemployed",
+        "public_insurance": True,
+        "private_insurance": False,
+        "child_insurance_kind": "gkv",
+    },
+    {
+        "birth_date": "2026-04-01",
+        "employment_type": "employed",
+        "public_insurance": False,
+        "private_insurance": True,
+        "child_insurance_kind": "pkv",
+    },
+]
+
+
+def _session_factory(path: Path) -> sessionmaker:
+    engine = create_engine(f"sqlite:///{path}", future=True)
+    return sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+
+@pytest.fixture()
+def workflows_root(tmp_path: Path) -> Path:
+    src = (
+        Path(__file__).resolve().parents[3]
+        / "workflows"
+        / "birth_de"
+        / "v2"
+        / "compiled.json"
+    )
+    dst = tmp_path / "workflows" / "birth_de" / "v2" / "compiled.json"
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    dst.write_text(src.read_text(encoding="utf-8"), encoding="utf-8")
+    return tmp_path / "workflows"
+
+
+@pytest.fixture()
+def service(workflows_root: Path) -> PlanService:
+    return PlanService(template_repository=TemplateRepository(workflows_root))
+
+
+@pytest.fixture()
+def seeded_db(tmp_path: Path, service: PlanService) -> Path:
+    db_path = tmp_path / "bulk_recompute.db"
+    factory = _session_factory(db_path)
+    Base.metadata.create_all(bind=factory.kw["bind"])
+
+    with factory() as session:
+        for idx in range(7):
+            plan = service.create_plan(
+                session,
+                template_key="birth_de/v2",
+                facts=FACT_VARIANTS[idx % len(FACT_VARIANTS)],
+            )
+            tasks = TaskService().list_tasks(session, plan_id=plan.id, status=None)
+            if idx % 2 == 0:
+                TaskService().update_status(
+                    session,
+                    plan_id=plan.id,
+                    task_id=tasks[0].id,
+                    status=TaskStatus.done,
+                )
+    factory.kw["bind"].dispose()
+    return db_path
+
+
+def _change_template(workflows_root: Path) -> None:
+    path = workflows_root / "birth_de" / "v2" / "compiled.json"
+    template = json.loads(path.read_text(encoding="utf-8"))
+    template["tasks"]["t_child_benefit"]["title"] = "Kindergeld beantragen (neu)"
+    template["tasks"]["t_child_benefit"]["deadline"]["offset_days"] = 90
+    template["tasks"]["t_birth_certificate"]["deadline"]["offset_days"] = 3
+    template["graph"]["edges"].append(
+        {"from": "t_parental_allowance", "to": "t_child_benefit"}
+    )
+    path.write_text(json.dumps(template, indent=2), encoding="utf-8")
+
+
+def _plan_state(factory: sessionmaker) -> dict:
+    state = {}
+    with factory() as session:
+        for plan in session.scalars(select(Plan).order_by(Plan.id)):
+            snapshot = PlanService().load_snapshot(session, plan)
+            tasks = session.scalars(
+                select(Task).where(Task.plan_id == plan.id).order_by(Task.sort_key)
+            ).all()
+            state[str(plan.id)] = {
+                "facts": plan.facts,
+                "planner_plan": snapshot["planner_plan"],
+                "facts_hash": snapshot["facts_hash"],
+                "recompute_reason": snapshot["recompute"]["reason"],
+                "recompute_delta": snapshot["recompute_delta"],
+                "tasks": [
+                    (
+                        task.task_key,
+                        task.title,
+                        task.status,
+                        task.due_date,
+                        task.metadata_json,
+                        task.task_template_version,
+                        task.sort_key,
+                        task.completed_at is None,
+                    )
+                    for task in tasks
+                ],
+            }
+    return state
+
+
+def test_bulk_recompute_matches_single_plan_recompute(
+    tmp_path: Path,
+    seeded_db: Path,
+    workflows_root: Path,
+    service: PlanService,
+) -> None:
+    single_db = tmp_path / "single.db"
+    shutil.copy(seeded_db, single_db)
+    _change_template(workflows_root)
+
+    bulk_factory = _session_factory(seeded_db)
+    progress_events = []
+    progress = BulkRecomputeService(service).run(
+        bulk_factory,
+        template_key="birth_de/v2",
+        chunk_size=3,
+        on_progress=lambda current: progress_events.append(current.plans_processed),
+    )
+    assert progress.done
+    assert progress.plans_processed == 7
+    assert progress.plans_failed == 0
+    assert progress.chunks == 3
+    assert progress_events == [3, 6, 7]
+
+    single_factory = _session_factory(single_db)
+    with single_factory() as session:
+        plan_ids = list(session.scalars(select(Plan.id).order_by(Plan.id)))
+        for plan_id in plan_ids:
+            service.recompute_plan(session, plan_id=plan_id, reason="TEMPLATE_UPDATE")
+
+    bulk_state = _plan_state(bulk_factory)
+    assert bulk_state == _plan_state(single_factory)
+    assert any(
+        "t_child_benefit" in plan["recompute_delta"]["updated_task_keys"]
+        for plan in bulk_state.values()
+    )
+
+
+def test_bulk_recompute_resumes_after_cursor_and_skips_invalid_plans(
+    seeded_db: Path,
+    service: PlanService,
+) -> None:
+    factory = _session_factory(seeded_db)
+    with factory() as session:
+        plan_ids = list(session.scalars(select(Plan.id).order_by(Plan.id)))
+        broken = session.get(Plan, plan_ids[5])
+        broken.facts = {"employment_type": "employed"}
+        session.commit()
+
+    first = BulkRecomputeService(service).run(
+        factory, template_key="birth_de/v2", chunk_size=2, max_chunks=2
+    )
+    assert not first.done
+    assert first.plans_processed == 4
+    assert first.last_plan_id == plan_ids[3]
+
+    resumed = BulkRecomputeService(service).run(
+        factory,
+        template_key="birth_de/v2",
+        after_plan_id=first.last_plan_id,
+        chunk_size=2,
+        progress=first,
+    )
+    assert resumed.done
+    assert resumed.plans_processed == 7
+    assert resumed.plans_failed == 1
+
+    with factory() as session:
+        untouched = session.get(Plan, plan_ids[5])
+        assert "recompute" not in untouched.snapshot
+        recomputed = session.get(Plan, plan_ids[6])
+        assert recomputed.snapshot["recompute"]["reason"] == "TEMPLATE_UPDATE"
+
+
+def test_bulk_recompute_retries_failed_chunk_per_plan(
+    seeded_db: Path,
+    workflows_root: Path,
+    service: PlanService,
+) -> None:
+    _change_template(workflows_root)
+    factory = _session_factory(seeded_db)
+    with factory() as session:
+        plan_ids = list(session.scalars(select(Plan.id).order_by(Plan.id)))
+        # Stands in for a concurrent writer that makes one plan's write fail.
+        session.execute(
+            text(
+                "CREATE TRIGGER reject_plan BEFORE UPDATE ON plans "
+                f"WHEN OLD.id = '{plan_ids[1].hex}' "
+                "BEGIN SELECT RAISE(ABORT, 'plan is busy'); END"
+            )
+        )
+        session.commit()
+
+    progress = BulkRecomputeService(service).run(
+        factory, template_key="birth_de/v2", chunk_size=3
+    )
+    assert progress.done
+    assert progress.plans_processed == 7
+    assert progress.plans_failed == 1
+
+    with factory() as session:
+        rejected = session.get(Plan, plan_ids[1])
+        assert "recompute" not in rejected.snapshot
+        for plan_id in (plan_ids[0], plan_ids[2]):
+            recomputed = session.get(Plan, plan_id)
+            assert recomputed.snapshot["recompute"]["reason"] == "TEMPLATE_UPDATE"
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine
+
+from app.db.base import Base
+from app.db.models import TemplateVersion
+from app.db.session import (
+    configure_engine,
+    get_session_factory,
+    pool_profile,
+    pool_status,
+)
+from app.services.template_catalog_service import TemplateCatalogService
+
+
+def test_pool_profile_uses_role_and_env_overrides(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("DB_POOL_ROLE", "worker")
+    monkeypatch.setenv("DB_POOL_SIZE", "7")
+    monkeypatch.setenv("DB_POOL_PRE_PING", "0")
+
+    profile = pool_profile()
+
+    assert profile.pool_size == 7
+    assert profile.max_overflow == 2
+    assert profile.pool_pre_ping is False
+    assert pool_profile("beat").max_overflow == 0
+
+    with pytest.raises(ValueError):
+        pool_profile("scheduler")
+
+
+@pytest.fixture()
+def primary_and_replica(tmp_path: Path):
+    primary_url = f"sqlite:///{tmp_path / 'primary.db'}"
+    replica_url = f"sqlite:///{tmp_path / 'replica.db'}"
+    seeds = ((primary_url, "primary_tpl"), (replica_url, "replica_tpl"))
+    for url, template_id in seeds:
+        engine = create_engine(url)
+        Base.metadata.create_all(bind=engine)
+        with engine.begin() as conn:
+            conn.execute(
+                TemplateVersion.__table__.insert().values(
+                    template_id=template_id,
+                    version=1,
+                    status="published",
+                    template_key=f"{template_id}/v1",
+                )
+            )
+        engine.dispose()
+
+    configure_engine(primary_url, replica_url=replica_url)
+    yield
+    configure_engine(primary_url)
+
+
+def test_read_only_calls_use_replica_until_session_commits(
+    primary_and_replica,
+) -> None:
+    service = TemplateCatalogService()
+    with get_session_factory()() as session:
+        listed = service.list_templates(session)
+        assert [item["template_id"] for item in listed] == ["replica_tpl"]
+
+        session.add(
+            TemplateVersion(
+                template_id="written_tpl",
+                version=1,
+                status="draft",
+                template_key="written_tpl/v1",
+            )
+        )
+        session.commit()
+
+        listed = service.list_templates(session)
+        assert [item["template_id"] for item in listed] == [
+            "primary_tpl",
+            "written_tpl",
+        ]
+
+    with get_session_factory()() as session:
+        listed = service.list_templates(session)
+        assert [item["template_id"] for item in listed] == ["replica_tpl"]
+
+
+def test_pool_status_reports_checkouts(primary_and_replica) -> None:
+    with get_session_factory()() as session:
+        TemplateCatalogService().list_templates(session)
+
+    status = pool_status()
+
+    assert status["replica"]["checkouts"] == 1
+    assert status["replica"]["checked_out"] == 0
+    assert status["primary"]["checkouts"] == 0
+    assert status["replica"]["wait_seconds_max"] >= 0.0
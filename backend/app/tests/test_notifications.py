@@ -1,9 +1,11 @@
 from __future__ import annotations
 
-from datetime import date, datetime
+import sys
+from datetime import date, datetime, timedelta
 from pathlib import Path
 from uuid import UUID
 
+import httpx
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import select
@@ -13,11 +15,22 @@ from app.db.base import Base
 from app.db.models import NotificationOutbox, NotificationProfile, Task, TaskStatus
 from app.db.session import configure_engine, get_engine, get_session_factory
 from app.main import app
+from app.notifications.brevo_provider import BrevoEmailProvider
 from app.notifications.config import NotificationConfig
+from app.notifications.rate_limit import TokenBucket
 from app.notifications.templates import render_task_due_soon
+from app.services.notification_outbox_service import (
+    NotificationOutboxService,
+    OutboxOutcome,
+)
+from app.services import notification_profile_service
 from app.services.notification_profile_service import NotificationProfileService
 from app.services.outbox_dispatcher_service import OutboxDispatcherService
-from app.services.reminder_scanner_service import ReminderScannerService
+from app.services.reminder_scanner_service import (
+    ReminderScannerService,
+    ScanSummary,
+    profile_shard_bounds,
+)
 from app.tests.support.template_seed import seed_published_templates
 
 BERLIN_TZ = ZoneInfo("Europe/Berlin")
@@ -142,6 +155,142 @@ def test_scan_ignores_done_and_null_due_date(client: TestClient) -> None:
         assert summary.errors == 0
 
 
+def test_scan_pages_profiles_and_applies_caps_in_bulk(client: TestClient) -> None:
+    plan_ids = [_create_plan(client) for _ in range(5)]
+    for plan_id in plan_ids:
+        _configure_profile(client, plan_id)
+    response = client.put(
+        f"/plans/{plan_ids[0]}/notification-profile",
+        json={
+            "email": "user@example.com",
+            "email_consent": False,
+            "locale": "de-DE",
+            "timezone": "Europe/Berlin",
+            "reminder_due_soon_enabled": True,
+        },
+    )
+    assert response.status_code == 200
+
+    session_factory = get_session_factory()
+    now = datetime(2026, 2, 25, 8, 5, tzinfo=BERLIN_TZ)
+    with session_factory() as session:
+        for plan_id in plan_ids:
+            first_task = session.scalar(
+                select(Task)
+                .where(Task.plan_id == plan_id)
+                .order_by(Task.sort_key.asc())
+            )
+            assert first_task is not None
+            first_task.status = TaskStatus.todo.value
+            first_task.due_date = date(2026, 2, 26)
+        capped_profile = session.scalar(
+            select(NotificationProfile).where(
+                NotificationProfile.plan_id == plan_ids[1]
+            )
+        )
+        assert capped_profile is not None
+        session.add(
+            NotificationOutbox(
+                profile_id=capped_profile.id,
+                channel="email",
+                type="task_due_soon",
+                dedupe_key_raw="task_due_soon|email|profile:capped|earlier",
+                payload={},
+                status="sent",
+                sent_at=datetime(2026, 2, 25, 7, 0, tzinfo=BERLIN_TZ),
+                next_attempt_at=now,
+                attempt_count=1,
+            )
+        )
+        session.commit()
+
+    scanner = ReminderScannerService(chunk_size=2)
+    with session_factory() as session:
+        summary = scanner.scan_due_soon(
+            session, now=now, app_base_url="http://localhost:3000"
+        )
+    assert summary.profiles_scanned == 5
+    assert summary.skipped_not_sendable == 1
+    assert summary.skipped_daily_cap == 1
+    assert summary.tasks_matched == 3
+    assert summary.outbox_created == 3
+    assert summary.errors == 0
+
+    with session_factory() as session:
+        summary = scanner.scan_due_soon(
+            session, now=now, app_base_url="http://localhost:3000"
+        )
+        assert summary.outbox_created == 0
+
+        service = NotificationProfileService()
+        items = list(
+            session.scalars(
+                select(NotificationOutbox).where(NotificationOutbox.status == "pending")
+            ).all()
+        )
+        assert len(items) == 3
+        for item in items:
+            token = item.payload["unsubscribe_url"].split("token=")[-1]
+            profile = session.get(NotificationProfile, item.profile_id)
+            assert profile is not None
+            assert profile.unsubscribe_token_hash == service._hash_token(token)
+            assert item.payload["tasks"][0]["due_in_days"] == 1
+
+
+def test_sharded_scans_partition_profiles(client: TestClient) -> None:
+    plan_ids = [_create_plan(client) for _ in range(6)]
+    for plan_id in plan_ids:
+        _configure_profile(client, plan_id)
+
+    session_factory = get_session_factory()
+    now = datetime(2026, 2, 25, 8, 5, tzinfo=BERLIN_TZ)
+    with session_factory() as session:
+        for plan_id in plan_ids:
+            first_task = session.scalar(
+                select(Task)
+                .where(Task.plan_id == plan_id)
+                .order_by(Task.sort_key.asc())
+            )
+            assert first_task is not None
+            first_task.status = TaskStatus.todo.value
+            first_task.due_date = date(2026, 2, 26)
+        session.commit()
+
+    shard_summaries = []
+    with session_factory() as session:
+        for shard_index in range(4):
+            shard_summaries.append(
+                ReminderScannerService().scan_due_soon(
+                    session,
+                    now=now,
+                    app_base_url="http://localhost:3000",
+                    shard_index=shard_index,
+                    shard_count=4,
+                )
+            )
+    total = ScanSummary.combine(shard_summaries)
+    assert total.profiles_scanned == 6
+    assert total.outbox_created == 6
+
+    with session_factory() as session:
+        summary = ReminderScannerService().scan_due_soon(
+            session, now=now, app_base_url="http://localhost:3000"
+        )
+    assert summary.profiles_scanned == 6
+    assert summary.outbox_created == 0
+
+
+def test_profile_shard_bounds_cover_uuid_space() -> None:
+    bounds = [profile_shard_bounds(index, 3) for index in range(3)]
+    assert bounds[0][0] is None
+    assert bounds[-1][1] is None
+    assert bounds[0][1] == bounds[1][0]
+    assert bounds[1][1] == bounds[2][0]
+    assert profile_shard_bounds(0, 1) == (None, None)
+    with pytest.raises(ValueError):
+        profile_shard_bounds(3, 3)
+
+
 def test_due_soon_template_is_deterministic() -> None:
     payload = {
         "user_display_name": "Jens",
@@ -274,6 +423,216 @@ def test_quiet_hours_reschedule_does_not_increment_attempts(
         assert updated.last_error_code == "QUIET_HOURS_DELAY"
 
 
+def test_dispatch_uses_shared_client_with_concurrency(client: TestClient) -> None:
+    plan_id = _create_plan(client)
+    _configure_profile(client, plan_id)
+    session_factory = get_session_factory()
+    now = datetime(2026, 2, 25, 10, 0, tzinfo=BERLIN_TZ)
+
+    with session_factory() as session:
+        profile = session.scalar(
+            select(NotificationProfile).where(NotificationProfile.plan_id == plan_id)
+        )
+        assert profile is not None
+        for idx in range(6):
+            session.add(
+                NotificationOutbox(
+                    profile_id=profile.id,
+                    channel="email",
+                    type="task_due_soon",
+                    dedupe_key_raw=f"task_due_soon|email|profile:test|{idx}",
+                    payload={"to_email": f"user{idx}@example.com", "tasks": []},
+                    status="pending",
+                    next_attempt_at=now,
+                    attempt_count=0,
+                )
+            )
+        session.commit()
+
+    requests: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.headers["api-key"])
+        return httpx.Response(201, json={"messageId": f"msg-{len(requests)}"})
+
+    config = NotificationConfig(
+        app_base_url="http://localhost:3000",
+        from_email="noreply@example.com",
+        from_name="Life Event",
+        brevo_api_key="test-key",
+        brevo_base_url="https://brevo.test/v3",
+        email_dry_run=False,
+        allowed_recipient_domains=set(),
+        dispatch_concurrency=4,
+    )
+    http_client = httpx.Client(transport=httpx.MockTransport(handler))
+    dispatcher = OutboxDispatcherService(
+        config, provider=BrevoEmailProvider(config, client=http_client)
+    )
+    with session_factory() as session:
+        summary = dispatcher.dispatch_pending(session, now=now, batch_size=10)
+    dispatcher.close()
+
+    assert summary.picked == 6
+    assert summary.sent == 6
+    assert requests == ["test-key"] * 6
+    assert not http_client.is_closed
+    with session_factory() as session:
+        items = list(session.scalars(select(NotificationOutbox)).all())
+        assert {item.status for item in items} == {"sent"}
+        assert all(item.provider_message_id for item in items)
+
+
+def test_record_outcomes_applies_batch_in_one_commit(client: TestClient) -> None:
+    plan_id = _create_plan(client)
+    _configure_profile(client, plan_id)
+    session_factory = get_session_factory()
+    now = datetime(2026, 2, 25, 10, 0, tzinfo=BERLIN_TZ)
+
+    with session_factory() as session:
+        profile = session.scalar(
+            select(NotificationProfile).where(NotificationProfile.plan_id == plan_id)
+        )
+        assert profile is not None
+        items = [
+            NotificationOutbox(
+                profile_id=profile.id,
+                channel="email",
+                type="task_due_soon",
+                dedupe_key_raw=f"task_due_soon|email|profile:batch|{idx}",
+                payload={},
+                status="sending",
+                next_attempt_at=now,
+                attempt_count=attempts,
+            )
+            for idx, attempts in enumerate([0, 1, 0, 4])
+        ]
+        session.add_all(items)
+        session.commit()
+        ids = [item.id for item in items]
+
+    outcomes = [
+        OutboxOutcome(outbox_id=ids[0], attempt_count=0, provider_message_id="m-1"),
+        OutboxOutcome(
+            outbox_id=ids[1],
+            attempt_count=1,
+            failure_class="retryable",
+            error_code="HTTP_503",
+            error_message="unavailable",
+        ),
+        OutboxOutcome(
+            outbox_id=ids[2],
+            attempt_count=0,
+            failure_class="permanent",
+            error_code="HTTP_400",
+        ),
+        OutboxOutcome(
+            outbox_id=ids[3],
+            attempt_count=4,
+            failure_class="retryable",
+            error_code="TIMEOUT",
+        ),
+    ]
+    with session_factory() as session:
+        NotificationOutboxService().record_outcomes(session, outcomes=outcomes, now=now)
+
+    with session_factory() as session:
+        sent, retried, dead, exhausted = (
+            session.get(NotificationOutbox, outbox_id) for outbox_id in ids
+        )
+        assert sent.status == "sent"
+        assert sent.provider_message_id == "m-1"
+        assert retried.status == "pending"
+        assert retried.attempt_count == 2
+        assert retried.last_error_code == "HTTP_503"
+        retry_delay = retried.next_attempt_at.replace(tzinfo=None) - now.replace(
+            tzinfo=None
+        )
+        assert timedelta(minutes=4) < retry_delay < timedelta(minutes=6)
+        assert dead.status == "dead"
+        assert dead.attempt_count == 1
+        assert exhausted.status == "dead"
+        assert exhausted.last_error_code == "retry_exhausted"
+        assert exhausted.failure_class == "permanent"
+
+
+def test_token_bucket_paces_requests_after_burst() -> None:
+    clock = [0.0]
+
+    def sleep(seconds: float) -> None:
+        clock[0] += seconds
+
+    bucket = TokenBucket(2.0, capacity=2, clock=lambda: clock[0], sleep=sleep)
+    for _ in range(6):
+        bucket.acquire()
+
+    assert clock[0] == pytest.approx(2.0)
+
+
+def test_quiet_hours_skip_locking_and_repeat_runs_are_noops(
+    client: TestClient,
+) -> None:
+    plan_id = _create_plan(client)
+    _configure_profile(client, plan_id)
+    session_factory = get_session_factory()
+
+    with session_factory() as session:
+        profile = session.scalar(
+            select(NotificationProfile).where(NotificationProfile.plan_id == plan_id)
+        )
+        assert profile is not None
+        for idx, due in enumerate(
+            [
+                datetime(2026, 2, 25, 21, 0, tzinfo=BERLIN_TZ),
+                datetime(2026, 2, 25, 22, 0, tzinfo=BERLIN_TZ),
+                datetime(2026, 2, 26, 9, 0, tzinfo=BERLIN_TZ),
+            ]
+        ):
+            session.add(
+                NotificationOutbox(
+                    profile_id=profile.id,
+                    channel="email",
+                    type="task_due_soon",
+                    dedupe_key_raw=f"task_due_soon|email|profile:quiet|{idx}",
+                    payload={"to_email": "user@example.com", "tasks": []},
+                    status="pending",
+                    next_attempt_at=due,
+                    attempt_count=0,
+                )
+            )
+        session.commit()
+
+    config = NotificationConfig(
+        app_base_url="http://localhost:3000",
+        from_email="noreply@example.com",
+        from_name="Life Event",
+        brevo_api_key="",
+        brevo_base_url="https://api.brevo.com/v3",
+        email_dry_run=True,
+        allowed_recipient_domains=set(),
+    )
+    dispatcher = OutboxDispatcherService(config)
+    with session_factory() as session:
+        first = dispatcher.dispatch_pending(
+            session, now=datetime(2026, 2, 25, 22, 30, tzinfo=BERLIN_TZ)
+        )
+        second = dispatcher.dispatch_pending(
+            session, now=datetime(2026, 2, 25, 22, 35, tzinfo=BERLIN_TZ)
+        )
+    assert first.picked == 0
+    assert first.skipped_quiet_hours == 2
+    assert second.skipped_quiet_hours == 0
+
+    with session_factory() as session:
+        items = list(session.scalars(select(NotificationOutbox)).all())
+        assert {item.status for item in items} == {"pending"}
+        assert sorted(item.last_error_code or "" for item in items) == [
+            "",
+            "QUIET_HOURS_DELAY",
+            "QUIET_HOURS_DELAY",
+        ]
+
+
 def test_consent_false_does_not_mark_unsubscribed(client: TestClient) -> None:
     plan_id = _create_plan(client)
     response = client.put(
@@ -318,3 +677,28 @@ def test_rotate_unsubscribe_token_invalidates_previous_token(
         second_result = service.unsubscribe_by_token(session, token=second_token)
         assert first_result is False
         assert second_result is True
+
+
+def test_sendable_clause_matches_is_sendable_for_whitespace(
+    client: TestClient,
+) -> None:
+    plan_id = _create_plan(client)
+    _configure_profile(client, plan_id)
+    service = NotificationProfileService()
+    session_factory = get_session_factory()
+    with session_factory() as session:
+        profile = service.get_or_create(session, plan_id=plan_id)
+        for email in (" user@example.com\t", "\t\n", " 　", " "):
+            profile.email = email
+            session.commit()
+            matched = session.scalar(
+                select(NotificationProfile.id).where(
+                    NotificationProfile.id == profile.id, service.sendable_clause()
+                )
+            )
+            assert (matched is not None) == service.is_sendable(profile), email
+
+
+def test_sendable_whitespace_matches_str_strip() -> None:
+    expected = {char for char in map(chr, range(sys.maxunicode + 1)) if char.isspace()}
+    assert set(notification_profile_service._WHITESPACE) == expected
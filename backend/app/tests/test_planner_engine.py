@@ -1,10 +1,16 @@
 from __future__ import annotations
 
 import json
+from typing import Any
 
 import pytest
 
-from app.planner.engine import generate_plan
+from app.planner.compiled import CompiledWorkflow, compile_workflow
+from app.planner.engine import (
+    generate_plan,
+    generate_plan_incremental,
+    generate_plans_batch,
+)
 from app.planner.errors import PlannerDependencyError, PlannerInputError
 
 
@@ -125,3 +131,180 @@ def test_generate_plan_invalid_deadline_type_raises() -> None:
 def test_generate_plan_invalid_workflow_shape_raises() -> None:
     with pytest.raises(PlannerInputError, match="workflow.template_id"):
         generate_plan({"tasks": {}, "graph": {}, "event_date_key": "birth_date"}, {})
+
+
+def test_compiled_workflow_is_reusable_and_matches_dict_input() -> None:
+    workflow = {
+        "template_id": "demo",
+        "event_date_key": "birth_date",
+        "graph": {
+            "nodes": ["t_a", "t_b"],
+            "edges": [{"from": "t_a", "to": "t_b"}],
+        },
+        "tasks": {
+            "t_a": {
+                "title": "A",
+                "eligibility": {"all": []},
+                "deadline": {"type": "relative_days", "offset_days": 1},
+            },
+            "t_b": {
+                "title": "B",
+                "eligibility": {"fact": "employed", "op": "=", "value": True},
+                "deadline": {
+                    "type": "relative_days",
+                    "offset_days": 5,
+                    "grace_days": 2,
+                },
+            },
+        },
+    }
+    program = compile_workflow(workflow)
+
+    assert isinstance(program, CompiledWorkflow)
+    assert [task.task_id for task in program.tasks] == ["t_a", "t_b"]
+    assert program.edges == ((0, 1),)
+    for facts in (
+        {"birth_date": "2026-04-01", "employed": True},
+        {"birth_date": "2026-04-01", "employed": False},
+    ):
+        assert generate_plan(program, facts) == generate_plan(workflow, facts)
+
+
+def test_compile_workflow_validates_inactive_tasks_up_front() -> None:
+    workflow = {
+        "template_id": "demo",
+        "event_date_key": "birth_date",
+        "graph": {"nodes": ["t_a"], "edges": []},
+        "tasks": {
+            "t_a": {
+                "title": "A",
+                "eligibility": {"fact": "never", "op": "exists"},
+                "deadline": {"type": "relative_days", "offset_days": "soon"},
+            }
+        },
+    }
+
+    with pytest.raises(PlannerInputError, match="offset_days must be int"):
+        compile_workflow(workflow)
+
+
+def test_generate_plans_batch_evaluates_rules_once_per_fact_signature() -> None:
+    calls: list[Any] = []
+    workflow = {
+        "template_id": "demo",
+        "event_date_key": "birth_date",
+        "graph": {"nodes": ["t_a"], "edges": []},
+        "tasks": {
+            "t_a": {
+                "title": "A",
+                "eligibility": {"fact": "employed", "op": "=", "value": True},
+                "deadline": {"type": "relative_days", "offset_days": 1},
+            }
+        },
+    }
+    program = compile_workflow(workflow)
+    predicate = program.tasks[0].is_active
+    program.tasks[0].is_active = lambda facts: calls.append(facts) or predicate(facts)
+
+    facts_list = [
+        {"birth_date": f"2026-04-{day:02d}", "employed": day % 2 == 0, "name": day}
+        for day in range(1, 21)
+    ]
+    plans = generate_plans_batch(program, facts_list)
+
+    assert len(calls) == 2
+    assert [len(plan["tasks"]) for plan in plans] == [
+        1 if day % 2 == 0 else 0 for day in range(1, 21)
+    ]
+    assert plans[1]["tasks"][0]["deadline"] == "2026-04-03"
+
+
+def test_generate_plans_batch_reports_missing_event_date() -> None:
+    workflow = {
+        "template_id": "demo",
+        "event_date_key": "birth_date",
+        "graph": {"nodes": [], "edges": []},
+        "tasks": {},
+    }
+
+    with pytest.raises(PlannerInputError, match="missing event date fact"):
+        generate_plans_batch(workflow, [{"birth_date": "2026-04-01"}, {}])
+
+
+def test_generate_plan_incremental_reevaluates_only_changed_fact_rules() -> None:
+    calls: list[str] = []
+    workflow = {
+        "template_id": "demo",
+        "event_date_key": "birth_date",
+        "graph": {
+            "nodes": ["t_a", "t_b", "t_c"],
+            "edges": [{"from": "t_a", "to": "t_b"}, {"from": "t_b", "to": "t_c"}],
+        },
+        "tasks": {
+            "t_a": {
+                "title": "A",
+                "eligibility": {"fact": "employed", "op": "=", "value": True},
+                "deadline": {"type": "relative_days", "offset_days": 1},
+            },
+            "t_b": {
+                "title": "B",
+                "eligibility": {"fact": "married", "op": "=", "value": True},
+                "deadline": {"type": "relative_days", "offset_days": 2},
+            },
+            "t_c": {
+                "title": "C",
+                "eligibility": {"all": []},
+                "deadline": {"type": "relative_days", "offset_days": 3},
+            },
+        },
+    }
+    program = compile_workflow(workflow)
+    for task in program.tasks:
+        predicate = task.is_active
+        task.is_active = (
+            lambda facts, task_id=task.task_id, predicate=predicate: calls.append(
+                task_id
+            )
+            or predicate(facts)
+        )
+
+    assert program.rule_dependents == {"employed": (0,), "married": (1,)}
+    assert program.planning_facts == {"birth_date", "employed", "married"}
+
+    before = {"birth_date": "2026-04-01", "employed": True, "married": False}
+    after = {**before, "married": True}
+    previous = generate_plan(program, before)
+    calls.clear()
+
+    plan = generate_plan_incremental(
+        program,
+        after,
+        previous_task_ids=[item["id"] for item in previous["tasks"]],
+        changed_facts=["married"],
+    )
+
+    assert calls == ["t_b"]
+    assert plan == generate_plan(workflow, after)
+    assert plan["tasks"][2]["depends_on"] == ["t_b"]
+
+
+def test_generate_plan_incremental_falls_back_on_unknown_task_ids() -> None:
+    workflow = {
+        "template_id": "demo",
+        "event_date_key": "birth_date",
+        "graph": {"nodes": ["t_a"], "edges": []},
+        "tasks": {
+            "t_a": {
+                "title": "A",
+                "eligibility": {"all": []},
+                "deadline": {"type": "relative_days", "offset_days": 1},
+            }
+        },
+    }
+    facts = {"birth_date": "2026-04-01"}
+
+    plan = generate_plan_incremental(
+        workflow, facts, previous_task_ids=["t_removed"], changed_facts=[]
+    )
+
+    assert plan == generate_plan(workflow, facts)
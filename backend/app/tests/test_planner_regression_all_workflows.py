@@ -6,7 +6,7 @@ from typing import Any
 import pytest
 
 from app.domain.workflow_test_runner import load_template, load_testcase
-from app.planner.engine import generate_plan
+from app.planner.engine import generate_plan, generate_plans_batch
 
 ROOT = Path(__file__).resolve().parents[3]
 WORKFLOWS_ROOT = ROOT / "workflows"
@@ -81,3 +81,23 @@ def test_planner_regressions(compiled_path: Path, testcase_path: Path) -> None:
 
     plan = generate_plan(workflow, facts)
     assert plan == expected_plan
+
+
+@pytest.mark.parametrize(
+    "compiled_path",
+    sorted({compiled_path for compiled_path, _ in CASES}),
+    ids=lambda path: f"{path.parent.parent.name}/{path.parent.name}",
+)
+def test_batch_generation_matches_single_plans(compiled_path: Path) -> None:
+    workflow = load_template(compiled_path)
+    facts_list: list[dict[str, Any]] = []
+    for testcase_path in sorted((compiled_path.parent / "tests").glob("tc_*.yaml")):
+        facts = load_testcase(testcase_path).get("facts", {})
+        for birth_date in ("2026-04-01", "2026-04-01", "2027-01-31"):
+            facts_list.append({**facts, "birth_date": birth_date})
+
+    plans = generate_plans_batch(workflow, facts_list)
+
+    assert plans == [generate_plan(workflow, facts) for facts in facts_list]
+    assert plans[0] is not plans[1]
+    assert plans[0]["tasks"][0] is not plans[1]["tasks"][0]
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from app.domain.workflow_test_runner import load_template, load_testcase
+from app.planner.errors import PlannerRuleError
+from app.planner.rules import compile_rule, eval_rule, rule_facts
+
+ROOT = Path(__file__).resolve().parents[3]
+WORKFLOWS_ROOT = ROOT / "workflows"
+
+
+def _template_rules(template: dict[str, Any]) -> list[tuple[str, Any]]:
+    rules: list[tuple[str, Any]] = []
+    for task_id, task in template.get("tasks", {}).items():
+        rules.append((f"tasks.{task_id}", task.get("eligibility", {"all": []})))
+    for rec_id, rec in template.get("recommendations", {}).items():
+        rules.append((f"recommendations.{rec_id}", rec.get("eligibility", {"all": []})))
+    return rules
+
+
+def _fact_variants(facts: dict[str, Any], keys: frozenset[str]) -> list[dict[str, Any]]:
+    variants = [facts]
+    for key in sorted(keys):
+        without = {k: v for k, v in facts.items() if k != key}
+        variants.append(without)
+        for value in (None, True, False, 0, 2.5, "unknown", ["x"], {"k": 1}):
+            variants.append({**facts, key: value})
+    return variants
+
+
+def _cases() -> list[tuple[Path, Path]]:
+    items: list[tuple[Path, Path]] = []
+    for compiled_path in sorted(WORKFLOWS_ROOT.rglob("compiled.json")):
+        for testcase_path in sorted((compiled_path.parent / "tests").glob("tc_*.yaml")):
+            items.append((compiled_path, testcase_path))
+    return items
+
+
+CASES = _cases()
+
+
+@pytest.mark.parametrize(
+    "compiled_path,testcase_path",
+    CASES,
+    ids=[f"{c.parent.parent.name}/{c.parent.name}/{t.name}" for c, t in CASES],
+)
+def test_compiled_rules_match_interpreter(
+    compiled_path: Path, testcase_path: Path
+) -> None:
+    template = load_template(compiled_path)
+    facts = load_testcase(testcase_path).get("facts", {})
+
+    for rule_path, rule in _template_rules(template):
+        predicate = compile_rule(rule)
+        for variant in _fact_variants(facts, rule_facts(rule)):
+            assert predicate(variant) == eval_rule(rule, variant), (
+                rule_path,
+                variant,
+            )
+
+
+@pytest.mark.parametrize(
+    "rule",
+    [
+        {"fact": "x", "op": "exists"},
+        {"fact": "x", "op": "=", "value": 1},
+        {"fact": "x", "op": "!=", "value": "a"},
+        {"fact": "x", "op": "in", "value": ["a", 1, None]},
+        {"fact": "x", "op": "in", "value": [["a"], {"b": 1}]},
+        {"fact": "x", "op": "in", "value": "not-a-list"},
+        {"fact": "x", "op": ">", "value": 1},
+        {"fact": "x", "op": ">=", "value": 1.5},
+        {"fact": "x", "op": "<", "value": True},
+        {"fact": "x", "op": "<=", "value": "3"},
+        {"any": []},
+        {"all": []},
+        {"not": {"any": [{"fact": "x", "op": "=", "value": 1}]}},
+    ],
+)
+def test_compiled_operators_match_interpreter(rule: dict[str, Any]) -> None:
+    predicate = compile_rule(rule)
+    for value in (None, True, False, 0, 1, 1.0, 1.5, 3, "a", "3", ["a"], {"b": 1}):
+        facts = {"x": value}
+        assert predicate(facts) == eval_rule(rule, facts), facts
+    assert predicate({}) == eval_rule(rule, {})
+
+
+def test_compile_rule_rejects_invalid_rules_eagerly() -> None:
+    with pytest.raises(PlannerRuleError, match="cannot be null"):
+        compile_rule(None)
+    with pytest.raises(PlannerRuleError, match="unsupported predicate op"):
+        compile_rule({"any": [{"fact": "x", "op": "contains", "value": "a"}]})
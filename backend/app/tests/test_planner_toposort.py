@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import pytest
 
+from app.planner.compiled import compile_workflow
 from app.planner.errors import PlannerCycleError, PlannerDependencyError
 from app.planner.toposort import toposort_task_ids
 
@@ -27,3 +28,50 @@ def test_toposort_unknown_dependency_raises() -> None:
 def test_toposort_cycle_raises_stable_message() -> None:
     with pytest.raises(PlannerCycleError, match="Cycle detected in active task graph"):
         toposort_task_ids({"t_a", "t_b"}, [("t_a", "t_b"), ("t_b", "t_a")])
+
+
+def _chain_workflow(edges: list[tuple[str, str]]) -> dict:
+    task_ids = sorted({task_id for edge in edges for task_id in edge} | {"t_d"})
+    return {
+        "template_id": "demo",
+        "event_date_key": "birth_date",
+        "graph": {
+            "nodes": task_ids,
+            "edges": [{"from": source, "to": target} for source, target in edges],
+        },
+        "tasks": {
+            task_id: {
+                "title": task_id,
+                "eligibility": {"all": []},
+                "deadline": {"type": "relative_days", "offset_days": 1},
+            }
+            for task_id in task_ids
+        },
+    }
+
+
+def test_compiled_layout_matches_toposort_for_every_mask() -> None:
+    edges = [("t_a", "t_c"), ("t_b", "t_c"), ("t_c", "t_d")]
+    program = compile_workflow(_chain_workflow(edges))
+    task_ids = [task.task_id for task in program.tasks]
+
+    assert program.precompute_layouts() == 1 << len(task_ids)
+    for mask in range(1 << len(task_ids)):
+        active = {task_ids[i] for i in range(len(task_ids)) if mask >> i & 1}
+        active_edges = [(s, t) for s, t in edges if s in active and t in active]
+        ordered, depends_on = program.layout(mask)
+
+        assert [task_ids[i] for i in ordered] == toposort_task_ids(active, active_edges)
+        assert program.layout(mask) is program.layout(mask)
+        for index in ordered:
+            assert list(depends_on[index]) == sorted(
+                s for s, t in active_edges if t == task_ids[index]
+            )
+
+
+def test_compiled_layout_cycle_raises_stable_message() -> None:
+    program = compile_workflow(_chain_workflow([("t_a", "t_b"), ("t_b", "t_a")]))
+
+    assert program.precompute_layouts() == 6
+    with pytest.raises(PlannerCycleError, match="Cycle detected in active task graph"):
+        program.layout(0b011)
@@ -4,12 +4,12 @@ from pathlib import Path
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import select
+from sqlalchemy import event, select
 
 from app.db.base import Base
 from app.db.models import TemplateVersion
 from app.db.session import get_session_factory
-from app.db.session import configure_engine, get_engine
+from app.db.session import configure_engine, get_async_engine, get_engine
 from app.main import app
 from app.tests.support.template_seed import seed_published_templates
 
@@ -355,6 +355,178 @@ def test_patch_plan_facts_recompute_switches_child_insurance_and_keeps_done(
     assert task_status_by_key["t_birth_certificate"] == "done"
 
 
+def test_patch_plan_facts_deferred_returns_pending_and_schedules_once(
+    client: TestClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    scheduled: list[str] = []
+    monkeypatch.setattr(
+        "app.api.plans.schedule_deferred_recompute",
+        lambda plan_id: scheduled.append(str(plan_id)),
+    )
+    create_payload = {
+        "template_key": "birth_de/v2",
+        "facts": {
+            "birth_date": "2026-04-01",
+            "employment_type": "employed",
+            "public_insurance": True,
+            "private_insurance": False,
+        },
+    }
+    plan_id = client.post("/plans", json=create_payload).json()["id"]
+    snapshot_before = client.get(
+        f"/plans/{plan_id}", params={"include_snapshot": True}
+    ).json()["snapshot"]
+
+    for patch in ({"child_insurance_kind": "gkv"}, {"employment_type": "student"}):
+        response = client.patch(
+            f"/plans/{plan_id}/facts",
+            json={"facts": patch, "recompute": "deferred"},
+        )
+        assert response.status_code == 200
+        body = response.json()
+        assert body["snapshot_meta"]["recompute_pending"] is True
+
+    assert scheduled == [plan_id]
+    assert body["facts"]["child_insurance_kind"] == "gkv"
+    assert body["facts"]["employment_type"] == "student"
+    snapshot_after = client.get(
+        f"/plans/{plan_id}", params={"include_snapshot": True}
+    ).json()["snapshot"]
+    assert snapshot_after["planner_plan"] == snapshot_before["planner_plan"]
+
+
+def test_get_plan_is_one_statement_and_skips_template_versions(
+    client: TestClient,
+) -> None:
+    create_payload = {
+        "template_key": "birth_de/v1",
+        "facts": {"birth_date": "2026-04-01", "employment_type": "employed"},
+    }
+    plan_id = client.post("/plans", json=create_payload).json()["id"]
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany) -> None:
+        statements.append(statement)
+
+    engine = get_async_engine().sync_engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        response = client.get(f"/plans/{plan_id}")
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["latest_published_version"] == 2
+    assert body["upgrade_available"] is True
+    assert body["snapshot_meta"]["template_key"] == "birth_de/v1"
+    selects = [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+    assert len(selects) == 1
+    assert "template_versions" not in selects[0]
+
+
+def test_get_plan_if_none_match_returns_304_until_facts_change(
+    client: TestClient,
+) -> None:
+    create_payload = {
+        "template_key": "birth_de/v1",
+        "facts": {"birth_date": "2026-04-01", "employment_type": "employed"},
+    }
+    plan_id = client.post("/plans", json=create_payload).json()["id"]
+    first = client.get(f"/plans/{plan_id}")
+    etag = first.headers["ETag"]
+    assert etag.startswith('W/"')
+
+    repeat = client.get(f"/plans/{plan_id}", headers={"If-None-Match": etag})
+    assert repeat.status_code == 304
+    assert repeat.content == b""
+    assert repeat.headers["ETag"] == etag
+
+    with_snapshot = client.get(
+        f"/plans/{plan_id}",
+        params={"include_snapshot": "true"},
+        headers={"If-None-Match": etag},
+    )
+    assert with_snapshot.status_code == 200
+    assert with_snapshot.headers["ETag"] != etag
+
+    client.patch(
+        f"/plans/{plan_id}/facts",
+        json={"facts": {"employment_type": "self_employed"}, "recompute": True},
+    )
+    changed = client.get(f"/plans/{plan_id}", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+
+
+def test_list_tasks_if_none_match_tracks_task_updates(client: TestClient) -> None:
+    create_payload = {
+        "template_key": "birth_de/v1",
+        "facts": {"birth_date": "2026-04-01", "employment_type": "employed"},
+    }
+    plan_id = client.post("/plans", json=create_payload).json()["id"]
+    first = client.get(f"/plans/{plan_id}/tasks")
+    etag = first.headers["ETag"]
+
+    repeat = client.get(f"/plans/{plan_id}/tasks", headers={"If-None-Match": etag})
+    assert repeat.status_code == 304
+
+    filtered = client.get(
+        f"/plans/{plan_id}/tasks",
+        params={"status": "todo"},
+        headers={"If-None-Match": etag},
+    )
+    assert filtered.status_code == 200
+
+    task_id = first.json()[0]["id"]
+    client.patch(f"/plans/{plan_id}/tasks/{task_id}", json={"status": "in_progress"})
+    changed = client.get(f"/plans/{plan_id}/tasks", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+
+    missing = client.get(
+        "/plans/00000000-0000-0000-0000-000000000000/tasks",
+        headers={"If-None-Match": etag},
+    )
+    assert missing.status_code == 404
+
+
+def test_list_tasks_without_if_none_match_is_one_statement(
+    client: TestClient,
+) -> None:
+    create_payload = {
+        "template_key": "birth_de/v1",
+        "facts": {"birth_date": "2026-04-01", "employment_type": "employed"},
+    }
+    plan_id = client.post("/plans", json=create_payload).json()["id"]
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany) -> None:
+        statements.append(statement)
+
+    engine = get_async_engine().sync_engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        response = client.get(f"/plans/{plan_id}/tasks")
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert response.status_code == 200
+    assert len(statements) == 1
+    repeat = client.get(
+        f"/plans/{plan_id}/tasks", headers={"If-None-Match": response.headers["ETag"]}
+    )
+    assert repeat.status_code == 304
+
+    empty = client.get(f"/plans/{plan_id}/tasks", params={"status": "done"})
+    assert empty.status_code == 200
+    assert empty.json() == []
+    assert "ETag" in empty.headers
+    missing = client.get("/plans/00000000-0000-0000-0000-000000000000/tasks")
+    assert missing.status_code == 404
+
+
 def test_cannot_manually_complete_decision_task_even_with_force(
     client: TestClient,
 ) -> None:
@@ -408,6 +580,51 @@ def test_tasks_without_metadata_still_include_task_kind(client: TestClient) -> N
     assert all(item.get("metadata") is None for item in tasks)
 
 
+def test_list_tasks_keyset_pages_fields_and_due_filter(client: TestClient) -> None:
+    create_payload = {
+        "template_key": "birth_de/v2",
+        "facts": {
+            "birth_date": "2026-04-01",
+            "employment_type": "employed",
+            "public_insurance": True,
+            "private_insurance": True,
+        },
+    }
+    plan_id = client.post("/plans", json=create_payload).json()["id"]
+    all_tasks = client.get(f"/plans/{plan_id}/tasks").json()
+    assert len(all_tasks) > 2
+
+    paged: list[dict] = []
+    params: dict[str, str | int] = {"limit": 2, "fields": "id,task_key,task_kind"}
+    while True:
+        page = client.get(f"/plans/{plan_id}/tasks", params=params)
+        assert page.status_code == 200
+        assert all(set(item) == {"id", "task_key", "task_kind"} for item in page.json())
+        paged.extend(page.json())
+        cursor = page.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+        params["cursor"] = cursor
+    assert [item["id"] for item in paged] == [item["id"] for item in all_tasks]
+    assert [item["task_kind"] for item in paged] == [
+        item["task_kind"] for item in all_tasks
+    ]
+
+    due_dates = sorted({item["due_date"] for item in all_tasks if item["due_date"]})
+    before = client.get(
+        f"/plans/{plan_id}/tasks", params={"due_before": due_dates[-1]}
+    ).json()
+    assert before
+    assert all(item["due_date"] < due_dates[-1] for item in before)
+
+    invalid = client.get(f"/plans/{plan_id}/tasks", params={"fields": "id,secret"})
+    assert invalid.status_code == 400
+    assert invalid.json()["error"]["code"] == "INVALID_TASK_FIELDS"
+    bad_cursor = client.get(f"/plans/{plan_id}/tasks", params={"cursor": "%%%"})
+    assert bad_cursor.status_code == 400
+    assert bad_cursor.json()["error"]["code"] == "INVALID_TASK_CURSOR"
+
+
 def test_recompute_soft_dismiss_and_reactivate_reuses_task_row(
     client: TestClient,
 ) -> None:
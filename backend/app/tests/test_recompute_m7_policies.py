@@ -1,14 +1,20 @@
 from __future__ import annotations
 
 import json
+from datetime import UTC, datetime, timedelta
 from pathlib import Path
 
 import pytest
+from sqlalchemy import select
 
 from app.db.base import Base
-from app.db.models import TaskStatus
+from app.db.models import PlanSnapshot, TaskStatus
 from app.db.session import configure_engine, get_engine, get_session_factory
-from app.services.plan_service import PlanService, _next_status
+from app.services.plan_service import (
+    PlanService,
+    _next_status,
+    is_recompute_pending,
+)
 from app.services.task_service import TaskService
 from app.services.template_repository import TemplateRepository
 
@@ -245,3 +251,215 @@ def test_graph_blocked_by_recompute_updates_dependencies(
         "t_birth_certificate",
         "t_parental_allowance",
     ]
+
+
+def test_create_plan_bulk_inserts_tasks_with_template_metadata(
+    session,
+    workflows_root: Path,
+    service: PlanService,
+) -> None:
+    plan = service.create_plan(
+        session,
+        template_key="birth_de/v2",
+        facts={
+            "birth_date": "2026-04-01",
+            "employment_type": "employed",
+            "public_insurance": True,
+            "private_insurance": False,
+            "child_insurance_kind": "gkv",
+        },
+    )
+    template = service.template_repository.load("birth_de/v2")
+    assert service.metadata_skeletons(template) is service.metadata_skeletons(template)
+
+    tasks = TaskService().list_tasks(session, plan_id=plan.id, status=None)
+    planned = service.load_snapshot(session, plan)["planner_plan"]["tasks"]
+    assert [task.task_key for task in tasks] == [item["id"] for item in planned]
+    assert [task.sort_key for task in tasks] == list(range(len(planned)))
+
+    for task, item in zip(tasks, planned):
+        template_task = template["tasks"][task.task_key]
+        assert task.status == TaskStatus.todo.value
+        assert task.due_date.isoformat() == item["deadline"]
+        assert task.metadata_json["blocked_by"] == item["depends_on"]
+        assert task.metadata_json["deadline_reference_value"] == item["deadline"]
+        assert task.metadata_json["category"] == template_task.get("category")
+        assert task.metadata_json["block_type"] == "hard"
+
+
+def test_fact_patch_outside_rules_skips_generation(
+    session,
+    workflows_root: Path,
+    service: PlanService,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    plan = service.create_plan(
+        session,
+        template_key="birth_de/v2",
+        facts={
+            "birth_date": "2026-04-01",
+            "employment_type": "employed",
+            "public_insurance": True,
+            "private_insurance": False,
+            "child_insurance_kind": "gkv",
+        },
+    )
+    planned = service.load_snapshot(session, plan)["planner_plan"]
+
+    def _fail(*args, **kwargs):
+        raise AssertionError("plan generation should be skipped")
+
+    monkeypatch.setattr("app.services.plan_service.generate_plan", _fail)
+    monkeypatch.setattr("app.services.plan_service.generate_plan_incremental", _fail)
+
+    updated = service.update_facts(
+        session, plan_id=plan.id, facts_patch={"display_name": "Mia"}
+    )
+
+    assert updated.facts["display_name"] == "Mia"
+    snapshot = service.load_snapshot(session, updated)
+    assert snapshot["planner_plan"] == planned
+    assert snapshot["recompute_delta"]["facts_diff"] == [
+        {"fact": "display_name", "from": None, "to": "Mia"}
+    ]
+
+
+def test_fact_patch_reevaluates_only_dependent_rules(
+    session,
+    workflows_root: Path,
+    service: PlanService,
+) -> None:
+    facts = {
+        "birth_date": "2026-04-01",
+        "employment_type": "employed",
+        "public_insurance": True,
+        "private_insurance": False,
+        "child_insurance_kind": "gkv",
+    }
+    plan = service.create_plan(session, template_key="birth_de/v2", facts=facts)
+
+    updated = service.update_facts(
+        session, plan_id=plan.id, facts_patch={"employment_type": "self_employed"}
+    )
+
+    expected = PlanService(
+        template_repository=TemplateRepository(workflows_root)
+    ).create_plan(
+        session,
+        template_key="birth_de/v2",
+        facts={**facts, "employment_type": "self_employed"},
+    )
+    assert (
+        service.load_snapshot(session, updated)["planner_plan"]
+        == service.load_snapshot(session, expected)["planner_plan"]
+    )
+
+
+def test_deferred_fact_patches_coalesce_into_one_recompute(
+    session,
+    workflows_root: Path,
+    service: PlanService,
+) -> None:
+    plan = service.create_plan(
+        session,
+        template_key="birth_de/v2",
+        facts={
+            "birth_date": "2026-04-01",
+            "employment_type": "employed",
+            "public_insurance": True,
+            "private_insurance": False,
+            "child_insurance_kind": "gkv",
+        },
+    )
+    planned = service.load_snapshot(session, plan)["planner_plan"]
+    start = datetime(2026, 4, 1, 12, 0, tzinfo=UTC)
+
+    _, first = service.defer_recompute(
+        session,
+        plan_id=plan.id,
+        facts_patch={"employment_type": "self_employed"},
+        debounce_seconds=2,
+        now=start,
+    )
+    deferred, second = service.defer_recompute(
+        session,
+        plan_id=plan.id,
+        facts_patch={"child_insurance_kind": "pkv"},
+        debounce_seconds=2,
+        now=start + timedelta(seconds=1),
+    )
+
+    assert (first, second) == (True, False)
+    assert is_recompute_pending(deferred.snapshot)
+    assert deferred.facts["child_insurance_kind"] == "pkv"
+    assert service.load_snapshot(session, deferred)["planner_plan"] == planned
+
+    remaining = service.run_deferred_recompute(
+        session,
+        plan_id=plan.id,
+        debounce_seconds=2,
+        now=start + timedelta(seconds=2),
+    )
+    assert remaining == pytest.approx(1.0)
+
+    assert (
+        service.run_deferred_recompute(
+            session,
+            plan_id=plan.id,
+            debounce_seconds=2,
+            now=start + timedelta(seconds=3),
+        )
+        is None
+    )
+    recomputed = service.get_plan(session, plan.id)
+    snapshot = service.load_snapshot(session, recomputed)
+    task_keys = [item["id"] for item in snapshot["planner_plan"]["tasks"]]
+
+    assert not is_recompute_pending(recomputed.snapshot)
+    assert "t_parental_leave_employer" not in task_keys
+    assert "t_add_child_insurance_pkv" in task_keys
+    facts_diff = snapshot["recompute_delta"]["facts_diff"]
+    assert {change["fact"] for change in facts_diff} == {
+        "employment_type",
+        "child_insurance_kind",
+    }
+
+
+def test_recompute_appends_snapshot_history_outside_plan_row(
+    session,
+    workflows_root: Path,
+    service: PlanService,
+) -> None:
+    plan = service.create_plan(
+        session,
+        template_key="birth_de/v2",
+        facts={
+            "birth_date": "2026-04-01",
+            "employment_type": "employed",
+            "child_insurance_kind": "gkv",
+        },
+    )
+    service.update_facts(
+        session, plan_id=plan.id, facts_patch={"employment_type": "student"}
+    )
+    plan = service.get_plan(session, plan.id)
+
+    assert "planner_plan" not in plan.snapshot
+    assert "recompute_delta" not in plan.snapshot
+    history = session.scalars(
+        select(PlanSnapshot)
+        .where(PlanSnapshot.plan_id == plan.id)
+        .order_by(PlanSnapshot.created_at)
+    ).all()
+    assert [row.reason for row in history] == [None, "FACT_CHANGE"]
+    assert plan.snapshot["snapshot_id"] == str(history[-1].id)
+
+    snapshot = service.load_snapshot(session, plan)
+    assert history[-1].planner_plan is None
+    assert snapshot["planner_plan"] == service.plan_body_store.load(
+        session, history[-1].body_hash, history[-1].event_date
+    )
+    assert snapshot["task_count"] == len(snapshot["planner_plan"]["tasks"])
+    assert snapshot["recompute_delta"]["facts_diff"] == [
+        {"fact": "employment_type", "from": "employed", "to": "student"}
+    ]
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from datetime import date
+from pathlib import Path
+
+import pytest
+from sqlalchemy import func, select
+
+from app.db.base import Base
+from app.db.models import PlanBody, PlanSnapshot
+from app.db.session import configure_engine, get_engine, get_session_factory
+from app.planner.engine import generate_plan
+from app.services.plan_service import PlanService
+from app.services.snapshot_store import (
+    PlanBodyStore,
+    decode_plan_body,
+    encode_plan_body,
+    join_plan_body,
+    split_plan_body,
+)
+from app.services.template_repository import TemplateRepository
+
+WORKFLOW = {
+    "template_id": "demo",
+    "event_date_key": "birth_date",
+    "graph": {"nodes": ["t_a", "t_b"], "edges": [{"from": "t_a", "to": "t_b"}]},
+    "tasks": {
+        "t_a": {
+            "title": "A",
+            "eligibility": {"all": []},
+            "deadline": {"type": "relative_days", "offset_days": -3},
+        },
+        "t_b": {
+            "title": "B",
+            "eligibility": {"all": []},
+            "deadline": {"type": "relative_days", "offset_days": 10, "grace_days": 2},
+        },
+    },
+}
+
+
+@pytest.fixture()
+def session(tmp_path: Path):
+    configure_engine(f"sqlite:///{tmp_path / 'test_snapshot_store.db'}")
+    engine = get_engine()
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    with get_session_factory()() as session:
+        yield session
+
+    Base.metadata.drop_all(bind=engine)
+
+
+def test_plan_body_round_trips_and_is_shared_across_event_dates() -> None:
+    april = generate_plan(WORKFLOW, {"birth_date": "2026-04-01"})
+    june = generate_plan(WORKFLOW, {"birth_date": "2026-06-15"})
+
+    april_body, april_date = split_plan_body(april)
+    june_body, _ = split_plan_body(june)
+
+    assert april_date == date(2026, 4, 1)
+    assert april_body == june_body
+    assert [item["deadline_offset_days"] for item in april_body["tasks"]] == [-3, 12]
+    assert join_plan_body(april_body, april_date) == april
+    assert list(join_plan_body(april_body, april_date)) == list(april)
+
+    body_hash, payload = encode_plan_body(april_body)
+    assert body_hash == encode_plan_body(june_body)[0]
+    assert decode_plan_body(payload) == april_body
+
+
+def test_unnormalizable_plan_is_kept_inline() -> None:
+    planner_plan = {"workflow_id": "demo", "tasks": []}
+
+    columns, body_row = PlanBodyStore().prepare(planner_plan)
+
+    assert body_row is None
+    assert columns == {
+        "planner_plan": planner_plan,
+        "body_hash": None,
+        "event_date": None,
+    }
+
+
+def test_plans_with_equal_bodies_share_one_stored_row(tmp_path: Path, session) -> None:
+    src = Path(__file__).resolve().parents[3] / "workflows" / "birth_de" / "v2"
+    dst = tmp_path / "workflows" / "birth_de" / "v2"
+    dst.mkdir(parents=True)
+    (dst / "compiled.json").write_text(
+        (src / "compiled.json").read_text(encoding="utf-8"), encoding="utf-8"
+    )
+    service = PlanService(
+        template_repository=TemplateRepository(tmp_path / "workflows")
+    )
+
+    plans = [
+        service.create_plan(
+            session,
+            template_key="birth_de/v2",
+            facts={
+                "birth_date": birth_date,
+                "employment_type": "employed",
+                "child_insurance_kind": "gkv",
+            },
+        )
+        for birth_date in ("2026-04-01", "2026-05-01", "2026-06-01")
+    ]
+
+    assert session.scalar(select(func.count()).select_from(PlanBody)) == 1
+    stored = session.scalars(select(PlanSnapshot)).all()
+    assert {row.body_hash for row in stored} == {stored[0].body_hash}
+    assert all(row.planner_plan is None for row in stored)
+
+    for plan, birth_date in zip(plans, ("2026-04-01", "2026-05-01", "2026-06-01")):
+        planner_plan = service.load_snapshot(session, plan)["planner_plan"]
+        assert planner_plan["event_date"] == birth_date
+        assert planner_plan == generate_plan(
+            service.template_repository.compiled_program(
+                service.template_repository.load("birth_de/v2")
+            ),
+            plan.facts,
+        )
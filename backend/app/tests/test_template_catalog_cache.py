@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from sqlalchemy import event, select
+
+from app.db.base import Base
+from app.db.models import TemplateVersion
+from app.db.session import configure_engine, get_engine, get_session_factory
+from app.services.template_catalog_service import (
+    TemplateCatalogService,
+    TemplateVersionCatalogCache,
+    bump_catalog_revision,
+)
+from app.tests.support.template_seed import seed_published_templates
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture()
+def session(tmp_path: Path):
+    configure_engine(f"sqlite:///{tmp_path / 'test_template_catalog_cache.db'}")
+    engine = get_engine()
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    with get_session_factory()() as session:
+        seed_published_templates(session)
+        yield session
+
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture()
+def statements():
+    captured: list[str] = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        captured.append(statement)
+
+    engine = get_engine()
+    event.listen(engine, "before_cursor_execute", capture)
+    yield captured
+    event.remove(engine, "before_cursor_execute", capture)
+
+
+def test_lookups_within_ttl_do_not_query(session, statements) -> None:
+    clock = FakeClock()
+    cache = TemplateVersionCatalogCache(ttl_seconds=30, clock=clock)
+    service = TemplateCatalogService(catalog_cache=cache)
+
+    assert service.get_latest_published_version(session, template_id="birth_de") == 2
+    issued = len(statements)
+
+    clock.now = 29
+    entry = service.resolve_published_by_key(session, template_key="birth_de/v1")
+    assert entry.version == 1
+    assert service.find_by_key(session, template_key="birth_de/v9") is None
+    assert len(statements) == issued
+    assert cache.loads == 1
+
+
+def test_expired_ttl_reloads_only_when_revision_changed(session, statements) -> None:
+    clock = FakeClock()
+    cache = TemplateVersionCatalogCache(ttl_seconds=30, clock=clock)
+    service = TemplateCatalogService(catalog_cache=cache)
+    service.get_latest_published_version(session, template_id="birth_de")
+
+    clock.now = 31
+    statements.clear()
+    service.get_latest_published_version(session, template_id="birth_de")
+    assert len(statements) == 1
+    assert "template_catalog_revision" in statements[0]
+    assert cache.loads == 1
+
+    # Another process deprecates v2 and bumps the shared revision.
+    row = session.scalar(
+        select(TemplateVersion).where(TemplateVersion.template_key == "birth_de/v2")
+    )
+    row.status = "deprecated"
+    bump_catalog_revision(session)
+    session.commit()
+
+    clock.now = 62
+    assert service.get_latest_published_version(session, template_id="birth_de") == 1
+    assert cache.loads == 2
+
+
+def test_publish_invalidates_local_cache(session) -> None:
+    cache = TemplateVersionCatalogCache(ttl_seconds=3600)
+    service = TemplateCatalogService(catalog_cache=cache)
+    row = session.scalar(
+        select(TemplateVersion).where(TemplateVersion.template_key == "birth_de/v2")
+    )
+    row.status = "draft"
+    row.published_at = None
+    session.commit()
+
+    assert service.get_latest_published_version(session, template_id="birth_de") == 1
+
+    service.publish(session, template_id="birth_de", version=2)
+
+    assert service.get_latest_published_version(session, template_id="birth_de") == 2
+    assert cache.loads == 2
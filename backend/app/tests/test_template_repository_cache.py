@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from app.services.errors import ApiError
+from app.services.template_repository import (
+    CompiledTemplateCache,
+    TemplateRepository,
+)
+
+SOURCE_ROOT = Path(__file__).resolve().parents[3] / "workflows"
+
+
+@pytest.fixture()
+def workflows_root(tmp_path: Path) -> Path:
+    for version in (1, 2):
+        src = SOURCE_ROOT / "birth_de" / f"v{version}" / "compiled.json"
+        dst = tmp_path / "workflows" / "birth_de" / f"v{version}" / "compiled.json"
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        dst.write_bytes(src.read_bytes())
+    return tmp_path / "workflows"
+
+
+@pytest.fixture()
+def repository(workflows_root: Path) -> TemplateRepository:
+    return TemplateRepository(workflows_root, cache=CompiledTemplateCache(maxsize=4))
+
+
+def test_repeated_load_is_served_from_cache(repository: TemplateRepository) -> None:
+    first = repository.load("birth_de/v1")
+    second = repository.load("birth_de/v1")
+
+    assert second is first
+    stats = repository.cache_stats()
+    assert stats.misses == 1
+    assert stats.hits == 1
+    assert stats.size == 1
+
+
+def test_file_change_invalidates_cached_template(
+    repository: TemplateRepository, workflows_root: Path
+) -> None:
+    path = workflows_root / "birth_de" / "v2" / "compiled.json"
+    before = repository.load("birth_de/v2")
+    hash_before = repository.compiled_hash("birth_de", 2)
+
+    template = json.loads(path.read_text(encoding="utf-8"))
+    template["tasks"]["t_child_benefit"]["title"] = "Kindergeld (neu)"
+    path.write_text(json.dumps(template), encoding="utf-8")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    after = repository.load("birth_de/v2")
+    assert after is not before
+    assert after["tasks"]["t_child_benefit"]["title"] == "Kindergeld (neu)"
+    assert repository.compiled_hash("birth_de", 2) != hash_before
+
+
+def test_expected_hash_mismatch_is_checked_on_cache_hit(
+    repository: TemplateRepository,
+) -> None:
+    repository.load("birth_de/v1")
+
+    with pytest.raises(ApiError) as exc_info:
+        repository.load("birth_de/v1", expected_compiled_hash="0" * 64)
+    assert exc_info.value.code == "TEMPLATE_INTEGRITY_ERROR"
+
+
+def test_cache_is_bounded_lru(workflows_root: Path) -> None:
+    repository = TemplateRepository(
+        workflows_root, cache=CompiledTemplateCache(maxsize=1)
+    )
+    repository.load("birth_de/v1")
+    repository.load("birth_de/v2")
+    repository.load("birth_de/v1")
+
+    stats = repository.cache_stats()
+    assert stats.size == 1
+    assert stats.hits == 0
+    assert stats.misses == 3
+
+
+def test_compiled_program_is_memoized_per_cached_template(
+    repository: TemplateRepository,
+) -> None:
+    template = repository.load("birth_de/v2")
+
+    program = repository.compiled_program(template)
+    assert repository.compiled_program(template) is program
+    assert repository.compiled_program(dict(template)) is not program
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from pathlib import Path
+from uuid import UUID
+
+from app.db.session import get_session_factory
+from app.services.bulk_recompute_service import (
+    DEFAULT_CHUNK_SIZE,
+    BulkRecomputeProgress,
+    BulkRecomputeService,
+)
+from app.services.plan_service import RECOMPUTE_REASON_TEMPLATE_UPDATE
+
+
+def _read_checkpoint(path: Path, template_key: str) -> BulkRecomputeProgress | None:
+    if not path.exists():
+        return None
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    progress = BulkRecomputeProgress.from_dict(payload)
+    if progress.template_key != template_key:
+        raise SystemExit(
+            f"Checkpoint {path} belongs to '{progress.template_key}', "
+            f"not '{template_key}'"
+        )
+    return progress
+
+
+def _write_checkpoint(path: Path, progress: BulkRecomputeProgress) -> None:
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path.write_text(json.dumps(progress.as_dict(), indent=2), encoding="utf-8")
+    tmp_path.replace(path)
+
+
+def main() -> int:
+    import argparse
+
+    os.environ.setdefault("DB_POOL_ROLE", "tool")
+    parser = argparse.ArgumentParser(
+        description="Recompute all plans of a template key in chunks."
+    )
+    parser.add_argument("template_key", type=str, help="e.g. birth_de/v2")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--reason", type=str, default=RECOMPUTE_REASON_TEMPLATE_UPDATE)
+    parser.add_argument(
+        "--checkpoint",
+        type=str,
+        default=None,
+        help="JSON file updated after every chunk; an existing file is resumed",
+    )
+    parser.add_argument(
+        "--resume-from",
+        type=str,
+        default=None,
+        help="Plan id to continue after (overrides the checkpoint cursor)",
+    )
+    args = parser.parse_args()
+
+    checkpoint_path = Path(args.checkpoint) if args.checkpoint else None
+    progress = (
+        _read_checkpoint(checkpoint_path, args.template_key)
+        if checkpoint_path is not None
+        else None
+    )
+    if progress is not None and progress.done and args.resume_from is None:
+        print(f"OK: checkpoint {checkpoint_path} is already complete")
+        return 0
+
+    after_plan_id = progress.last_plan_id if progress is not None else None
+    if args.resume_from:
+        after_plan_id = UUID(args.resume_from)
+        if progress is not None:
+            progress.done = False
+            progress.last_plan_id = after_plan_id
+
+    started = time.monotonic()
+
+    def report(current: BulkRecomputeProgress) -> None:
+        if checkpoint_path is not None:
+            _write_checkpoint(checkpoint_path, current)
+        elapsed = time.monotonic() - started
+        print(
+            f"chunk {current.chunks}: {current.plans_processed} plans "
+            f"({current.plans_failed} failed), "
+            f"+{current.tasks_inserted} / ~{current.tasks_updated} tasks, "
+            f"last={current.last_plan_id}, {elapsed:.1f}s",
+            flush=True,
+        )
+
+    progress = BulkRecomputeService().run(
+        get_session_factory(),
+        template_key=args.template_key,
+        after_plan_id=after_plan_id,
+        chunk_size=args.chunk_size,
+        reason=args.reason,
+        progress=progress,
+        on_progress=report,
+    )
+
+    if progress.plans_failed:
+        print(
+            f"DONE with {progress.plans_failed} failed plan(s) "
+            f"for {args.template_key}"
+        )
+        return 1
+    print(f"OK: recomputed {progress.plans_processed} plan(s) for {args.template_key}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
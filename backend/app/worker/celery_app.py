@@ -14,6 +14,7 @@ celery_app = Celery(
     backend=RESULT_BACKEND,
     include=[
         "app.worker.tasks.reminders",
+        "app.worker.tasks.recompute",
     ],
 )
 
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import logging
+import os
+from typing import Any
+from uuid import UUID
+
+from app.db.session import get_session_factory
+from app.services.bulk_recompute_service import (
+    DEFAULT_CHUNK_SIZE,
+    BulkRecomputeProgress,
+    BulkRecomputeService,
+)
+from app.services.errors import ApiError
+from app.services.plan_service import (
+    RECOMPUTE_REASON_TEMPLATE_UPDATE,
+    PlanService,
+)
+from app.worker.celery_app import celery_app
+
+logger = logging.getLogger(__name__)
+
+MAX_CHUNKS_PER_RUN = 20
+
+
+@celery_app.task(
+    bind=True,
+    name="app.worker.tasks.recompute_template_plans",
+    max_retries=5,
+    default_retry_delay=30,
+)
+def recompute_template_plans(
+    self,
+    template_key: str,
+    after_plan_id: str | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    reason: str = RECOMPUTE_REASON_TEMPLATE_UPDATE,
+    progress: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """Recompute a bounded number of chunks, then re-enqueue from the cursor.
+
+    ``progress`` carries running totals between runs; on failure the task is
+    retried from the last committed chunk.
+    """
+    current = (
+        BulkRecomputeProgress.from_dict(progress)
+        if progress is not None
+        else BulkRecomputeProgress(template_key=template_key)
+    )
+    cursor = UUID(after_plan_id) if after_plan_id else None
+
+    def report(state: BulkRecomputeProgress) -> None:
+        logger.info("recompute_template_plans_progress", extra=state.as_dict())
+        if self.request.id:
+            self.update_state(state="PROGRESS", meta=state.as_dict())
+
+    try:
+        current = BulkRecomputeService().run(
+            get_session_factory(),
+            template_key=template_key,
+            after_plan_id=cursor,
+            chunk_size=chunk_size,
+            max_chunks=MAX_CHUNKS_PER_RUN,
+            reason=reason,
+            progress=current,
+            on_progress=report,
+        )
+    except Exception as exc:
+        checkpoint = current.as_dict()
+        raise self.retry(
+            exc=exc,
+            kwargs={
+                "template_key": template_key,
+                "after_plan_id": checkpoint["last_plan_id"],
+                "chunk_size": chunk_size,
+                "reason": reason,
+                "progress": checkpoint,
+            },
+        ) from exc
+
+    payload = current.as_dict()
+    if not current.done:
+        recompute_template_plans.apply_async(
+            kwargs={
+                "template_key": template_key,
+                "after_plan_id": payload["last_plan_id"],
+                "chunk_size": chunk_size,
+                "reason": reason,
+                "progress": payload,
+            }
+        )
+    logger.info("recompute_template_plans_summary", extra=payload)
+    return payload
+
+
+@celery_app.task(name="app.worker.tasks.recompute_plan_deferred")
+def recompute_plan_deferred(plan_id: str) -> dict[str, Any]:
+    """Run a coalesced fact-change recompute once its debounce window passed.
+
+    Re-enqueues itself for the rest of the window while patches keep arriving.
+    """
+    debounce_seconds = recompute_debounce_seconds()
+    session_factory = get_session_factory()
+    with session_factory() as session:
+        try:
+            remaining = PlanService().run_deferred_recompute(
+                session,
+                plan_id=UUID(plan_id),
+                debounce_seconds=debounce_seconds,
+            )
+        except ApiError as exc:
+            logger.warning(
+                "recompute_plan_deferred_failed",
+                extra={"plan_id": plan_id, "code": exc.code},
+            )
+            return {"plan_id": plan_id, "status": "failed", "code": exc.code}
+
+    if remaining is not None:
+        recompute_plan_deferred.apply_async(
+            kwargs={"plan_id": plan_id}, countdown=remaining
+        )
+        return {"plan_id": plan_id, "status": "rescheduled", "countdown": remaining}
+    return {"plan_id": plan_id, "status": "done"}
+
+
+def schedule_deferred_recompute(plan_id: UUID) -> None:
+    recompute_plan_deferred.apply_async(
+        kwargs={"plan_id": str(plan_id)}, countdown=recompute_debounce_seconds()
+    )
+
+
+def recompute_debounce_seconds() -> float:
+    return max(0.0, float(os.getenv("RECOMPUTE_DEBOUNCE_SECONDS", "2")))
@@ -1,40 +1,105 @@
 from __future__ import annotations
 
 import logging
+import os
+from datetime import datetime
+from typing import Any
+
+from celery import chord
 
 from app.db.session import get_session_factory
-from app.notifications.config import load_notification_config
+from app.notifications.config import NotificationConfig, load_notification_config
 from app.notifications.time_utils import now_berlin
 from app.services.outbox_dispatcher_service import OutboxDispatcherService
-from app.services.reminder_scanner_service import ReminderScannerService
+from app.services.reminder_scanner_service import (
+    ReminderScannerService,
+    ScanSummary,
+)
 from app.worker.celery_app import celery_app
 
 logger = logging.getLogger(__name__)
 
+# Reused across task runs in a worker process so the provider's HTTP
+# connection pool survives between beat ticks.
+_DISPATCHER: OutboxDispatcherService | None = None
+
 
 @celery_app.task(name="app.worker.tasks.reminder_scan_due_soon")
-def reminder_scan_due_soon() -> dict[str, int]:
+def reminder_scan_due_soon(shard_count: int | None = None) -> dict[str, Any]:
+    """Scan due-soon reminders, fanning out to shard tasks when configured.
+
+    With more than one shard a chord of ``reminder_scan_shard`` tasks is
+    started and ``reminder_scan_collect`` aggregates their summaries; all
+    shards share the coordinator's ``now``.
+    """
+    shard_count = shard_count or _reminder_scan_shards()
+    now = now_berlin()
+
+    if shard_count <= 1:
+        payload = _scan_shard(now=now, shard_index=0, shard_count=1)
+        logger.info("reminder_scan_due_soon_summary", extra=payload)
+        return payload
+
+    result = chord(
+        reminder_scan_shard.s(
+            shard_index=shard_index,
+            shard_count=shard_count,
+            now_iso=now.isoformat(),
+        )
+        for shard_index in range(shard_count)
+    )(reminder_scan_collect.s())
+    logger.info(
+        "reminder_scan_due_soon_dispatched",
+        extra={"shard_count": shard_count, "collect_task_id": result.id},
+    )
+    return {"shard_count": shard_count, "collect_task_id": result.id}
+
+
+@celery_app.task(
+    name="app.worker.tasks.reminder_scan_shard",
+    autoretry_for=(Exception,),
+    retry_backoff=True,
+    max_retries=3,
+)
+def reminder_scan_shard(
+    shard_index: int, shard_count: int, now_iso: str
+) -> dict[str, int]:
+    payload = _scan_shard(
+        now=datetime.fromisoformat(now_iso),
+        shard_index=shard_index,
+        shard_count=shard_count,
+    )
+    logger.info(
+        "reminder_scan_shard_summary",
+        extra={"shard_index": shard_index, "shard_count": shard_count, **payload},
+    )
+    return payload
+
+
+@celery_app.task(name="app.worker.tasks.reminder_scan_collect")
+def reminder_scan_collect(results: list[dict[str, int]]) -> dict[str, int]:
+    payload = ScanSummary.combine(ScanSummary(**result) for result in results).as_dict()
+    logger.info("reminder_scan_due_soon_summary", extra=payload)
+    return payload
+
+
+def _scan_shard(*, now: datetime, shard_index: int, shard_count: int) -> dict[str, int]:
     session_factory = get_session_factory()
     config = load_notification_config()
-    now = now_berlin()
 
     with session_factory() as session:
         summary = ReminderScannerService().scan_due_soon(
             session,
             now=now,
             app_base_url=config.app_base_url,
+            shard_index=shard_index,
+            shard_count=shard_count,
         )
+    return summary.as_dict()
 
-    payload = {
-        "profiles_scanned": summary.profiles_scanned,
-        "tasks_matched": summary.tasks_matched,
-        "outbox_created": summary.outbox_created,
-        "skipped_not_sendable": summary.skipped_not_sendable,
-        "skipped_daily_cap": summary.skipped_daily_cap,
-        "errors": summary.errors,
-    }
-    logger.info("reminder_scan_due_soon_summary", extra=payload)
-    return payload
+
+def _reminder_scan_shards() -> int:
+    return max(1, int(os.getenv("REMINDER_SCAN_SHARDS", "1")))
 
 
 @celery_app.task(name="app.worker.tasks.dispatch_pending_outbox")
@@ -44,7 +109,7 @@ def dispatch_pending_outbox(batch_size: int = 100) -> dict[str, int]:
     now = now_berlin()
 
     with session_factory() as session:
-        summary = OutboxDispatcherService(config).dispatch_pending(
+        summary = _get_dispatcher(config).dispatch_pending(
             session,
             now=now,
             batch_size=batch_size,
@@ -60,3 +125,12 @@ def dispatch_pending_outbox(batch_size: int = 100) -> dict[str, int]:
     }
     logger.info("dispatch_pending_outbox_summary", extra=payload)
     return payload
+
+
+def _get_dispatcher(config: NotificationConfig) -> OutboxDispatcherService:
+    global _DISPATCHER
+    if _DISPATCHER is None or _DISPATCHER.config != config:
+        if _DISPATCHER is not None:
+            _DISPATCHER.close()
+        _DISPATCHER = OutboxDispatcherService(config)
+    return _DISPATCHER